@@ -0,0 +1,77 @@
+
+"""Per-request CPU of the token response path: validated pydantic models and
+response_model serialization vs model_construct and direct orjson responses.
+
+Usage:
+    python -m benchmarks.bench_responses [--iterations N]
+"""
+
+## Built-in modules: ##
+from os import environ
+from argparse import ArgumentParser, Namespace
+from time import perf_counter
+from typing import Any, Callable
+
+environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+environ.setdefault("HASH_ALGORITHM", "HS256")
+environ.setdefault("DB_HOST", "127.0.0.1")
+environ.setdefault("DB_PORT", "3306")
+
+## Third-party modules: ##
+from fastapi.responses import JSONResponse
+
+## Local modules: ##
+from config import TOKEN_TYPE
+from core.api_v1.sign_in.utils import get_token_dependency
+from core.api_v1.token_auth.oauth2 import create_access_token
+from core.api_v1.token_auth.responses import token_response
+from core.api_v1.token_auth.schemas import TokenModel
+
+ACCESS_TOKEN: str = create_access_token(data_to_encode={"sub": "benchmark"})
+AUTHORIZATION: str = f"{TOKEN_TYPE} {ACCESS_TOKEN}"
+
+
+def measure(name: str, call: Callable[[], Any], iterations: int) -> float:
+    for _ in range(min(iterations, 1000)):
+        call()
+    started_at: float = perf_counter()
+    for _ in range(iterations):
+        call()
+    elapsed_us: float = (perf_counter() - started_at) * 1_000_000 / iterations
+    print(f"{name:>36}: {elapsed_us:8.2f} us/call")
+    return elapsed_us
+
+
+def validated_response() -> JSONResponse:
+    ## What the response_model path did: validated construction, validation
+    ## of the returned value, json mode dump and stdlib json encoding.
+    token: TokenModel = TokenModel(access_token=ACCESS_TOKEN, token_type=TOKEN_TYPE)
+    validated: TokenModel = TokenModel.model_validate(token)
+    return JSONResponse(validated.model_dump(mode="json"))
+
+
+def constructed_response() -> JSONResponse:
+    token: TokenModel = TokenModel.model_construct(access_token=ACCESS_TOKEN, token_type=TOKEN_TYPE)
+    return token_response(token)
+
+
+def split_header() -> TokenModel:
+    token_data: list[str] = AUTHORIZATION.split(" ")
+    return TokenModel(access_token=token_data[1], token_type=token_data[0])
+
+
+def main(arguments: Namespace) -> None:
+    iterations: int = arguments.iterations
+    before: float = measure("validated model + response_model", validated_response, iterations)
+    after: float = measure("model_construct + orjson", constructed_response, iterations)
+    print(f"{'saved per response':>36}: {before - after:8.2f} us")
+
+    before = measure("header split + validated model", split_header, iterations)
+    after = measure("header partition + construct", lambda: get_token_dependency(AUTHORIZATION), iterations)
+    print(f"{'saved per bearer request':>36}: {before - after:8.2f} us")
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser(description="Token response path benchmark.")
+    parser.add_argument("--iterations", type=int, default=100_000)
+    main(parser.parse_args())
@@ -0,0 +1,61 @@
+
+"""Compare credential sign-in cost: HTTP loopback to token_auth vs in-process issuance.
+
+The loopback path did two bcrypt checks (sign_in + token_auth) and two JWT
+encodes besides the extra TCP connection and JSON round trip, the in-process
+path does one of each. Database lookups are left out on both sides, so the
+numbers are a lower bound of the saved time.
+
+Usage:
+    python -m benchmarks.bench_sign_in [iterations]
+"""
+
+## Built-in modules: ##
+from os import environ
+from sys import argv
+from time import perf_counter, process_time
+from asyncio import run
+
+environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+environ.setdefault("HASH_ALGORITHM", "HS256")
+environ.setdefault("DB_HOST", "127.0.0.1")
+environ.setdefault("DB_PORT", "3306")
+
+## Local modules: ##
+from core.api_v1.token_auth.oauth2 import BcryptActions, issue_access_token
+
+BENCHMARK_LOGIN: str = "benchmark"
+BENCHMARK_PASSWORD: str = "benchmark-password"
+
+
+async def loopback_sign_in(hashed_password: str) -> None:
+    """Old sign_in: verify, then let token_auth verify again and issue token."""
+    for _ in range(2):
+        bcrypt_actions: BcryptActions = BcryptActions(password=BENCHMARK_PASSWORD)
+        await bcrypt_actions.compare_password(hashed_password=hashed_password)
+        issue_access_token(user_login=BENCHMARK_LOGIN)
+
+
+async def in_process_sign_in(hashed_password: str) -> None:
+    """New sign_in: verify once and issue token in-process."""
+    bcrypt_actions: BcryptActions = BcryptActions(password=BENCHMARK_PASSWORD)
+    await bcrypt_actions.compare_password(hashed_password=hashed_password)
+    issue_access_token(user_login=BENCHMARK_LOGIN)
+
+
+async def main(iterations: int) -> None:
+    hashed_password: str = (
+        await BcryptActions(password=BENCHMARK_PASSWORD).hash_password()
+    ).decode()
+    for name, sign_in in (("loopback", loopback_sign_in), ("in-process", in_process_sign_in)):
+        wall_start: float = perf_counter()
+        cpu_start: float = process_time()
+        for _ in range(iterations):
+            await sign_in(hashed_password=hashed_password)
+        wall_ms: float = (perf_counter() - wall_start) * 1000 / iterations
+        cpu_ms: float = (process_time() - cpu_start) * 1000 / iterations
+        print(f"{name:>10}: {wall_ms:8.2f} ms/login wall, {cpu_ms:8.2f} ms/login cpu")
+
+
+if __name__ == "__main__":
+    run(main(iterations=int(argv[1]) if len(argv) > 1 else 10))
@@ -0,0 +1,73 @@
+
+"""Per-call latency of the stateless access-token check vs the refresh rotation.
+
+Refresh rotation runs against any async SQLAlchemy URL, in-memory SQLite by
+default (needs aiosqlite).
+
+Usage:
+    python -m benchmarks.bench_token_paths [--url URL] [--iterations N]
+"""
+
+## Built-in modules: ##
+from os import environ
+from argparse import ArgumentParser, Namespace
+from asyncio import run
+from time import perf_counter
+
+environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+environ.setdefault("HASH_ALGORITHM", "HS256")
+environ.setdefault("DB_HOST", "127.0.0.1")
+environ.setdefault("DB_PORT", "3306")
+
+## Third-party modules: ##
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+## Local modules: ##
+from core.api_v1.token_auth.oauth2 import decode_access_token, issue_access_token
+from core.api_v1.token_auth.refresh import issue_refresh_token, rotate_refresh_token
+from core.api_v1.token_auth.schemas import TokenModel
+from core.api_v1.token_auth.verification import TokenVerifier
+from core.async_database.db_models import Base
+
+BENCHMARK_LOGIN: str = "benchmark"
+
+
+def report(name: str, started_at: float, iterations: int) -> None:
+    elapsed_us: float = (perf_counter() - started_at) * 1_000_000 / iterations
+    print(f"{name:>28}: {elapsed_us:9.1f} us/call")
+
+
+async def main(arguments: Namespace) -> None:
+    iterations: int = arguments.iterations
+    token: TokenModel = issue_access_token(user_login=BENCHMARK_LOGIN)
+
+    started_at: float = perf_counter()
+    for _ in range(iterations):
+        decode_access_token(encoded_token=token)
+    report("access check (jwt.decode)", started_at, iterations)
+
+    verifier: TokenVerifier = TokenVerifier()
+    verifier.verify(encoded_token=token)
+    started_at = perf_counter()
+    for _ in range(iterations):
+        verifier.verify(encoded_token=token)
+    report("access check (cached)", started_at, iterations)
+
+    engine = create_async_engine(arguments.url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(engine)
+    async with session_factory() as session:
+        refresh_token: str = await issue_refresh_token(session=session, login=BENCHMARK_LOGIN)
+        started_at = perf_counter()
+        for _ in range(iterations):
+            _, refresh_token = await rotate_refresh_token(session=session, refresh_token=refresh_token)
+        report("refresh rotation", started_at, iterations)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser(description="Token path latency benchmark.")
+    parser.add_argument("--url", default="sqlite+aiosqlite:///:memory:")
+    parser.add_argument("--iterations", type=int, default=2000)
+    run(main(parser.parse_args()))
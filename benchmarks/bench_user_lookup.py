@@ -0,0 +1,79 @@
+
+"""Compare full ORM user loads (UserHook.get) with projection lookups.
+
+Runs against any async SQLAlchemy URL, in-memory SQLite by default
+(needs aiosqlite).
+
+Usage:
+    python -m benchmarks.bench_user_lookup [--url URL] [--iterations N]
+"""
+
+## Built-in modules: ##
+from os import environ
+from argparse import ArgumentParser, Namespace
+from asyncio import run
+from time import perf_counter
+from tracemalloc import start as start_tracing, stop as stop_tracing, get_traced_memory, reset_peak
+from typing import Awaitable, Callable
+
+environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+environ.setdefault("HASH_ALGORITHM", "HS256")
+environ.setdefault("DB_HOST", "127.0.0.1")
+environ.setdefault("DB_PORT", "3306")
+
+## Third-party modules: ##
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+## Local modules: ##
+from core.async_database import UserRepository
+from core.async_database.db_models import Base, Users
+
+BENCHMARK_LOGIN: str = "benchmark"
+
+
+async def measure(name: str, call: Callable[[], Awaitable], iterations: int) -> None:
+    for _ in range(min(iterations, 100)):
+        await call()
+    started_at: float = perf_counter()
+    for _ in range(iterations):
+        await call()
+    elapsed_us: float = (perf_counter() - started_at) * 1_000_000 / iterations
+
+    start_tracing()
+    reset_peak()
+    for _ in range(100):
+        await call()
+    _, peak = get_traced_memory()
+    stop_tracing()
+    print(f"{name:>22}: {elapsed_us:9.1f} us/call, peak {peak / 1024:8.1f} KiB per 100 calls")
+
+
+async def main(arguments: Namespace) -> None:
+    engine = create_async_engine(arguments.url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(engine)
+    async with session_factory() as session:
+        await UserRepository(session).create(login=BENCHMARK_LOGIN, hashed_password="$2b$12$" + "x" * 53)
+
+    async with session_factory() as session:
+        repository: UserRepository = UserRepository(session)
+
+        async def orm_get() -> None:
+            ## Same query as UserHook.get(one_object=True, login=...)
+            result = await session.execute(select(Users).filter_by(login=BENCHMARK_LOGIN))
+            result.scalars().all()
+            session.expunge_all()
+
+        await measure("UserHook.get (ORM)", orm_get, arguments.iterations)
+        await measure("get_password_hash", lambda: repository.get_password_hash(BENCHMARK_LOGIN), arguments.iterations)
+        await measure("exists", lambda: repository.exists(BENCHMARK_LOGIN), arguments.iterations)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser(description="User lookup micro-benchmark.")
+    parser.add_argument("--url", default="sqlite+aiosqlite:///:memory:")
+    parser.add_argument("--iterations", type=int, default=5000)
+    run(main(parser.parse_args()))
@@ -0,0 +1,78 @@
+
+"""Import-time budget check of the application module.
+
+Runs `python -X importtime -c "import main"` in a fresh interpreter, prints
+the slowest modules and exits with status 1 when the cumulative import time
+of `main` is over the budget, so CI can fail on import-time regressions.
+tests/test_import_time.py runs the same check in the test suite.
+
+Usage:
+    python -m benchmarks.check_import_time [--budget-ms MS] [--top N] [--module main]
+"""
+
+## Built-in modules: ##
+from os import environ
+from argparse import ArgumentParser, Namespace
+from subprocess import run
+from sys import executable, exit
+
+IMPORT_TIME_BUDGET_MS: float = float(environ.get("IMPORT_TIME_BUDGET_MS", 1500))
+
+
+def import_times(module: str) -> list[tuple[str, float, float]]:
+    """Parse `-X importtime` output.
+
+    Returns:
+        list[tuple[str, float, float]]: (module, self ms, cumulative ms) per imported module.
+    """
+    child_environ: dict[str, str] = dict(environ)
+    for name, value in (
+        ("SECRET_KEY", "import-time-check"),
+        ("HASH_ALGORITHM", "HS256"),
+        ("DB_HOST", "127.0.0.1"),
+        ("DB_PORT", "3306"),
+    ):
+        child_environ.setdefault(name, value)
+    completed = run(
+        [executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=child_environ,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr}")
+
+    times: list[tuple[str, float, float]] = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        times.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+    return times
+
+
+def total_import_ms(times: list[tuple[str, float, float]], module: str) -> float:
+    """Cumulative import time of the module itself, 0 if it was not imported."""
+    return next((cumulative_ms for name, _, cumulative_ms in times if name == module), 0.0)
+
+
+def main(arguments: Namespace) -> None:
+    times: list[tuple[str, float, float]] = import_times(arguments.module)
+    total_ms: float = total_import_ms(times, arguments.module)
+
+    print(f"{'module':<48} {'self ms':>9} {'cumulative ms':>14}")
+    for name, self_ms, cumulative_ms in sorted(times, key=lambda entry: entry[1], reverse=True)[:arguments.top]:
+        print(f"{name:<48} {self_ms:9.1f} {cumulative_ms:14.1f}")
+    print(f"\nimport {arguments.module}: {total_ms:.1f} ms (budget {arguments.budget_ms:.0f} ms)")
+
+    if total_ms > arguments.budget_ms:
+        print("Import time is over budget.")
+        exit(1)
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser(description="Import-time budget check.")
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_TIME_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--module", default="main")
+    main(parser.parse_args())
@@ -0,0 +1,9 @@
+"""Benchmark suite of the auth endpoints and their hot paths.
+
+The app runs in-process behind an httpx ASGI transport, against SQLite
+(temporary file by default, needs aiosqlite) or any async SQLAlchemy URL.
+
+Usage:
+    python -m benchmarks.suite run [--url URL] [--concurrency N] [--requests N] [--output FILE]
+    python -m benchmarks.suite compare BASELINE.json CURRENT.json [--threshold 0.1]
+"""
@@ -0,0 +1,125 @@
+"""Benchmark suite entry point, see benchmarks.suite."""
+
+## Built-in modules: ##
+from os import environ
+from argparse import ArgumentParser, Namespace
+from asyncio import run
+from datetime import datetime, timezone
+from json import dumps
+from pathlib import Path
+from platform import python_version
+from sys import exit
+from tempfile import TemporaryDirectory
+from typing import Any
+
+environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+environ.setdefault("HASH_ALGORITHM", "HS256")
+environ.setdefault("DB_HOST", "127.0.0.1")
+environ.setdefault("DB_PORT", "3306")
+## Endpoints are driven from one client address, limits would reject most calls.
+environ.setdefault("RATE_LIMIT_ENABLED", "0")
+
+## Third-party modules: ##
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import create_async_engine
+
+## Local modules: ##
+from benchmarks.suite.compare import find_regressions, load_results
+from benchmarks.suite.load import run_endpoints
+from benchmarks.suite.micro import run_micro
+from benchmarks.suite.stats import BenchmarkResult
+from config import BCRYPT_ROUNDS, PASSWORD_HASH_SCHEME
+from core.async_database.db_engine import bind_engine, session_factory
+from core.async_database.db_models import Base
+from main import app
+
+
+async def run_suite(arguments: Namespace, url: str) -> list[BenchmarkResult]:
+    ## The app opens sessions from the shared factories, so rebinding them is enough.
+    engine = create_async_engine(url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    bind_engine(engine)
+
+    results: list[BenchmarkResult] = []
+    transport: ASGITransport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        results += await run_endpoints(client, arguments.requests, arguments.concurrency)
+    results += await run_micro(session_factory, arguments.iterations, arguments.hash_iterations)
+    await engine.dispose()
+    return results
+
+
+def run_command(arguments: Namespace) -> int:
+    with TemporaryDirectory() as directory:
+        url: str = arguments.url or f"sqlite+aiosqlite:///{directory}/benchmark.db"
+        results: list[BenchmarkResult] = run(run_suite(arguments, url))
+    for result in results:
+        print(result)
+
+    document: dict[str, Any] = {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "python": python_version(),
+            "database": url.split(":", 1)[0],
+            "requests": arguments.requests,
+            "concurrency": arguments.concurrency,
+            "password_hash_scheme": PASSWORD_HASH_SCHEME,
+            "bcrypt_rounds": BCRYPT_ROUNDS,
+        },
+        "results": [result.as_dict() for result in results],
+    }
+    if arguments.output:
+        Path(arguments.output).write_text(dumps(document, indent=2))
+        print(f"Results written to {arguments.output}")
+
+    if arguments.baseline:
+        current: dict[str, dict[str, Any]] = {result.name: result.as_dict() for result in results}
+        return report_regressions(load_results(arguments.baseline), current, arguments.threshold)
+    return 0
+
+
+def report_regressions(
+    baseline: dict[str, dict[str, Any]],
+    current: dict[str, dict[str, Any]],
+    threshold: float,
+) -> int:
+    regressions: list[str] = find_regressions(baseline, current, threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if not regressions:
+        print(f"No regressions above {threshold:.0%}.")
+    return 1 if regressions else 0
+
+
+def main() -> None:
+    parser: ArgumentParser = ArgumentParser(description="Auth endpoints benchmark suite.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser: ArgumentParser = subparsers.add_parser("run", help="Run the suite.")
+    run_parser.add_argument("--url", help="Async SQLAlchemy URL, temporary SQLite file by default.")
+    run_parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint scenario.")
+    run_parser.add_argument("--concurrency", type=int, default=16)
+    run_parser.add_argument("--iterations", type=int, default=2000, help="Calls per JWT/CRUD micro-benchmark.")
+    run_parser.add_argument("--hash-iterations", type=int, default=20, help="Calls per hashing micro-benchmark.")
+    run_parser.add_argument("--output", help="Write results as JSON.")
+    run_parser.add_argument("--baseline", help="Compare with results JSON of an earlier run.")
+    run_parser.add_argument("--threshold", type=float, default=0.1)
+
+    compare_parser: ArgumentParser = subparsers.add_parser("compare", help="Compare two result files.")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+
+    arguments: Namespace = parser.parse_args()
+    if arguments.command == "run":
+        exit(run_command(arguments))
+    exit(report_regressions(
+        load_results(arguments.baseline),
+        load_results(arguments.current),
+        arguments.threshold,
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+
+## Built-in modules: ##
+from json import loads
+from pathlib import Path
+from typing import Any
+
+
+def load_results(path: str) -> dict[str, dict[str, Any]]:
+    """Results of a run file keyed by scenario name."""
+    document: dict[str, Any] = loads(Path(path).read_text())
+    return {result["name"]: result for result in document["results"]}
+
+
+def find_regressions(
+    baseline: dict[str, dict[str, Any]],
+    current: dict[str, dict[str, Any]],
+    threshold: float,
+) -> list[str]:
+    """Scenarios whose p95 grew or throughput dropped by more than `threshold`.
+
+    Args:
+        baseline (dict): Results of the reference run.
+        current (dict): Results of the new run.
+        threshold (float): Allowed relative change, 0.1 is 10%.
+
+    Returns:
+        list[str]: One line per regression, empty if none.
+    """
+    regressions: list[str] = []
+    for name, result in current.items():
+        reference: dict[str, Any] = baseline.get(name)
+        if reference is None:
+            continue
+        if reference["p95_ms"] and result["p95_ms"] > reference["p95_ms"] * (1 + threshold):
+            regressions.append(
+                f"{name}: p95 {reference['p95_ms']:.2f} -> {result['p95_ms']:.2f} ms"
+            )
+        if reference["throughput"] and result["throughput"] < reference["throughput"] * (1 - threshold):
+            regressions.append(
+                f"{name}: throughput {reference['throughput']:.1f} -> {result['throughput']:.1f} ops/s"
+            )
+        if result["errors"] > reference["errors"]:
+            regressions.append(f"{name}: errors {reference['errors']} -> {result['errors']}")
+    return regressions
@@ -0,0 +1,93 @@
+
+## Built-in modules: ##
+from asyncio import gather
+from time import perf_counter
+from typing import Any, Awaitable, Callable
+
+## Third-party modules: ##
+from httpx import AsyncClient, Response
+
+## Local modules: ##
+from benchmarks.suite.stats import BenchmarkResult, summarize
+
+BENCHMARK_PASSWORD: str = "benchmark-password"
+
+
+async def drive(
+    name: str,
+    call: Callable[[int], Awaitable[Response]],
+    requests: int,
+    concurrency: int,
+) -> BenchmarkResult:
+    """Send `requests` calls from `concurrency` workers sharing one counter.
+
+    Args:
+        name (str): Scenario name.
+        call (Callable): Sends request number i.
+        requests (int): Total number of requests.
+        concurrency (int): Number of requests in flight.
+    """
+    latencies: list[float] = []
+    errors: int = 0
+    next_index: int = 0
+
+    async def worker() -> None:
+        nonlocal errors, next_index
+        while next_index < requests:
+            index: int = next_index
+            next_index += 1
+            started_at: float = perf_counter()
+            try:
+                response: Response = await call(index)
+                failed: bool = response.status_code >= 400
+            except Exception:
+                failed = True
+            latencies.append(perf_counter() - started_at)
+            errors += failed
+
+    started_at: float = perf_counter()
+    await gather(*(worker() for _ in range(concurrency)))
+    return summarize(name, latencies, errors, perf_counter() - started_at)
+
+
+def credentials(login: str) -> dict[str, Any]:
+    return {"login": login, "password": BENCHMARK_PASSWORD}
+
+
+async def run_endpoints(client: AsyncClient, requests: int, concurrency: int) -> list[BenchmarkResult]:
+    """Drive sign up, token auth and both sign in paths.
+
+    Sign up creates `requests` users, the other scenarios log them in again.
+    """
+    logins: list[str] = [f"bench{index:07d}" for index in range(requests)]
+    results: list[BenchmarkResult] = []
+
+    results.append(await drive(
+        "POST /api_v1/sign_up",
+        lambda index: client.post("/api_v1/sign_up/", json=credentials(logins[index])),
+        requests,
+        concurrency,
+    ))
+    results.append(await drive(
+        "POST /api_v1/token_auth",
+        lambda index: client.post("/api_v1/token_auth/", json=credentials(logins[index])),
+        requests,
+        concurrency,
+    ))
+    results.append(await drive(
+        "POST /api_v1/sign_in (login)",
+        lambda index: client.post("/api_v1/sign_in/", json=credentials(logins[index])),
+        requests,
+        concurrency,
+    ))
+
+    response: Response = await client.post("/api_v1/token_auth/", json=credentials(logins[0]))
+    response.raise_for_status()
+    authorization: str = f"Bearer {response.json()['access_token']}"
+    results.append(await drive(
+        "POST /api_v1/sign_in (bearer)",
+        lambda index: client.post("/api_v1/sign_in/", headers={"Authorization": authorization}),
+        requests,
+        concurrency,
+    ))
+    return results
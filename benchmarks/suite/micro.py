@@ -0,0 +1,90 @@
+
+## Built-in modules: ##
+from inspect import isawaitable
+from time import perf_counter
+from typing import Any, Callable
+
+## Third-party modules: ##
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+## Local modules: ##
+from benchmarks.suite.stats import BenchmarkResult, summarize
+from core.api_v1.token_auth.hashers import hasher_registry
+from core.api_v1.token_auth.oauth2 import create_access_token, decode_access_token
+from core.api_v1.token_auth.schemas import TokenModel
+from core.async_database import UserRepository
+from config import TOKEN_TYPE
+
+MICRO_LOGIN: str = "micro"
+
+
+async def measure(name: str, call: Callable[[int], Any], iterations: int) -> BenchmarkResult:
+    """Time `iterations` sequential calls, awaiting the result when needed."""
+    latencies: list[float] = []
+    started_at: float = perf_counter()
+    for index in range(iterations):
+        call_started_at: float = perf_counter()
+        result: Any = call(index)
+        if isawaitable(result):
+            await result
+        latencies.append(perf_counter() - call_started_at)
+    return summarize(name, latencies, 0, perf_counter() - started_at)
+
+
+async def run_micro(
+    session_factory: async_sessionmaker[AsyncSession],
+    iterations: int,
+    hash_iterations: int,
+) -> list[BenchmarkResult]:
+    """Hashing, JWT and CRUD micro-benchmarks."""
+    results: list[BenchmarkResult] = []
+    password: bytes = b"benchmark-password"
+    hashed_password: bytes = await hasher_registry.hash(password)
+    results.append(await measure(
+        "hash (default scheme)", lambda _: hasher_registry.hash(password), hash_iterations
+    ))
+    results.append(await measure(
+        "verify (default scheme)", lambda _: hasher_registry.verify(password, hashed_password), hash_iterations
+    ))
+
+    encoded_token: str = create_access_token(data_to_encode={"sub": MICRO_LOGIN})
+    token: TokenModel = TokenModel(access_token=encoded_token, token_type=TOKEN_TYPE)
+    results.append(await measure(
+        "jwt encode", lambda _: create_access_token(data_to_encode={"sub": MICRO_LOGIN}), iterations
+    ))
+    results.append(await measure(
+        "jwt decode", lambda _: decode_access_token(encoded_token=token), iterations
+    ))
+
+    async with session_factory() as session:
+        repository: UserRepository = UserRepository(session)
+        stored_hash: str = hashed_password.decode()
+        results.append(await measure(
+            "repository.create",
+            lambda index: repository.create(login=f"{MICRO_LOGIN}{index:07d}", hashed_password=stored_hash),
+            iterations,
+        ))
+        results.append(await measure(
+            "repository.get_password_hash",
+            lambda index: repository.get_password_hash(login=f"{MICRO_LOGIN}{index:07d}"),
+            iterations,
+        ))
+        results.append(await measure(
+            "repository.exists",
+            lambda index: repository.exists(login=f"{MICRO_LOGIN}{index:07d}"),
+            iterations,
+        ))
+        results.append(await measure(
+            "repository.update",
+            lambda index: repository.update(
+                values={"hashed_password": stored_hash},
+                login=f"{MICRO_LOGIN}{index:07d}",
+            ),
+            iterations,
+        ))
+        results.append(await measure(
+            "repository.delete",
+            lambda index: repository.delete(login=f"{MICRO_LOGIN}{index:07d}"),
+            iterations,
+        ))
+    return results
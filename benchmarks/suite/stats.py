@@ -0,0 +1,52 @@
+
+## Built-in modules: ##
+from dataclasses import asdict, dataclass
+from typing import Any
+
+
+@dataclass(slots=True)
+class BenchmarkResult:
+    """Latency distribution and throughput of one scenario."""
+    name: str
+    calls: int
+    errors: int
+    elapsed: float
+    throughput: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name:>28}: {self.throughput:9.1f} ops/s  "
+            f"p50 {self.p50_ms:8.2f} ms  p95 {self.p95_ms:8.2f} ms  "
+            f"p99 {self.p99_ms:8.2f} ms  errors {self.errors}"
+        )
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank: int = max(int(q * len(sorted_values) + 0.5) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(name: str, latencies: list[float], errors: int, elapsed: float) -> BenchmarkResult:
+    """Build result from per-call latencies in seconds and wall time of the run."""
+    latencies = sorted(latencies)
+    return BenchmarkResult(
+        name=name,
+        calls=len(latencies),
+        errors=errors,
+        elapsed=elapsed,
+        throughput=len(latencies) / elapsed if elapsed else 0.0,
+        p50_ms=percentile(latencies, 0.50) * 1000,
+        p95_ms=percentile(latencies, 0.95) * 1000,
+        p99_ms=percentile(latencies, 0.99) * 1000,
+        max_ms=(latencies[-1] if latencies else 0.0) * 1000,
+    )
@@ -1,19 +1,130 @@
 
 ## Built-in modules: ##
-from os import getenv
+from os import getenv, cpu_count
 
 ## Third-party modules: ##
 from dataclasses import dataclass
 from datetime import timedelta
 
 APP_VERSION: str = "0.1.0"
+DEBUG: bool = getenv("DEBUG", "0") == "1"
 SECRET_KEY: str = getenv("SECRET_KEY")
 
 ## Token configuration: ##
 TOKEN_HASH_ALGORITHM: str = getenv("HASH_ALGORITHM")
-TOKEN_EXPIRE_DAYS: int = 7
-TOKEN_EXPIRE_TIME: timedelta = timedelta(days=TOKEN_EXPIRE_DAYS)
+TOKEN_EXPIRE_MINUTES: int = int(getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 15))
+TOKEN_EXPIRE_TIME: timedelta = timedelta(minutes=TOKEN_EXPIRE_MINUTES)
 TOKEN_TYPE: str = "Bearer"
+## Access tokens are short-lived, so they are checked without database lookups.
+STATELESS_ACCESS_TOKENS: bool = getenv("STATELESS_ACCESS_TOKENS", "1") == "1"
+
+## Bearer token kind: "jwt" (signed access tokens) or "session" (opaque server-side sessions).
+AUTH_MODE: str = getenv("AUTH_MODE", "jwt")
+
+## Opaque sessions (AUTH_MODE=session): ##
+## The built-in session store lives in worker memory: serve.py refuses more than one
+## worker in session mode unless session_store.backend is replaced by a shared one.
+SESSION_TTL: float = float(getenv("SESSION_TTL_SECONDS", 3600))
+SESSION_SHARDS: int = int(getenv("SESSION_SHARDS", 16))
+SESSION_MAX_ENTRIES: int = int(getenv("SESSION_MAX_ENTRIES", 1_000_000))
+
+## Asymmetric signing keys (<kid>.pem files), SECRET_KEY is used without them: ##
+SIGNING_KEYS_DIR: str = getenv("SIGNING_KEYS_DIR")
+SIGNING_ACTIVE_KID: str = getenv("SIGNING_ACTIVE_KID")
+## Keys other than the active one (SECRET_KEY included) are accepted this long after it appeared.
+SIGNING_KEY_GRACE: float = float(getenv("SIGNING_KEY_GRACE_SECONDS", TOKEN_EXPIRE_TIME.total_seconds()))
+JWKS_MAX_AGE: int = int(getenv("JWKS_MAX_AGE_SECONDS", 300))
+
+## Refresh token configuration: ##
+REFRESH_TOKEN_EXPIRE_DAYS: int = int(getenv("REFRESH_TOKEN_EXPIRE_DAYS", 7))
+REFRESH_TOKEN_EXPIRE_TIME: timedelta = timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+## Expired and revoked refresh tokens are deleted in chunks every interval.
+REFRESH_TOKEN_PRUNE_INTERVAL: float = float(getenv("REFRESH_TOKEN_PRUNE_INTERVAL_SECONDS", 3600))
+REFRESH_TOKEN_PRUNE_CHUNK: int = int(getenv("REFRESH_TOKEN_PRUNE_CHUNK", 10_000))
+
+## Password hashing configuration: ##
+HASHING_EXECUTOR: str = getenv("HASHING_EXECUTOR", "thread")
+HASHING_WORKERS: int = int(getenv("HASHING_WORKERS", cpu_count() or 1))
+HASHING_QUEUE_SIZE: int = int(getenv("HASHING_QUEUE_SIZE", 64))
+HASHING_DEADLINE: float = float(getenv("HASHING_DEADLINE_SECONDS", 2.0))
+
+## Password hash policy: ##
+PASSWORD_HASH_SCHEME: str = getenv("PASSWORD_HASH_SCHEME", "bcrypt")
+BCRYPT_ROUNDS: int = int(getenv("BCRYPT_ROUNDS", 12))
+ARGON2_TIME_COST: int = int(getenv("ARGON2_TIME_COST", 3))
+ARGON2_MEMORY_COST: int = int(getenv("ARGON2_MEMORY_COST", 65536))
+ARGON2_PARALLELISM: int = int(getenv("ARGON2_PARALLELISM", 4))
+
+## Verified credential cache (opt-in): ##
+CREDENTIAL_CACHE_ENABLED: bool = getenv("CREDENTIAL_CACHE_ENABLED", "0") == "1"
+CREDENTIAL_CACHE_TTL: float = float(getenv("CREDENTIAL_CACHE_TTL_SECONDS", 300))
+CREDENTIAL_CACHE_MAX_ENTRIES: int = int(getenv("CREDENTIAL_CACHE_MAX_ENTRIES", 10_000))
+
+## Token verification caches: ##
+TOKEN_CACHE_MAX_ENTRIES: int = int(getenv("TOKEN_CACHE_MAX_ENTRIES", 100_000))
+INTROSPECTION_MAX_TOKENS: int = int(getenv("INTROSPECTION_MAX_TOKENS", 500))
+## Services call /introspect with X-Service-Token, the endpoint is disabled without it.
+INTROSPECTION_API_TOKEN: str = getenv("INTROSPECTION_API_TOKEN")
+USER_PRESENCE_TTL: float = float(getenv("USER_PRESENCE_TTL_SECONDS", 60))
+USER_PRESENCE_MAX_ENTRIES: int = int(getenv("USER_PRESENCE_MAX_ENTRIES", 100_000))
+
+## Token revocation: ##
+REVOCATION_CAPACITY: int = int(getenv("REVOCATION_CAPACITY", 1_000_000))
+REVOCATION_SYNC_INTERVAL: float = float(getenv("REVOCATION_SYNC_INTERVAL_SECONDS", 5))
+## Ids before the sync cursor read again, covers inserts committed out of id order.
+REVOCATION_SYNC_OVERLAP: int = int(getenv("REVOCATION_SYNC_OVERLAP_ROWS", 1000))
+REVOCATION_PRUNE_INTERVAL: float = float(getenv("REVOCATION_PRUNE_INTERVAL_SECONDS", 3600))
+
+## Credential endpoints rate limits: ##
+RATE_LIMIT_ENABLED: bool = getenv("RATE_LIMIT_ENABLED", "1") == "1"
+RATE_LIMIT_BACKEND: str = getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_MAX_KEYS: int = int(getenv("RATE_LIMIT_MAX_KEYS", 100_000))
+RATE_LIMIT_LOGIN_PER_MINUTE: int = int(getenv("RATE_LIMIT_LOGIN_PER_MINUTE", 10))
+RATE_LIMIT_IP_PER_MINUTE: int = int(getenv("RATE_LIMIT_IP_PER_MINUTE", 60))
+RATE_LIMIT_GLOBAL_PER_SECOND: int = int(getenv("RATE_LIMIT_GLOBAL_PER_SECOND", 200))
+## Token introspection (service to service), counted apart from the credential limits:
+RATE_LIMIT_INTROSPECT_PER_SECOND: int = int(getenv("RATE_LIMIT_INTROSPECT_PER_SECOND", 100))
+RATE_LIMIT_INTROSPECT_GLOBAL_PER_SECOND: int = int(getenv("RATE_LIMIT_INTROSPECT_GLOBAL_PER_SECOND", 500))
+
+## Audit log of authentication events: ##
+AUDIT_ENABLED: bool = getenv("AUDIT_ENABLED", "1") == "1"
+AUDIT_QUEUE_SIZE: int = int(getenv("AUDIT_QUEUE_SIZE", 10_000))
+AUDIT_BATCH_SIZE: int = int(getenv("AUDIT_BATCH_SIZE", 500))
+AUDIT_FLUSH_INTERVAL: float = float(getenv("AUDIT_FLUSH_INTERVAL_SECONDS", 1))
+
+## Bulk import/export: ##
+BULK_BATCH_SIZE: int = int(getenv("BULK_BATCH_SIZE", 1000))
+BULK_WORKERS: int = int(getenv("BULK_WORKERS", cpu_count() or 1))
+## Import bodies above this size are spooled to a temporary file instead of memory.
+BULK_SPOOL_MEMORY: int = int(getenv("BULK_SPOOL_MEMORY_BYTES", 16 * 1024 * 1024))
+ADMIN_API_TOKEN: str = getenv("ADMIN_API_TOKEN")
+
+## Metrics endpoint, disabled without a token (scraped with Authorization: Bearer <token>): ##
+METRICS_API_TOKEN: str = getenv("METRICS_API_TOKEN")
+
+## Outbound HTTP client (core.http_client): ##
+HTTP_CLIENT_MAX_CONNECTIONS: int = int(getenv("HTTP_CLIENT_MAX_CONNECTIONS", 100))
+HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST: int = int(getenv("HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST", 20))
+HTTP_CLIENT_CONNECT_TIMEOUT: float = float(getenv("HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS", 2))
+HTTP_CLIENT_TIMEOUT: float = float(getenv("HTTP_CLIENT_TIMEOUT_SECONDS", 10))
+HTTP_CLIENT_KEEPALIVE_TIMEOUT: float = float(getenv("HTTP_CLIENT_KEEPALIVE_SECONDS", 30))
+HTTP_CLIENT_RETRIES: int = int(getenv("HTTP_CLIENT_RETRIES", 2))
+HTTP_CLIENT_BACKOFF: float = float(getenv("HTTP_CLIENT_BACKOFF_SECONDS", 0.1))
+## Hosts (host[:port], comma separated) with their own latency series, others share "other".
+HTTP_CLIENT_METRIC_HOSTS: frozenset[str] = frozenset(
+    host.strip() for host in getenv("HTTP_CLIENT_METRIC_HOSTS", "").split(",") if host.strip()
+)
+
+## Production server (serve.py): ##
+SERVER_BIND_HOST: str = getenv("SERVER_BIND_HOST", "0.0.0.0")
+SERVER_BIND_PORT: int = int(getenv("SERVER_BIND_PORT", 8000))
+SERVER_WORKERS: int = int(getenv("SERVER_WORKERS", cpu_count() or 1))
+SERVER_MAX_REQUESTS: int = int(getenv("SERVER_MAX_REQUESTS", 10_000))
+SERVER_MAX_REQUESTS_JITTER: int = int(getenv("SERVER_MAX_REQUESTS_JITTER", 1000))
+SERVER_GRACEFUL_TIMEOUT: int = int(getenv("SERVER_GRACEFUL_TIMEOUT_SECONDS", 30))
+## Proxies trusted for X-Forwarded-For/-Proto (comma separated, "*" for any): rate limit
+## keys and audit client_ip are the real client address only behind these.
+SERVER_FORWARDED_ALLOW_IPS: str = getenv("SERVER_FORWARDED_ALLOW_IPS", "127.0.0.1")
 
 ## Application endpoints. ##
 SERVER_HOST: str = "http://127.0.0.1:8000"
@@ -0,0 +1,5 @@
+__all__ = [
+    "admin_router"
+]
+
+from .views import admin_router
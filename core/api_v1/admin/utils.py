@@ -0,0 +1,30 @@
+
+## Built-in modules: ##
+from typing import Optional
+from hmac import compare_digest
+
+## Third-party modules: ##
+from fastapi import Header, status
+from fastapi.exceptions import HTTPException
+
+## Local modules: ##
+from config import ADMIN_API_TOKEN
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Allow the request only with valid X-Admin-Token header.
+    Admin endpoints are disabled when ADMIN_API_TOKEN is not configured.
+
+    Args:
+        x_admin_token (Optional[str], Header): Given admin token. Defaults to None.
+
+    Raises:
+        HTTPException: 404 if admin API is disabled, 403 if token is wrong.
+    """
+    if not ADMIN_API_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    if not x_admin_token or not compare_digest(x_admin_token.encode(), ADMIN_API_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid admin token.",
+        )
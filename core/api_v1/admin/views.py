@@ -0,0 +1,114 @@
+
+## Built-in modules: ##
+from typing import Annotated, AsyncIterator, Literal
+from asyncio import to_thread
+from json import dumps
+from tempfile import SpooledTemporaryFile
+
+## Third-party modules: ##
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+
+## Local modules: ##
+from config import BULK_BATCH_SIZE, BULK_SPOOL_MEMORY
+from core.api_v1.admin.utils import require_admin_token
+from core.async_database.db_engine import session_factory
+from core.bulk import (
+    UserImporter,
+    RowConflict,
+    bulk_executor,
+    export_users,
+    iter_lines,
+    parse_records,
+)
+
+NDJSON_MEDIA_TYPE: str = "application/x-ndjson"
+SPOOL_CHUNK_SIZE: int = 256 * 1024
+
+
+admin_router: APIRouter = APIRouter(
+    prefix="/api_v1/admin",
+    tags=["Admin"],
+    dependencies=[Depends(require_admin_token)],
+)
+
+
+async def read_spooled(spool: SpooledTemporaryFile) -> AsyncIterator[bytes]:
+    """Read the spooled body back in chunks, disk reads off the event loop."""
+    try:
+        while chunk := await to_thread(spool.read, SPOOL_CHUNK_SIZE):
+            yield chunk
+    finally:
+        spool.close()
+
+
+@admin_router.post("/users/import")
+async def import_users(
+    request: Request,
+    file_format: Annotated[Literal["csv", "ndjson"], Query(alias="format")] = "ndjson",
+    batch_size: int = BULK_BATCH_SIZE,
+) -> StreamingResponse:
+    """Import users sent in the request body (CSV with header or NDJSON).
+    Rows may hold `password` (hashed here) or `hashed_password` (stored as is).
+
+    The body is received completely before the response starts: once it
+    streams, the server listens for disconnects and would swallow the rest
+    of the body. Large bodies are spooled to a temporary file.
+
+    Args:
+        request (Request): Request with the body to import.
+        file_format (Literal["csv", "ndjson"]): Body format, `format` query parameter.
+        batch_size (int): Rows per INSERT statement.
+
+    Returns:
+        StreamingResponse: NDJSON line per rejected row, summary line at the end.
+    """
+    spool: SpooledTemporaryFile = SpooledTemporaryFile(max_size=BULK_SPOOL_MEMORY)
+    try:
+        async for chunk in request.stream():
+            await to_thread(spool.write, chunk)
+        spool.seek(0)
+    except BaseException:
+        spool.close()
+        raise
+
+    async def import_stream() -> AsyncIterator[str]:
+        importer: UserImporter = UserImporter(
+            session_factory=session_factory,
+            executor=bulk_executor.executor,
+            batch_size=batch_size,
+            workers=bulk_executor.workers,
+        )
+        records = parse_records(iter_lines(read_spooled(spool)), file_format)
+        conflict: RowConflict
+        async for conflict in importer.run(records):
+            yield dumps({
+                "line": conflict.line,
+                "login": conflict.login,
+                "reason": conflict.reason,
+            }) + "\n"
+        yield dumps({
+            "imported": importer.report.imported,
+            "rejected": importer.report.rejected,
+            "batches": importer.report.batches,
+        }) + "\n"
+
+    return StreamingResponse(import_stream(), media_type=NDJSON_MEDIA_TYPE)
+
+
+@admin_router.get("/users/export")
+async def export_users_endpoint(
+    file_format: Annotated[Literal["csv", "ndjson"], Query(alias="format")] = "ndjson",
+) -> StreamingResponse:
+    """Stream every user with its password hash.
+
+    Args:
+        file_format (Literal["csv", "ndjson"]): Response format, `format` query parameter.
+
+    Returns:
+        StreamingResponse: Users in the requested format.
+    """
+    return StreamingResponse(
+        export_users(session_factory, file_format),
+        media_type="text/csv" if file_format == "csv" else NDJSON_MEDIA_TYPE,
+    )
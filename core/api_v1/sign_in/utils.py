@@ -18,12 +18,12 @@ def get_token_dependency(authorization: Optional[str] = Header(None))-> TokenMod
         Token: User access token 
         None: If token not in headers.
     """
-    if authorization:
-        token_data: str = authorization.split(" ")
-    else:
+    if not authorization:
         return None
     
-    return TokenModel(
-        access_token=token_data[1],
-        token_type=token_data[0]
+    ## No intermediate list, a header without token gives empty token (invalid on decode).
+    token_type, _, access_token = authorization.partition(" ")
+    return TokenModel.model_construct(
+        access_token=access_token,
+        token_type=token_type,
     )
\ No newline at end of file
@@ -1,21 +1,25 @@
 
 ## Local modules: ##
-from typing import Annotated, Optional, Any
+from typing import Annotated, Optional
 
 ## Third-party modules: ##
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from fastapi.exceptions import HTTPException
 from fastapi import status
-from aiohttp import ClientSession
 from jwt.exceptions import InvalidTokenError
 
 ## Local modules: ##
 from core.api_v1.sign_in.utils import get_token_dependency
 from core.api_v1.sign_up.schemas import UserRegistrationModel
 from core.api_v1.token_auth.schemas import TokenModel
-from core.api_v1.token_auth.oauth2 import authenticate_user, decode_access_token
-from core.async_database import UserHook
-from config import TOKEN_TYPE, TOKEN_AUTH_ENDP
+from core.api_v1.token_auth.oauth2 import authenticate_user, issue_token_pair
+from core.api_v1.token_auth.responses import token_response
+from core.api_v1.token_auth.verification import token_verifier, user_presence
+from core.api_v1.token_auth.sessions import session_store
+from core.async_database import UserRepository, get_user_repository
+from core.async_database.audit import audit_log
+from core.rate_limit import credential_rate_limiter
+from config import AUTH_MODE, TOKEN_TYPE, STATELESS_ACCESS_TOKENS
 
 
 authorization_router: APIRouter = APIRouter(
@@ -23,15 +27,19 @@ authorization_router: APIRouter = APIRouter(
     tags=["Authorization"]
 )
 
-@authorization_router.post("/")
+@authorization_router.post("/", response_model=TokenModel)
 async def user_authorization(
+    request: Request,
     auth_token: Annotated[TokenModel, Depends(get_token_dependency)],
+    repository: Annotated[UserRepository, Depends(get_user_repository)],
     user_registration_form: Optional[UserRegistrationModel] = None,
-) -> TokenModel:
+) -> Response:
     """User registation endpoint in Registration router.
 
     Args:
+        request (Request): Request, for the client address.
         user_registration_form (UserRegistrationModel): User model from front-end form.
+        repository (UserRepository): Users repository of the request.
 
     Returns:
         JSONResponse: Json response to user. 
@@ -41,42 +49,42 @@ async def user_authorization(
         detail="Could not validate user data.",
         headers={"WWW-Authenticate": TOKEN_TYPE}
     )
+    if auth_token and AUTH_MODE == "session":
+        ## One store lookup, no signature check and no database query.
+        if await session_store.validate(auth_token.access_token) is None:
+            raise payload_exception
+        return token_response(auth_token)
     if auth_token:
         try:
-            user_login: str = decode_access_token(encoded_token=auth_token).login
+            user_login: str = token_verifier.verify(encoded_token=auth_token).login
         except InvalidTokenError:
             raise payload_exception
+        if STATELESS_ACCESS_TOKENS:
+            ## Short-lived signed token is enough, deleted users lose access at its expiry.
+            return token_response(auth_token)
         
-        async_database_hook: UserHook = UserHook()
-        user: UserRegistrationModel = await async_database_hook.get(
-            to_obj=True,
-            login=user_login
-        )
-        if user:
-            return auth_token
+        user_exists: Optional[bool] = user_presence.lookup(user_login)
+        if user_exists is None:
+            user_exists = await repository.exists(login=user_login)
+            user_presence.remember(user_login, user_exists)
+        if user_exists:
+            return token_response(auth_token)
 
     if not user_registration_form:
         raise payload_exception
     
     user_login: str = user_registration_form.login
     user_password: str = user_registration_form.password
+    client_ip: Optional[str] = request.client.host if request.client else None
+    await credential_rate_limiter.check(client_ip=client_ip, login=user_login)
     user: UserRegistrationModel = await authenticate_user(
         user_login=user_login,
-        user_password=user_password
+        user_password=user_password,
+        repository=repository,
     )
     if not user:
+        audit_log.record("login_failure", login=user_login, client_ip=client_ip)
         raise payload_exception
     
-    json_user_data: dict[str, str] = {
-        "login": user.login,
-        "password": user.password,
-    }
-    async with ClientSession() as session:
-        async with session.post(
-            url=TOKEN_AUTH_ENDP,
-            json=json_user_data,
-        ) as response: 
-            json_response: dict[str, Any] = await response.json()
-            access_token: TokenModel = TokenModel(**json_response)
-    
-    return access_token
\ No newline at end of file
+    audit_log.record("login_success", login=user.login, client_ip=client_ip)
+    return token_response(await issue_token_pair(user_login=user.login, session=repository.session))
\ No newline at end of file
@@ -2,4 +2,11 @@ __all__ = [
     "registration_router"
 ]
 
-from .views import registration_router
\ No newline at end of file
+
+def __getattr__(name: str):
+    ## Router is imported on first access: token_auth.oauth2 imports
+    ## sign_up.schemas, and sign_up.views imports token_auth.oauth2 back.
+    if name == "registration_router":
+        from .views import registration_router
+        return registration_router
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,20 +1,21 @@
 
-## Local modules: ##
-from typing import Any
-
 ## Third-party modules: ##
-from fastapi import APIRouter
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, Request, Response
 from fastapi.exceptions import HTTPException
 from fastapi import status
+from sqlalchemy.exc import SQLAlchemyError
 
 ## Local modules: ##
-from config import TOKEN_EXPIRE_TIME
 from core.api_v1.sign_up.schemas import UserRegistrationModel
 from core.api_v1.token_auth.schemas import TokenModel
 from core.api_v1.token_auth.oauth2 import BcryptActions
-from core.api_v1.token_auth.oauth2 import create_access_token
-from core.async_database import UserHook
-from core.async_database.db_models import Users
+from core.api_v1.token_auth.oauth2 import issue_token_pair
+from core.api_v1.token_auth.responses import token_response
+from core.async_database import UserRepository, CreateResult, get_user_repository
+from core.async_database.audit import audit_log
+from core.rate_limit import credential_rate_limiter
 
 
 
@@ -24,48 +25,50 @@ registration_router: APIRouter = APIRouter(
 )
 
 
-@registration_router.post("/")
-async def user_registration(user_registration_form: UserRegistrationModel) -> TokenModel:
+@registration_router.post("/", response_model=TokenModel)
+async def user_registration(
+    request: Request,
+    user_registration_form: UserRegistrationModel,
+    repository: Annotated[UserRepository, Depends(get_user_repository)],
+) -> Response:
     """User registation endpoint in Registration router.
 
     Args:
+        request (Request): Request, for the client address.
         user_registration_form (UserRegistrationModel): User model from front-end form.
+        repository (UserRepository): Users repository of the request.
 
     Returns:
         JSONResponse: Json response to user. 
     """
     user_login: str = user_registration_form.login
     user_password: str = user_registration_form.password
+    client_ip: Optional[str] = request.client.host if request.client else None
+    await credential_rate_limiter.check(client_ip=client_ip, login=user_login)
+    login_taken_exception: Exception = HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="User with this login already exists.",
+        headers={"WWW-Authenticate": "Bearer"}
+    )
+    ## Taken logins are rejected before hashing, the INSERT still catches races.
+    if await repository.exists(login=user_login):
+        raise login_taken_exception
     bcrypt_actions: BcryptActions = BcryptActions(password=user_password)
     hashed_user_password: bytes = await bcrypt_actions.hash_password()
     
-    async_sql_hook: UserHook = UserHook()
-    
-    database_response: bool | Users = await async_sql_hook.append(
-        login=user_login,
-        hashed_password=hashed_user_password
-    )
-    if isinstance(database_response, Users):
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="User with this login already exists.",
-            headers={"WWW-Authenticate": "Bearer"}
+    try:
+        database_response: CreateResult = await repository.create(
+            login=user_login,
+            hashed_password=hashed_user_password.decode()
         )
-    if not database_response:
+    except SQLAlchemyError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to register the user.",
             headers={"WWW-Authenticate": "Bearer"}
         )
+    if not database_response.created:
+        raise login_taken_exception
     
-    user_data: dict[str, Any] = {
-        "sub": user_login,
-    }
-    jwt_access_token: str = create_access_token(
-        data_to_encode=user_data,
-        expires_delta=TOKEN_EXPIRE_TIME,
-    )
-    return TokenModel(
-        access_token=jwt_access_token,
-        token_type="Bearer"
-    )
\ No newline at end of file
+    audit_log.record("sign_up", login=user_login, client_ip=client_ip)
+    return token_response(await issue_token_pair(user_login=user_login, session=repository.session))
\ No newline at end of file
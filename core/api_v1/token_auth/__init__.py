@@ -1,13 +1,31 @@
 __all__ = [
     "create_access_token", 
+    "issue_access_token",
+    "issue_token_pair",
     "authenticate_user",
     "BcryptActions",
+    "HashingEngine",
+    "HashingEngineError",
+    "hashing_engine",
+    "HasherRegistry",
+    "hasher_registry",
     "token_auth_router"
 ]
 
 from .oauth2 import (
     create_access_token, 
+    issue_access_token,
+    issue_token_pair,
     authenticate_user,
     BcryptActions
 )
+from .hashing import (
+    HashingEngine,
+    HashingEngineError,
+    hashing_engine
+)
+from .hashers import (
+    HasherRegistry,
+    hasher_registry
+)
 from .views import token_auth_router
\ No newline at end of file
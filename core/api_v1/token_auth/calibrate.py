@@ -0,0 +1,84 @@
+
+"""Pick password hash cost for a target verify latency on this hardware.
+
+Usage:
+    python -m core.api_v1.token_auth.calibrate --scheme bcrypt --target-ms 250
+"""
+
+## Built-in modules: ##
+from argparse import ArgumentParser, Namespace
+from time import perf_counter
+from typing import Callable
+
+## Local modules: ##
+from core.api_v1.token_auth.hashers import PasswordHasher, BcryptHasher, Argon2Hasher
+
+CALIBRATION_PASSWORD: bytes = b"calibration-password"
+
+
+def measure_verify(hasher: PasswordHasher, samples: int) -> float:
+    """Median verify time of the hasher in milliseconds."""
+    hashed_password: bytes = hasher.hash(CALIBRATION_PASSWORD)
+    timings: list[float] = []
+    for _ in range(samples):
+        started_at: float = perf_counter()
+        hasher.verify(CALIBRATION_PASSWORD, hashed_password)
+        timings.append((perf_counter() - started_at) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def calibrate(
+    build_hasher: Callable[[int], PasswordHasher],
+    costs: range,
+    target_ms: float,
+    samples: int,
+) -> tuple[int, float]:
+    """Find the highest cost whose verify time does not exceed the target.
+
+    Args:
+        build_hasher (Callable[[int], PasswordHasher]): Hasher factory for the cost.
+        costs (range): Costs to try, in ascending order.
+        target_ms (float): Target verify latency in milliseconds.
+        samples (int): Verify calls per cost.
+
+    Returns:
+        tuple[int, float]: Chosen cost and its measured verify time.
+    """
+    chosen: tuple[int, float] = (costs[0], 0.0)
+    for cost in costs:
+        verify_ms: float = measure_verify(build_hasher(cost), samples)
+        print(f"cost={cost:<3} verify={verify_ms:9.2f} ms")
+        if verify_ms > target_ms:
+            break
+        chosen = (cost, verify_ms)
+    return chosen
+
+
+def main() -> None:
+    parser: ArgumentParser = ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scheme", choices=("bcrypt", "argon2"), default="bcrypt")
+    parser.add_argument("--target-ms", type=float, default=250.0)
+    parser.add_argument("--samples", type=int, default=3)
+    arguments: Namespace = parser.parse_args()
+
+    if arguments.scheme == "bcrypt":
+        cost, verify_ms = calibrate(
+            build_hasher=lambda rounds: BcryptHasher(rounds=rounds),
+            costs=range(4, 20),
+            target_ms=arguments.target_ms,
+            samples=arguments.samples,
+        )
+        print(f"\nBCRYPT_ROUNDS={cost}  # ~{verify_ms:.1f} ms per verify")
+    else:
+        cost, verify_ms = calibrate(
+            build_hasher=lambda time_cost: Argon2Hasher(time_cost=time_cost),
+            costs=range(1, 20),
+            target_ms=arguments.target_ms,
+            samples=arguments.samples,
+        )
+        print(f"\nARGON2_TIME_COST={cost}  # ~{verify_ms:.1f} ms per verify")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+
+## Built-in modules: ##
+from typing import Optional
+from collections import OrderedDict
+from hashlib import sha256
+from hmac import compare_digest, new as new_hmac
+from secrets import token_bytes
+from time import monotonic
+
+## Local modules: ##
+from config import (
+    CREDENTIAL_CACHE_ENABLED,
+    CREDENTIAL_CACHE_TTL,
+    CREDENTIAL_CACHE_MAX_ENTRIES,
+)
+from core.async_database import UserHook
+
+
+class VerifiedCredentialCache(object):
+    """LRU cache of recent successful password verifications.
+
+    Entry holds HMAC of login, password and stored hash under a per-process
+    random key, never the password itself. Changing the stored hash makes the
+    old entry useless, and UserHook changes drop the entry of that user.
+    """
+    def __init__(
+        self,
+        enabled: bool = CREDENTIAL_CACHE_ENABLED,
+        ttl: float = CREDENTIAL_CACHE_TTL,
+        max_entries: int = CREDENTIAL_CACHE_MAX_ENTRIES,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            enabled (bool): Cache is opt-in, disabled cache never hits.
+            ttl (float): Entry time to live in seconds.
+            max_entries (int): Max number of cached logins.
+        """
+        self.enabled: bool = enabled
+        self.ttl: float = ttl
+        self.max_entries: int = max_entries
+        self._key: bytes = token_bytes(32)
+        self._entries: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+
+    def _digest(self, login: str, password: bytes, hashed_password: bytes) -> bytes:
+        message: bytes = b"\x00".join((login.encode(), password, hashed_password))
+        return new_hmac(self._key, message, sha256).digest()
+
+    def is_verified(self, login: str, password: bytes, hashed_password: bytes) -> bool:
+        """Check if this password was verified against this stored hash recently.
+
+        Args:
+            login (str): User login.
+            password (bytes): Given password.
+            hashed_password (bytes): Stored password hash.
+
+        Returns:
+            bool: True if bcrypt check can be skipped.
+        """
+        if not self.enabled:
+            return False
+        entry: Optional[tuple[bytes, float]] = self._entries.get(login)
+        if entry is None:
+            return False
+        digest, expires_at = entry
+        if expires_at <= monotonic():
+            self._entries.pop(login, None)
+            return False
+        if not compare_digest(digest, self._digest(login, password, hashed_password)):
+            return False
+        self._entries.move_to_end(login)
+        return True
+
+    def remember(self, login: str, password: bytes, hashed_password: bytes) -> None:
+        """Store successful verification."""
+        if not self.enabled:
+            return
+        self._entries[login] = (
+            self._digest(login, password, hashed_password),
+            monotonic() + self.ttl,
+        )
+        self._entries.move_to_end(login)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, login: Optional[str] = None) -> None:
+        """Drop the entry of the user, or every entry if login is None."""
+        if login is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(login, None)
+
+
+credential_cache: VerifiedCredentialCache = VerifiedCredentialCache()
+UserHook.subscribe(credential_cache.invalidate)
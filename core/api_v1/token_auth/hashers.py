@@ -0,0 +1,236 @@
+
+## Built-in modules: ##
+from typing import Any, Optional
+from importlib.util import find_spec
+
+## Third-party modules: ##
+from bcrypt import checkpw, gensalt, hashpw
+
+## Local modules: ##
+from config import (
+    PASSWORD_HASH_SCHEME,
+    BCRYPT_ROUNDS,
+    ARGON2_TIME_COST,
+    ARGON2_MEMORY_COST,
+    ARGON2_PARALLELISM,
+)
+from core.api_v1.token_auth.hashing import HashingEngine, hashing_engine
+
+## argon2-cffi is imported on first argon2 hash or verify, not at startup.
+ARGON2_AVAILABLE: bool = find_spec("argon2") is not None
+
+
+def to_bytes(hashed_password: str | bytes) -> bytes:
+    """Stored hashes come from VARCHAR columns as str, hashers work with bytes."""
+    if isinstance(hashed_password, str):
+        return hashed_password.encode()
+    return hashed_password
+
+
+class PasswordHasher(object):
+    """Base class of password hash schemes.
+    Methods are synchronous and CPU heavy, they run inside the hashing engine pool.
+    """
+    scheme: str = ""
+
+    def identify(self, hashed_password: bytes) -> bool:
+        """Check if the stored hash was made by this scheme."""
+        raise NotImplementedError
+
+    def hash(self, password: bytes) -> bytes:
+        """Hash the password with current policy parameters."""
+        raise NotImplementedError
+
+    def verify(self, password: bytes, hashed_password: bytes) -> bool:
+        """Check the password against the stored hash."""
+        raise NotImplementedError
+
+    def needs_rehash(self, hashed_password: bytes) -> bool:
+        """Check if the stored hash parameters differ from current policy."""
+        raise NotImplementedError
+
+
+class BcryptHasher(PasswordHasher):
+    """bcrypt scheme, hashes look like $2b$12$<salt+checksum>."""
+    scheme: str = "bcrypt"
+
+    def __init__(self, rounds: int = BCRYPT_ROUNDS) -> None:
+        self.rounds: int = rounds
+
+    def identify(self, hashed_password: bytes) -> bool:
+        return hashed_password[:4] in (b"$2a$", b"$2b$", b"$2y$")
+
+    def hash(self, password: bytes) -> bytes:
+        return hashpw(password, gensalt(rounds=self.rounds))
+
+    def verify(self, password: bytes, hashed_password: bytes) -> bool:
+        return checkpw(password, hashed_password)
+
+    def needs_rehash(self, hashed_password: bytes) -> bool:
+        try:
+            return int(hashed_password[4:6]) != self.rounds
+        except ValueError:
+            return True
+
+
+class Argon2Hasher(PasswordHasher):
+    """argon2id scheme. Needs optional argon2-cffi dependency."""
+    scheme: str = "argon2"
+
+    def __init__(
+        self,
+        time_cost: int = ARGON2_TIME_COST,
+        memory_cost: int = ARGON2_MEMORY_COST,
+        parallelism: int = ARGON2_PARALLELISM,
+    ) -> None:
+        if not ARGON2_AVAILABLE:
+            raise RuntimeError("argon2 scheme needs argon2-cffi, install eclipce[argon2].")
+        self.time_cost: int = time_cost
+        self.memory_cost: int = memory_cost
+        self.parallelism: int = parallelism
+        self._argon2: Optional[Any] = None
+
+    @property
+    def _hasher(self) -> Any:
+        if self._argon2 is None:
+            from argon2 import PasswordHasher as Argon2PasswordHasher
+            self._argon2 = Argon2PasswordHasher(
+                time_cost=self.time_cost,
+                memory_cost=self.memory_cost,
+                parallelism=self.parallelism,
+            )
+        return self._argon2
+
+    def identify(self, hashed_password: bytes) -> bool:
+        return hashed_password.startswith(b"$argon2")
+
+    def hash(self, password: bytes) -> bytes:
+        return self._hasher.hash(password).encode()
+
+    def verify(self, password: bytes, hashed_password: bytes) -> bool:
+        from argon2.exceptions import InvalidHashError, VerificationError
+        try:
+            return self._hasher.verify(hashed_password, password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+    def needs_rehash(self, hashed_password: bytes) -> bool:
+        return self._hasher.check_needs_rehash(hashed_password.decode())
+
+
+class HasherRegistry(object):
+    """Registry of known schemes. New hashes use the default scheme,
+    stored hashes are verified by whichever scheme made them.
+
+    Without a default hasher, every available scheme is registered with
+    `scheme` as default on first use (or by `configure` from the app
+    lifespan), so an unknown scheme fails startup, not the import.
+    """
+    def __init__(
+        self,
+        default: Optional[PasswordHasher] = None,
+        engine: HashingEngine = hashing_engine,
+        scheme: str = PASSWORD_HASH_SCHEME,
+    ) -> None:
+        """
+        Args:
+            default (Optional[PasswordHasher]): Scheme of new hashes, configured from `scheme` if None.
+            engine (HashingEngine): Pool running the hash computations.
+            scheme (str): Default scheme name ("bcrypt" or "argon2") used without `default`.
+        """
+        self.engine: HashingEngine = engine
+        self.scheme: str = scheme
+        self._default: Optional[PasswordHasher] = default
+        self._hashers: dict[str, PasswordHasher] = {}
+        self._dummy_hash: Optional[bytes] = None
+        if default is not None:
+            self.register(default)
+
+    def configure(self) -> None:
+        """Register every available scheme, `scheme` becomes the default.
+
+        Raises:
+            ValueError: If `scheme` is unknown or its dependency is not installed.
+        """
+        hashers: dict[str, PasswordHasher] = {"bcrypt": BcryptHasher()}
+        if ARGON2_AVAILABLE:
+            hashers["argon2"] = Argon2Hasher()
+        if self.scheme not in hashers:
+            raise ValueError(f"Unknown or unavailable password hash scheme: {self.scheme}")
+        for hasher in hashers.values():
+            self.register(hasher)
+        self._default = hashers[self.scheme]
+
+    @property
+    def default(self) -> PasswordHasher:
+        """Scheme of new hashes."""
+        if self._default is None:
+            self.configure()
+        return self._default
+
+    def register(self, hasher: PasswordHasher) -> None:
+        """Register scheme, so hashes made by it can be verified."""
+        self._hashers[hasher.scheme] = hasher
+
+    def identify(self, hashed_password: str | bytes) -> Optional[PasswordHasher]:
+        """Find the scheme of the stored hash. None if scheme is unknown."""
+        hashed_password = to_bytes(hashed_password)
+        if self._default is None:
+            self.configure()
+        for hasher in self._hashers.values():
+            if hasher.identify(hashed_password):
+                return hasher
+        return None
+
+    def needs_rehash(self, hashed_password: str | bytes) -> bool:
+        """Check if the stored hash should be replaced by a current policy hash."""
+        hashed_password = to_bytes(hashed_password)
+        hasher: Optional[PasswordHasher] = self.identify(hashed_password)
+        if hasher is not self.default:
+            return True
+        return hasher.needs_rehash(hashed_password)
+
+    async def hash(self, password: bytes) -> bytes:
+        """Hash the password with the default scheme in the hashing pool."""
+        return await self.engine.run(self.default.hash, password)
+
+    async def verify(self, password: bytes, hashed_password: str | bytes) -> bool:
+        """Verify the password with the scheme of the stored hash in the hashing pool."""
+        hashed_password = to_bytes(hashed_password)
+        hasher: Optional[PasswordHasher] = self.identify(hashed_password)
+        if hasher is None:
+            return False
+        return await self.engine.run(hasher.verify, password, hashed_password)
+
+    async def dummy_verify(self, password: bytes) -> bool:
+        """Verify against a throwaway hash of the default scheme.
+        Takes as long as a real check, so unknown logins are not told apart by timing.
+
+        Returns:
+            bool: Always False.
+        """
+        if self._dummy_hash is None:
+            self._dummy_hash = await self.hash(b"dummy-password-for-unknown-logins")
+        await self.engine.run(self.default.verify, password, self._dummy_hash)
+        return False
+
+
+def build_hasher_registry(scheme: str = PASSWORD_HASH_SCHEME) -> HasherRegistry:
+    """Create registry with the configured default scheme.
+
+    Args:
+        scheme (str): Default scheme name ("bcrypt" or "argon2").
+
+    Raises:
+        ValueError: If the scheme is unknown or its dependency is not installed.
+
+    Returns:
+        HasherRegistry: Registry able to verify every available scheme.
+    """
+    registry: HasherRegistry = HasherRegistry(scheme=scheme)
+    registry.configure()
+    return registry
+
+
+## Configured on first use or at app startup, not at import.
+hasher_registry: HasherRegistry = HasherRegistry()
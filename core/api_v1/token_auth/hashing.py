@@ -0,0 +1,181 @@
+
+## Built-in modules: ##
+from typing import Any, Callable, Optional, TypeVar
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from asyncio import Semaphore, TimeoutError, get_running_loop, shield, to_thread, wait_for, wrap_future
+from time import perf_counter
+
+## Local modules: ##
+from config import HASHING_DEADLINE, HASHING_EXECUTOR, HASHING_QUEUE_SIZE, HASHING_WORKERS
+from core.metrics import Counter, Gauge, Histogram
+
+ResultT = TypeVar("ResultT")
+
+
+class HashingEngineError(Exception):
+    """Base error of the hashing engine. Routers answer it with 503."""
+
+
+class HashingEngineOverloaded(HashingEngineError):
+    """Raised when hashing queue is full and request was shed."""
+
+
+class HashingDeadlineExceeded(HashingEngineError):
+    """Raised when hashing request did not finish before its deadline."""
+
+
+class HashingEngine(object):
+    """Bounded worker pool for CPU heavy password hashing.
+
+    At most `workers` calls run at the same time, at most `queue_size` calls
+    wait for a worker. Anything above that is rejected at once, so a login
+    storm gets fast 503 answers instead of a latency rise on every endpoint.
+    """
+    def __init__(
+        self,
+        workers: int = HASHING_WORKERS,
+        queue_size: int = HASHING_QUEUE_SIZE,
+        deadline: float = HASHING_DEADLINE,
+        executor_kind: str = HASHING_EXECUTOR,
+    ) -> None:
+        """Initialize engine. Worker pool is created on the first call.
+
+        Args:
+            workers (int): Number of pool workers.
+            queue_size (int): Max number of calls waiting for a worker.
+            deadline (float): Default per-call deadline in seconds.
+            executor_kind (str): "thread" or "process".
+        """
+        if executor_kind not in ("thread", "process"):
+            raise ValueError(f"Unknown hashing executor: {executor_kind}")
+        self.workers: int = workers
+        self.queue_size: int = queue_size
+        self.deadline: float = deadline
+        self.executor_kind: str = executor_kind
+        self._executor: Optional[Executor] = None
+        self._slots: Semaphore = Semaphore(workers)
+        self._waiting: int = 0
+
+        self.queue_depth: Gauge = Gauge(
+            "hashing_queue_depth", "Hashing calls waiting for a worker."
+        )
+        self.in_flight: Gauge = Gauge(
+            "hashing_in_flight", "Hashing calls running in the pool."
+        )
+        self.rejected: Counter = Counter(
+            "hashing_rejected_total", "Hashing calls shed because the queue was full."
+        )
+        self.timed_out: Counter = Counter(
+            "hashing_deadline_exceeded_total", "Hashing calls that missed their deadline."
+        )
+        self.queue_wait: Histogram = Histogram(
+            "hashing_queue_wait_seconds", "Time spent waiting for a hashing worker."
+        )
+        self.latency: Histogram = Histogram(
+            "hashing_latency_seconds", "Time spent hashing in the pool."
+        )
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="hashing",
+                )
+        return self._executor
+
+    async def run(
+        self,
+        function: Callable[..., ResultT],
+        *args: Any,
+        deadline: Optional[float] = None,
+    ) -> ResultT:
+        """Run function in the worker pool with admission control.
+
+        Args:
+            function (Callable): Picklable function (module level or bound method).
+            *args: Function arguments.
+            deadline (Optional[float]): Per-call deadline in seconds. Defaults to engine deadline.
+
+        Raises:
+            HashingEngineOverloaded: If the waiting queue is full.
+            HashingDeadlineExceeded: If the call did not finish in time.
+
+        Returns:
+            ResultT: Function result.
+        """
+        if self._slots.locked() and self._waiting >= self.queue_size:
+            self.rejected.inc()
+            raise HashingEngineOverloaded("Password hashing queue is full.")
+
+        timeout: float = self.deadline if deadline is None else deadline
+        enqueued_at: float = perf_counter()
+        self._waiting += 1
+        self.queue_depth.inc()
+        try:
+            await wait_for(self._slots.acquire(), timeout=timeout)
+        except TimeoutError:
+            self.timed_out.inc()
+            raise HashingDeadlineExceeded("Password hashing queue wait exceeded deadline.")
+        finally:
+            self._waiting -= 1
+            self.queue_depth.dec()
+
+        started_at: float = perf_counter()
+        self.queue_wait.observe(started_at - enqueued_at)
+        self.in_flight.inc()
+        try:
+            future: Future = self.executor.submit(function, *args)
+        except BaseException:
+            self.in_flight.dec()
+            self._slots.release()
+            raise
+        ## Worker slot is freed when the work is really done, not when the caller gives up.
+        loop = get_running_loop()
+
+        def release_slot(_: Future) -> None:
+            try:
+                loop.call_soon_threadsafe(self._release)
+            except RuntimeError:
+                ## Event loop is already closed on shutdown.
+                pass
+        future.add_done_callback(release_slot)
+
+        try:
+            result: ResultT = await wait_for(
+                shield(wrap_future(future)),
+                timeout=max(timeout - (started_at - enqueued_at), 0),
+            )
+        except TimeoutError:
+            self.timed_out.inc()
+            raise HashingDeadlineExceeded("Password hashing exceeded deadline.")
+        self.latency.observe(perf_counter() - started_at)
+        return result
+
+    def _release(self) -> None:
+        self.in_flight.dec()
+        self._slots.release()
+
+    def metrics(self) -> dict[str, Any]:
+        """Current engine metrics."""
+        return {
+            "queue_depth": self.queue_depth.value,
+            "in_flight": self.in_flight.value,
+            "rejected": self.rejected.value,
+            "deadline_exceeded": self.timed_out.value,
+            "queue_wait": self.queue_wait.snapshot(),
+            "latency": self.latency.snapshot(),
+        }
+
+    async def shutdown(self) -> None:
+        """Stop the worker pool, waiting for running calls off the event loop."""
+        if self._executor is not None:
+            executor: Executor = self._executor
+            self._executor = None
+            await to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+
+hashing_engine: HashingEngine = HashingEngine()
@@ -0,0 +1,257 @@
+
+"""Token signing keys with `kid` headers, rotation and JWKS publishing.
+
+Generate a key for SIGNING_KEYS_DIR:
+    python -m core.api_v1.token_auth.keyring generate --algorithm EdDSA --dir keys/
+
+Rotation: generate a new key and restart (or reload) the workers. The newest
+key signs, older keys and SECRET_KEY verify for SIGNING_KEY_GRACE seconds
+after the new key file was written, then they are dropped.
+"""
+
+## Built-in modules: ##
+from typing import Any, Optional
+from argparse import ArgumentParser, Namespace
+from dataclasses import dataclass
+from hashlib import sha256
+from json import dumps
+from pathlib import Path
+from time import time
+from uuid import uuid4
+
+## Third-party modules: ##
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from cryptography.hazmat.primitives.serialization import (
+    Encoding,
+    NoEncryption,
+    PrivateFormat,
+    load_pem_private_key,
+)
+from jwt.algorithms import OKPAlgorithm, RSAAlgorithm
+
+## Local modules: ##
+from config import (
+    SECRET_KEY,
+    TOKEN_HASH_ALGORITHM,
+    SIGNING_KEYS_DIR,
+    SIGNING_ACTIVE_KID,
+    SIGNING_KEY_GRACE,
+)
+
+ASYMMETRIC_ALGORITHMS: tuple[str, ...] = ("RS256", "EdDSA")
+SYMMETRIC_KID: str = "default"
+
+
+@dataclass(slots=True)
+class SigningKey:
+    """One signing key. `not_after` is set once the key is retired."""
+    kid: str
+    algorithm: str
+    signing_key: Any
+    verifying_key: Any
+    not_after: Optional[float] = None
+
+    @property
+    def public(self) -> bool:
+        return self.algorithm in ASYMMETRIC_ALGORITHMS
+
+    def jwk(self) -> dict[str, Any]:
+        """Public key as JWK."""
+        if self.algorithm == "RS256":
+            jwk: dict[str, Any] = RSAAlgorithm.to_jwk(self.verifying_key, as_dict=True)
+        else:
+            jwk = OKPAlgorithm.to_jwk(self.verifying_key, as_dict=True)
+        jwk.update({"kid": self.kid, "alg": self.algorithm, "use": "sig"})
+        return jwk
+
+
+def key_from_private(kid: str, private_key: Any) -> SigningKey:
+    """Build SigningKey from RSA or Ed25519 private key."""
+    if isinstance(private_key, rsa.RSAPrivateKey):
+        algorithm: str = "RS256"
+    elif isinstance(private_key, ed25519.Ed25519PrivateKey):
+        algorithm = "EdDSA"
+    else:
+        raise ValueError(f"Unsupported signing key type of {kid}.")
+    return SigningKey(
+        kid=kid,
+        algorithm=algorithm,
+        signing_key=private_key,
+        verifying_key=private_key.public_key(),
+    )
+
+
+def generate_key(algorithm: str) -> SigningKey:
+    """Generate new asymmetric key with random kid."""
+    if algorithm == "RS256":
+        private_key: Any = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    elif algorithm == "EdDSA":
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    else:
+        raise ValueError(f"Unsupported signing algorithm: {algorithm}")
+    return key_from_private(uuid4().hex[:16], private_key)
+
+
+class KeyRing(object):
+    """Active signing key plus retired keys still accepted for verification.
+
+    Retired keys are kept until `not_after`, which must be later than the
+    expiry of the last token they signed. JWKS document and its ETag are
+    rebuilt only when the ring changes.
+
+    Configured keys are loaded on first use, or by `load` from the app
+    lifespan, so importing the module reads no key file. A ring filled
+    with `add` is not loaded from the configuration.
+    """
+    def __init__(self) -> None:
+        self._active: Optional[SigningKey] = None
+        self._keys: dict[str, SigningKey] = {}
+        self._jwks: bytes = b'{"keys":[]}'
+        self._etag: str = ""
+        self._loaded: bool = False
+        self._rebuild_jwks()
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.load()
+
+    @property
+    def active(self) -> Optional[SigningKey]:
+        """Key signing new tokens."""
+        self._ensure_loaded()
+        return self._active
+
+    def add(self, key: SigningKey, active: bool = False) -> None:
+        """Add key for verification, and for signing if active."""
+        self._loaded = True
+        self._keys[key.kid] = key
+        if active:
+            self._active = key
+        self._rebuild_jwks()
+
+    def prune(self) -> None:
+        """Drop retired keys past their grace period."""
+        self._ensure_loaded()
+        now: float = time()
+        expired: list[str] = [
+            kid for kid, key in self._keys.items()
+            if key.not_after is not None and key.not_after <= now
+        ]
+        for kid in expired:
+            del self._keys[kid]
+        if expired:
+            self._rebuild_jwks()
+
+    def verification_key(self, kid: Optional[str]) -> Optional[SigningKey]:
+        """Key for the token `kid` header, tokens without kid use the symmetric key."""
+        self._ensure_loaded()
+        key: Optional[SigningKey] = self._keys.get(kid or SYMMETRIC_KID)
+        if key is None or (key.not_after is not None and key.not_after <= time()):
+            return None
+        return key
+
+    def _rebuild_jwks(self) -> None:
+        document: dict[str, list] = {
+            "keys": [key.jwk() for key in self._keys.values() if key.public],
+        }
+        self._jwks = dumps(document, separators=(",", ":"), sort_keys=True).encode()
+        self._etag = f'"{sha256(self._jwks).hexdigest()[:32]}"'
+
+    @property
+    def jwks(self) -> bytes:
+        self._ensure_loaded()
+        return self._jwks
+
+    @property
+    def etag(self) -> str:
+        self._ensure_loaded()
+        return self._etag
+
+    def load(
+        self,
+        keys_dir: Optional[str] = SIGNING_KEYS_DIR,
+        active_kid: Optional[str] = SIGNING_ACTIVE_KID,
+        grace: float = SIGNING_KEY_GRACE,
+    ) -> None:
+        """Load `<kid>.pem` private keys from the directory.
+
+        Active key is `active_kid`, or the newest file. Without a directory
+        the symmetric SECRET_KEY/HASH_ALGORITHM pair is used, as before.
+        Every other key, the symmetric one included, is retired `grace`
+        seconds after the active key file was written (or after its own
+        file, if newer). Retirement follows file times, not process start,
+        so every worker agrees on it and restarts do not extend it.
+
+        Raises:
+            ValueError: If `active_kid` has no key file.
+        """
+        keys: list[tuple[SigningKey, float]] = []
+        if SECRET_KEY and TOKEN_HASH_ALGORITHM:
+            keys.append((
+                SigningKey(
+                    kid=SYMMETRIC_KID,
+                    algorithm=TOKEN_HASH_ALGORITHM,
+                    signing_key=SECRET_KEY,
+                    verifying_key=SECRET_KEY,
+                ),
+                0.0,
+            ))
+        if keys_dir:
+            key_files: list[Path] = sorted(
+                Path(keys_dir).glob("*.pem"),
+                key=lambda path: path.stat().st_mtime,
+            )
+            for key_file in key_files:
+                keys.append((
+                    key_from_private(
+                        kid=key_file.stem,
+                        private_key=load_pem_private_key(key_file.read_bytes(), password=None),
+                    ),
+                    key_file.stat().st_mtime,
+                ))
+
+        self._keys.clear()
+        self._active = None
+        if keys:
+            active_key, active_since = keys[-1]
+            if keys_dir and active_kid is not None:
+                matching: list[tuple[SigningKey, float]] = [
+                    (key, since) for key, since in keys if key.kid == active_kid
+                ]
+                if not matching:
+                    raise ValueError(f"No signing key file for SIGNING_ACTIVE_KID {active_kid}.")
+                active_key, active_since = matching[0]
+            for key, since in keys:
+                if key is not active_key:
+                    key.not_after = max(active_since, since) + grace
+                self._keys[key.kid] = key
+            self._active = active_key
+        self._loaded = True
+        self.prune()
+        self._rebuild_jwks()
+
+
+key_ring: KeyRing = KeyRing()
+
+
+def main() -> None:
+    parser: ArgumentParser = ArgumentParser(description="Signing keys management.")
+    parser.add_argument("command", choices=("generate",))
+    parser.add_argument("--algorithm", choices=ASYMMETRIC_ALGORITHMS, default="EdDSA")
+    parser.add_argument("--dir", required=True)
+    arguments: Namespace = parser.parse_args()
+
+    key: SigningKey = generate_key(arguments.algorithm)
+    key_file: Path = Path(arguments.dir) / f"{key.kid}.pem"
+    key_file.parent.mkdir(parents=True, exist_ok=True)
+    key_file.write_bytes(key.signing_key.private_bytes(
+        encoding=Encoding.PEM,
+        format=PrivateFormat.PKCS8,
+        encryption_algorithm=NoEncryption(),
+    ))
+    key_file.chmod(0o600)
+    print(key_file)
+
+
+if __name__ == "__main__":
+    main()
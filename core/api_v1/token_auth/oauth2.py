@@ -1,20 +1,32 @@
 
 ## Built-in modules: ##
 from typing import Optional, Coroutine, Any
+from asyncio import Task, create_task
 from datetime import timedelta, timezone, datetime
+from uuid import uuid4
 
 ## Third-party modules: ##
-from aiobcrypt import hashpw, gensalt, checkpw
 import jwt
+from jwt.exceptions import InvalidTokenError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 ## Local modules: ##
-from config import SECRET_KEY, TOKEN_HASH_ALGORITHM, TOKEN_EXPIRE_TIME
-from core.async_database import UserHook
+from config import AUTH_MODE, TOKEN_EXPIRE_TIME, TOKEN_TYPE
+from core.async_database import UserRepository
+from core.async_database.db_engine import session_factory
 from core.api_v1.sign_up.schemas import UserRegistrationModel
 from core.api_v1.token_auth.schemas import TokenDecodedModel, TokenModel
-from core.async_database.db_models import Users
+from core.api_v1.token_auth.hashers import BcryptHasher, hasher_registry
+from core.api_v1.token_auth.hashing import HashingEngineError
+from core.api_v1.token_auth.credential_cache import credential_cache
+from core.api_v1.token_auth.refresh import issue_refresh_token
+from core.api_v1.token_auth.keyring import SigningKey, key_ring
+from core.api_v1.token_auth.sessions import session_store
+from core.metrics import timed
 
 
+@timed("jwt_seconds", "JWT encode and decode time.", operation="encode")
 def create_access_token(
     data_to_encode: dict[str, Any],
     expires_delta: Optional[timedelta] = TOKEN_EXPIRE_TIME,
@@ -26,19 +38,74 @@ def create_access_token(
         expires_delta (Optional[timedelta], optional): Token expire time delta. Defaults to TOKEN_EXPIRE_TIME.
 
     Returns:
-        str: Generated token.
+        str: Generated token with unique `jti` claim, so it can be revoked.
     """
     to_encode: dict[str, Any] = data_to_encode.copy()
     expire_time: datetime = datetime.now(timezone.utc) + expires_delta
     to_encode.update({"exp": expire_time})
+    to_encode.setdefault("jti", uuid4().hex)
+    signing_key: SigningKey = key_ring.active
     encoded_jwt: str = jwt.encode(
         payload=to_encode,
-        key=SECRET_KEY,
-        algorithm=TOKEN_HASH_ALGORITHM,
+        key=signing_key.signing_key,
+        algorithm=signing_key.algorithm,
+        headers={"kid": signing_key.kid},
     )
     return encoded_jwt
 
 
+def issue_access_token(
+    user_login: str,
+    expires_delta: Optional[timedelta] = TOKEN_EXPIRE_TIME,
+    refresh_token: Optional[str] = None,
+) -> TokenModel:
+    """Issue access token for already authenticated user.
+    Shared by all routers, so no endpoint has to call another one over HTTP.
+
+    Args:
+        user_login (str): Authenticated user login.
+        expires_delta (Optional[timedelta], optional): Token expire time delta. Defaults to TOKEN_EXPIRE_TIME.
+        refresh_token (Optional[str], optional): Refresh token to return along. Defaults to None.
+
+    Returns:
+        TokenModel: Token model ready to be returned to user.
+    """
+    user_data: dict[str, Any] = {
+        "sub": user_login,
+    }
+    jwt_access_token: str = create_access_token(
+        data_to_encode=user_data,
+        expires_delta=expires_delta,
+    )
+    ## Values are built here, model_construct skips their re-validation.
+    return TokenModel.model_construct(
+        access_token=jwt_access_token,
+        token_type=TOKEN_TYPE,
+        refresh_token=refresh_token,
+    )
+
+
+async def issue_token_pair(user_login: str, session: AsyncSession) -> TokenModel:
+    """Issue short-lived access token with a new refresh token chain.
+    With AUTH_MODE=session, issue an opaque session id instead (no refresh token).
+
+    Args:
+        user_login (str): Authenticated user login.
+        session (AsyncSession): Request session to store refresh token in.
+
+    Returns:
+        TokenModel: Access and refresh tokens.
+    """
+    if AUTH_MODE == "session":
+        return TokenModel.model_construct(
+            access_token=await session_store.create(user_login),
+            token_type=TOKEN_TYPE,
+        )
+    refresh_token: str = await issue_refresh_token(session=session, login=user_login)
+    return issue_access_token(user_login=user_login, refresh_token=refresh_token)
+
+
+@timed("jwt_seconds", "JWT encode and decode time.", operation="decode")
 def decode_access_token(
     encoded_token: TokenModel
 ) -> TokenDecodedModel:
@@ -47,52 +114,130 @@ def decode_access_token(
     Args:
         token (str): encoded JWT token.
 
+    Raises:
+        InvalidTokenError: If token is invalid, expired or signed by unknown key.
+
     Returns:
         TokenDecodedModel: Decoded token information.
     """
+    token_header: dict[str, Any] = jwt.get_unverified_header(encoded_token.access_token)
+    verifying_key: Optional[SigningKey] = key_ring.verification_key(token_header.get("kid"))
+    if verifying_key is None:
+        raise InvalidTokenError("Token signed by unknown key.")
     payload: dict = jwt.decode(
         jwt=encoded_token.access_token, 
-        key=SECRET_KEY,
-        algorithms=[TOKEN_HASH_ALGORITHM]
+        key=verifying_key.verifying_key,
+        algorithms=[verifying_key.algorithm],
+        options={"require": ["exp"]},
     )
     user_login: str = payload.get("sub")
-    token_expiration: datetime = payload.get("exp")
+    token_expiration: datetime = datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
+    token_id: Optional[str] = payload.get("jti")
     
-    return TokenDecodedModel(
+    ## Claims are checked by the signature, model_construct skips their re-validation.
+    return TokenDecodedModel.model_construct(
         login=user_login,
         expires_delta=token_expiration,
+        token_id=token_id,
     )
 
 
-async def authenticate_user(user_login: str, user_password: str) -> Coroutine[Any, Any, bool | Users]:
+## Strong references, so running rehash tasks are not garbage collected.
+_rehash_tasks: set[Task] = set()
+
+
+async def rehash_password(user_id: int, user_login: str, password: bytes, stored_hash: str) -> None:
+    """Store the password hashed with the current scheme and cost.
+    Errors are ignored, the next login of the user tries again.
+
+    The UPDATE matches the verified stored hash too: if the password was
+    changed meanwhile (password change, admin import), it updates no row
+    instead of bringing back the old password.
+
+    Args:
+        user_id (int): User id.
+        user_login (str): User login.
+        password (bytes): Verified password.
+        stored_hash (str): Hash the password was verified against.
+    """
+    try:
+        new_hashed_password: bytes = await hasher_registry.hash(password)
+        async with session_factory() as session:
+            await UserRepository(session).update(
+                values={"hashed_password": new_hashed_password.decode()},
+                id=user_id,
+                login=user_login,
+                hashed_password=stored_hash,
+            )
+    except (HashingEngineError, SQLAlchemyError):
+        pass
+
+
+def schedule_rehash(user_id: int, user_login: str, password: bytes, stored_hash: str) -> None:
+    """Run rehash_password in the background, once per user at a time."""
+    if any(task.get_name() == f"rehash:{user_id}" for task in _rehash_tasks):
+        return
+    task: Task = create_task(
+        rehash_password(user_id=user_id, user_login=user_login, password=password, stored_hash=stored_hash),
+        name=f"rehash:{user_id}",
+    )
+    _rehash_tasks.add(task)
+    task.add_done_callback(_rehash_tasks.discard)
+
+
+async def authenticate_user(
+    user_login: str,
+    user_password: str,
+    repository: Optional[UserRepository] = None,
+) -> Coroutine[Any, Any, bool | UserRegistrationModel]:
     """Authenticate the user, check the password and user login. 
 
     Args:
         user_login (str)
         user_password (str)
+        repository (Optional[UserRepository]): Request repository. New session is opened if None.
 
     Returns:
-        bool | User: False if user not in database. User model if user input is correctly.
+        bool | UserRegistrationModel: False if user not in database or password is wrong. User model if user input is correctly.
     """
-    async_database_hook: UserHook = UserHook()
-    user: Users = await async_database_hook.get(
-        one_object=True,
-        login=user_login,
-    )
-    if not user:
-        return False
+    if repository is None:
+        async with session_factory() as session:
+            return await authenticate_user(
+                user_login=user_login,
+                user_password=user_password,
+                repository=UserRepository(session),
+            )
     
     bcrypt_actions: BcryptActions = BcryptActions(password=user_password)
-    password_verify_result: bool = await bcrypt_actions.compare_password(hashed_password=user.hashed_password)
+    user_row: Optional[tuple[int, str]] = await repository.get_password_hash(login=user_login)
+    if not user_row:
+        return await hasher_registry.dummy_verify(bcrypt_actions.bytes_password)
     
-    if not password_verify_result:
-        return False
+    user_id, stored_password_hash = user_row
+    hashed_password: bytes = stored_password_hash.encode()
+    if not credential_cache.is_verified(user_login, bcrypt_actions.bytes_password, hashed_password):
+        password_verify_result: bool = await bcrypt_actions.compare_password(hashed_password=stored_password_hash)
+        if not password_verify_result:
+            return False
+        credential_cache.remember(user_login, bcrypt_actions.bytes_password, hashed_password)
+    
+    if hasher_registry.needs_rehash(hashed_password):
+        ## Upgrade runs after the answer, the login neither waits for it nor fails with it.
+        schedule_rehash(
+            user_id=user_id,
+            user_login=user_login,
+            password=bcrypt_actions.bytes_password,
+            stored_hash=stored_password_hash,
+        )
     
     return UserRegistrationModel(login=user_login, password=user_password)
 
 
 class BcryptActions(object):
-    """Class with main bcrypt actions (Hash password and check hashed password)."""
+    """Class with main password actions (Hash password and check hashed password).
+    Works with every scheme of the hasher registry, not only bcrypt.
+    All calls go through the bounded hashing engine pool.
+    """
     def __init__(self, password: str) -> None:
         """Encode to bytes the password. Initialize class with main bcrypt actions.
 
@@ -101,21 +246,24 @@ class BcryptActions(object):
         """
         self.bytes_password: bytes = password.encode()
     
+    @timed("password_hash_seconds", "Password hashing time, pool queue included.", operation="verify")
     async def compare_password(self, hashed_password: str) -> Coroutine[Any, Any, bool]:
-        """Compare hashed password with given password."""
-        return await checkpw(self.bytes_password, hashed_password.encode())
+        """Compare hashed password (any registered scheme) with given password."""
+        return await hasher_registry.verify(self.bytes_password, hashed_password)
 
-    async def hash_password(self, rounds: Optional[int] = 12) -> Coroutine[Any, Any, bytes]:
+    @timed("password_hash_seconds", "Password hashing time, pool queue included.", operation="hash")
+    async def hash_password(self, rounds: Optional[int] = None) -> Coroutine[Any, Any, bytes]:
         """Hash the password and return hashed password.
 
         Args:
-            rounds (Optional[int]): num of rounds.
+            rounds (Optional[int]): bcrypt rounds. Defaults to current policy scheme and cost.
 
         Returns:
             bytes: hashed password.
         """
-        salt: bytes = await gensalt(rounds=rounds)
-        return await hashpw(
-            password=self.bytes_password,
-            salt=salt
+        if rounds is None:
+            return await hasher_registry.hash(self.bytes_password)
+        return await hasher_registry.engine.run(
+            BcryptHasher(rounds=rounds).hash,
+            self.bytes_password,
         )
\ No newline at end of file
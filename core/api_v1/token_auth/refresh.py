@@ -0,0 +1,234 @@
+
+## Built-in modules: ##
+from typing import Optional
+from asyncio import CancelledError, Task, create_task, sleep
+from datetime import datetime, timedelta, timezone
+from hashlib import sha256
+from secrets import token_urlsafe
+from uuid import uuid4
+
+## Third-party modules: ##
+from sqlalchemy import bindparam, delete, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+## Local modules: ##
+from config import (
+    REFRESH_TOKEN_EXPIRE_TIME,
+    REFRESH_TOKEN_PRUNE_INTERVAL,
+    REFRESH_TOKEN_PRUNE_CHUNK,
+)
+from core.async_database.db_engine import session_factory
+from core.async_database.db_models import RefreshTokens
+
+_REFRESH_TOKEN_BY_HASH = (
+    select(
+        RefreshTokens.id,
+        RefreshTokens.family_id,
+        RefreshTokens.login,
+        RefreshTokens.expires_at,
+        RefreshTokens.used,
+        RefreshTokens.revoked,
+    )
+    .where(RefreshTokens.token_hash == bindparam("token_hash"))
+    .limit(1)
+)
+_FAMILY_BY_HASH = (
+    select(RefreshTokens.family_id)
+    .where(RefreshTokens.token_hash == bindparam("token_hash"))
+    .limit(1)
+)
+
+
+class RefreshTokenError(Exception):
+    """Refresh token is unknown, expired, revoked or was reused."""
+
+
+def hash_refresh_token(refresh_token: str) -> bytes:
+    """Refresh tokens are random, so plain SHA-256 is enough to store them safely."""
+    return sha256(refresh_token.encode()).digest()
+
+
+def utc_now() -> datetime:
+    """Naive UTC now for DATETIME columns."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def issue_refresh_token(
+    session: AsyncSession,
+    login: str,
+    family_id: Optional[str] = None,
+    expires_delta: timedelta = REFRESH_TOKEN_EXPIRE_TIME,
+) -> str:
+    """Create refresh token and store its hash.
+
+    Args:
+        session (AsyncSession): Request session.
+        login (str): Token owner.
+        family_id (Optional[str]): Rotation chain id, new chain if None.
+        expires_delta (timedelta): Token lifetime.
+
+    Returns:
+        str: Opaque refresh token for the client.
+    """
+    refresh_token: str = token_urlsafe(32)
+    await session.execute(
+        insert(RefreshTokens).values(
+            token_hash=hash_refresh_token(refresh_token),
+            family_id=family_id or uuid4().hex,
+            login=login,
+            expires_at=utc_now() + expires_delta,
+            used=False,
+            revoked=False,
+        )
+    )
+    await session.commit()
+    return refresh_token
+
+
+async def revoke_refresh_family(session: AsyncSession, family_id: str) -> None:
+    """Revoke every token of the rotation chain."""
+    await session.execute(
+        update(RefreshTokens)
+        .where(RefreshTokens.family_id == family_id)
+        .values(revoked=True)
+    )
+    await session.commit()
+
+
+async def revoke_refresh_token(session: AsyncSession, refresh_token: str) -> bool:
+    """Revoke the chain of the refresh token (logout).
+
+    Returns:
+        bool: False if the token is unknown.
+    """
+    result = await session.execute(
+        _FAMILY_BY_HASH, {"token_hash": hash_refresh_token(refresh_token)}
+    )
+    family_id: Optional[str] = result.scalar()
+    if family_id is None:
+        return False
+    await revoke_refresh_family(session, family_id)
+    return True
+
+
+async def rotate_refresh_token(session: AsyncSession, refresh_token: str) -> tuple[str, str]:
+    """Spend refresh token and issue the next one of the same chain.
+    Run it on a primary session, a lagging replica would report fresh
+    tokens unknown and miss `used`/`revoked` flags.
+
+    Presenting an already spent token means it was stolen (or replayed), so
+    the whole chain is revoked and both the thief and the owner must log in
+    again.
+
+    Args:
+        session (AsyncSession): Request session.
+        refresh_token (str): Token from the client.
+
+    Raises:
+        RefreshTokenError: If token is unknown, expired, revoked or reused.
+
+    Returns:
+        tuple[str, str]: Token owner login and new refresh token.
+    """
+    token_hash: bytes = hash_refresh_token(refresh_token)
+    result = await session.execute(_REFRESH_TOKEN_BY_HASH, {"token_hash": token_hash})
+    row = result.first()
+    if row is None:
+        raise RefreshTokenError("Unknown refresh token.")
+    token_id, family_id, login, expires_at, used, revoked = row
+    if revoked or expires_at <= utc_now():
+        raise RefreshTokenError("Refresh token expired or revoked.")
+    if used:
+        await revoke_refresh_family(session, family_id)
+        raise RefreshTokenError("Refresh token reuse detected.")
+
+    ## Conditional update wins only once even for concurrent requests,
+    ## and loses to a revocation of the chain made since the SELECT.
+    spend_result = await session.execute(
+        update(RefreshTokens)
+        .where(
+            RefreshTokens.id == token_id,
+            RefreshTokens.used.is_(False),
+            RefreshTokens.revoked.is_(False),
+        )
+        .values(used=True)
+    )
+    if spend_result.rowcount != 1:
+        await session.rollback()
+        await revoke_refresh_family(session, family_id)
+        raise RefreshTokenError("Refresh token reuse detected.")
+
+    new_refresh_token: str = await issue_refresh_token(
+        session=session,
+        login=login,
+        family_id=family_id,
+    )
+    return login, new_refresh_token
+
+
+class RefreshTokenPruner(object):
+    """Background delete of refresh tokens that can no longer be exchanged.
+
+    Expired and revoked rows answer the same as unknown ones. Spent rows
+    are kept until they expire, a replay of them must still revoke the
+    chain. MySQL deletes in chunks of `chunk` rows, so no statement holds
+    row locks on a large part of the table.
+    """
+    def __init__(
+        self,
+        interval: float = REFRESH_TOKEN_PRUNE_INTERVAL,
+        chunk: int = REFRESH_TOKEN_PRUNE_CHUNK,
+        factory: async_sessionmaker[AsyncSession] = session_factory,
+    ) -> None:
+        self.interval: float = interval
+        self.chunk: int = chunk
+        self.session_factory: async_sessionmaker[AsyncSession] = factory
+        self._task: Optional[Task] = None
+
+    async def prune(self) -> int:
+        """Delete expired and revoked refresh tokens.
+
+        Returns:
+            int: Number of deleted rows.
+        """
+        deleted: int = 0
+        async with self.session_factory() as session:
+            statement = delete(RefreshTokens).where(
+                or_(RefreshTokens.expires_at <= utc_now(), RefreshTokens.revoked.is_(True))
+            )
+            if session.bind.dialect.name == "mysql":
+                statement = statement.with_dialect_options(mysql_limit=self.chunk)
+            while True:
+                result = await session.execute(statement)
+                await session.commit()
+                deleted += result.rowcount
+                if session.bind.dialect.name != "mysql" or result.rowcount < self.chunk:
+                    return deleted
+
+    async def _run(self) -> None:
+        while True:
+            await sleep(self.interval)
+            try:
+                await self.prune()
+            except CancelledError:
+                raise
+            except Exception:
+                ## Database is unavailable, rows are deleted by a later run.
+                continue
+
+    async def start(self) -> None:
+        """Start background prune. Called from the app lifespan."""
+        if self._task is None:
+            self._task = create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except CancelledError:
+                pass
+            self._task = None
+
+
+refresh_token_pruner: RefreshTokenPruner = RefreshTokenPruner()
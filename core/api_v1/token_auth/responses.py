@@ -0,0 +1,24 @@
+
+## Third-party modules: ##
+from fastapi.responses import ORJSONResponse
+
+## Local modules: ##
+from core.api_v1.token_auth.schemas import TokenModel
+
+
+def token_response(token: TokenModel) -> ORJSONResponse:
+    """Serialize token with orjson, bypassing response model validation.
+    Token fields are built by the server, so there is nothing to validate.
+    Routes keep `response_model=TokenModel` for the OpenAPI schema.
+
+    Args:
+        token (TokenModel): Token to return.
+
+    Returns:
+        ORJSONResponse: Token JSON response.
+    """
+    return ORJSONResponse({
+        "access_token": token.access_token,
+        "token_type": token.token_type,
+        "refresh_token": token.refresh_token,
+    })
@@ -0,0 +1,325 @@
+
+## Built-in modules: ##
+from typing import Iterable, Optional
+from array import array
+from asyncio import CancelledError, Task, create_task, sleep, to_thread
+from datetime import datetime, timezone
+from time import time, monotonic
+
+## Third-party modules: ##
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+## Local modules: ##
+from config import (
+    REVOCATION_CAPACITY,
+    REVOCATION_SYNC_INTERVAL,
+    REVOCATION_SYNC_OVERLAP,
+    REVOCATION_PRUNE_INTERVAL,
+)
+from core.async_database.db_engine import session_factory
+from core.async_database.db_models import RevokedTokens
+from core.utils import BloomFilter
+
+JTI_SIZE: int = 16
+
+
+def compacted(
+    keys: bytes,
+    expires: array,
+    now: float,
+    capacity: int,
+) -> tuple[bytearray, array, BloomFilter]:
+    """Unexpired ids of the packed arrays and a Bloom filter sized for them.
+    Works on copies, so it can run in a worker thread.
+
+    Returns:
+        tuple[bytearray, array, BloomFilter]: Packed ids, expiry times, filter.
+    """
+    kept_keys: bytearray = bytearray()
+    kept_expires: array = array("d")
+    for index in range(len(expires)):
+        if expires[index] > now:
+            kept_keys += keys[index * JTI_SIZE:(index + 1) * JTI_SIZE]
+            kept_expires.append(expires[index])
+    bloom: BloomFilter = BloomFilter(capacity=max(capacity, len(kept_expires) * 2))
+    for index in range(len(kept_expires)):
+        bloom.add(kept_keys[index * JTI_SIZE:(index + 1) * JTI_SIZE].hex())
+    return kept_keys, kept_expires, bloom
+
+
+class RevocationList(object):
+    """Compact in-memory set of revoked token ids (jti).
+
+    Bloom filter answers "not revoked" for almost every token with a few bit
+    tests. Its rare positives are confirmed in a sorted packed bytearray of
+    16-byte ids (binary search), with expiry times in a parallel array. Memory
+    is ~26 bytes per revoked token, entries go away once the token expires.
+
+    Adding never rebuilds the filter: an overfull filter only gives more
+    positives, each still confirmed in the arrays. `compact` prunes and
+    rebuilds it in a worker thread instead.
+    """
+    def __init__(self, capacity: int = REVOCATION_CAPACITY) -> None:
+        """
+        Args:
+            capacity (int): Number of ids the Bloom filter is sized for.
+        """
+        self.capacity: int = capacity
+        self._bloom: BloomFilter = BloomFilter(capacity=capacity)
+        self._keys: bytearray = bytearray()
+        self._expires: array = array("d")
+        ## Ids added while `compact` runs, merged into its result.
+        self._replay: Optional[list[tuple[str, float]]] = None
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def _search(self, key: bytes) -> int:
+        keys: bytearray = self._keys
+        low: int = 0
+        high: int = len(self._expires)
+        while low < high:
+            middle: int = (low + high) // 2
+            if keys[middle * JTI_SIZE:(middle + 1) * JTI_SIZE] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _contains_key(self, key: bytes) -> bool:
+        index: int = self._search(key)
+        return index < len(self._expires) and self._keys[index * JTI_SIZE:(index + 1) * JTI_SIZE] == key
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        """Check if the token id is revoked.
+
+        Args:
+            jti (Optional[str]): Token id, tokens without id can not be revoked.
+
+        Returns:
+            bool: True if revoked.
+        """
+        if jti is None or jti not in self._bloom:
+            return False
+        try:
+            return self._contains_key(bytes.fromhex(jti))
+        except (ValueError, TypeError):
+            return False
+
+    def add(self, jti: str, expires_at: float) -> None:
+        """Add token id until expiry timestamp."""
+        key: bytes = bytes.fromhex(jti)
+        if len(key) != JTI_SIZE or self._contains_key(key):
+            return
+        index: int = self._search(key)
+        self._keys[index * JTI_SIZE:index * JTI_SIZE] = key
+        self._expires.insert(index, expires_at)
+        self._bloom.add(jti)
+        if self._replay is not None:
+            self._replay.append((jti, expires_at))
+
+    def add_many(self, entries: Iterable[tuple[str, float]]) -> int:
+        """Add a batch of (jti, expiry timestamp) in one merge pass.
+
+        `add` shifts the packed arrays on every call, so loading N ids one by
+        one costs O(N^2). Here the new ids are sorted and the arrays are
+        rebuilt once, copying existing ids as slices between insertion points.
+
+        Already present ids are skipped, so overlapping batches are fine.
+
+        Returns:
+            int: Number of ids added.
+        """
+        pending: dict[bytes, float] = {}
+        for jti, expires_at in entries:
+            try:
+                key: bytes = bytes.fromhex(jti)
+            except (ValueError, TypeError):
+                continue
+            if len(key) == JTI_SIZE:
+                pending[key] = expires_at
+        if not pending:
+            return 0
+
+        keys: bytearray = bytearray()
+        expires: array = array("d")
+        previous: int = 0
+        added: list[bytes] = []
+        for key in sorted(pending):
+            index: int = self._search(key)
+            if index < len(self._expires) and self._keys[index * JTI_SIZE:(index + 1) * JTI_SIZE] == key:
+                continue
+            keys += self._keys[previous * JTI_SIZE:index * JTI_SIZE]
+            expires.extend(self._expires[previous:index])
+            keys += key
+            expires.append(pending[key])
+            added.append(key)
+            previous = index
+        if not added:
+            return 0
+        keys += self._keys[previous * JTI_SIZE:]
+        expires.extend(self._expires[previous:])
+        self._keys = keys
+        self._expires = expires
+        for key in added:
+            jti: str = key.hex()
+            self._bloom.add(jti)
+            if self._replay is not None:
+                self._replay.append((jti, pending[key]))
+        return len(added)
+
+    @property
+    def needs_rebuild(self) -> bool:
+        """True when the Bloom filter holds more ids than it was sized for."""
+        return self._bloom.saturated
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Drop expired ids and rebuild the Bloom filter, on the calling thread.
+
+        Returns:
+            int: Number of dropped ids.
+        """
+        now = time() if now is None else now
+        size: int = len(self._expires)
+        self._keys, self._expires, self._bloom = compacted(self._keys, self._expires, now, self.capacity)
+        self.capacity = self._bloom.capacity
+        return size - len(self._expires)
+
+    async def compact(self, now: Optional[float] = None) -> int:
+        """`prune` in a worker thread, the event loop keeps serving lookups
+        from the current arrays. Ids added meanwhile are merged afterwards.
+
+        Returns:
+            int: Number of dropped ids.
+        """
+        now = time() if now is None else now
+        size: int = len(self._expires)
+        replay: list[tuple[str, float]] = []
+        self._replay = replay
+        try:
+            keys, expires, bloom = await to_thread(
+                compacted, bytes(self._keys), array("d", self._expires), now, self.capacity
+            )
+        finally:
+            self._replay = None
+        self._keys, self._expires, self._bloom = keys, expires, bloom
+        self.capacity = bloom.capacity
+        self.add_many(replay)
+        return size - len(expires)
+
+
+def to_database_time(timestamp: float) -> datetime:
+    """Naive UTC datetime for DATETIME columns."""
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+
+
+def from_database_time(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class RevocationStore(object):
+    """Keeps RevocationList in sync with the revoked_tokens table.
+
+    Loaded at startup, then a background task pulls ids revoked by other
+    processes every REVOCATION_SYNC_INTERVAL and prunes expired ids every
+    REVOCATION_PRUNE_INTERVAL. The request path only reads memory.
+
+    AUTO_INCREMENT ids are taken at INSERT but become visible at COMMIT, so
+    a lower id can appear after a higher one was synced. Every sync re-reads
+    the last `overlap` ids before the cursor; ids already loaded are skipped.
+    """
+    def __init__(
+        self,
+        revocation_list: RevocationList,
+        factory: async_sessionmaker[AsyncSession] = session_factory,
+        overlap: int = REVOCATION_SYNC_OVERLAP,
+    ) -> None:
+        """
+        Args:
+            revocation_list (RevocationList): In-memory list kept in sync.
+            factory (async_sessionmaker): Session factory of the revoked_tokens database.
+            overlap (int): Ids before the sync cursor read again on every sync.
+        """
+        self.revocation_list: RevocationList = revocation_list
+        self.session_factory: async_sessionmaker[AsyncSession] = factory
+        self.overlap: int = overlap
+        self._last_id: int = 0
+        self._task: Optional[Task] = None
+
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        """Persist revocation and apply it in this process at once.
+        Revoking an already revoked id is a no-op, not an error.
+        """
+        async with self.session_factory() as session:
+            session.add(RevokedTokens(jti=jti, expires_at=to_database_time(expires_at)))
+            try:
+                await session.commit()
+            except IntegrityError:
+                await session.rollback()
+        self.revocation_list.add(jti, expires_at)
+
+    async def sync(self) -> None:
+        """Load ids revoked since the last sync (and the overlap window
+        before it), merged in one pass.
+        """
+        revoked: list[tuple[str, float]] = []
+        async with self.session_factory() as session:
+            result = await session.stream(
+                select(RevokedTokens.id, RevokedTokens.jti, RevokedTokens.expires_at)
+                .where(RevokedTokens.id > self._last_id - self.overlap)
+                .where(RevokedTokens.expires_at > to_database_time(time()))
+                .order_by(RevokedTokens.id)
+                .execution_options(yield_per=10_000)
+            )
+            last_id: int = self._last_id
+            async for row_id, jti, expires_at in result:
+                revoked.append((jti, from_database_time(expires_at)))
+                last_id = max(last_id, row_id)
+        self.revocation_list.add_many(revoked)
+        self._last_id = last_id
+        if self.revocation_list.needs_rebuild:
+            await self.revocation_list.compact()
+
+    async def prune(self) -> None:
+        """Delete expired revocations from the table and memory."""
+        async with self.session_factory() as session:
+            await session.execute(
+                delete(RevokedTokens).where(RevokedTokens.expires_at <= to_database_time(time()))
+            )
+            await session.commit()
+        await self.revocation_list.compact()
+
+    async def _run(self) -> None:
+        next_prune_at: float = monotonic() + REVOCATION_PRUNE_INTERVAL
+        while True:
+            await sleep(REVOCATION_SYNC_INTERVAL)
+            try:
+                await self.sync()
+                if monotonic() >= next_prune_at:
+                    await self.prune()
+                    next_prune_at = monotonic() + REVOCATION_PRUNE_INTERVAL
+            except CancelledError:
+                raise
+            except Exception:
+                ## Database is unavailable, keep serving from memory and retry later.
+                continue
+
+    async def start(self) -> None:
+        """Initial load and background sync. Called from the app lifespan."""
+        await self.sync()
+        self._task = create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except CancelledError:
+                pass
+            self._task = None
+
+
+revocation_list: RevocationList = RevocationList()
+revocation_store: RevocationStore = RevocationStore(revocation_list=revocation_list)
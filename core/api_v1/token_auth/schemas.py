@@ -1,12 +1,15 @@
 
 ## Built-in modules: ##
-from typing import Annotated
+from typing import Annotated, Optional
 from datetime import datetime
 
 ## Third-party modules: ##
 from pydantic import BaseModel, Field
 from fastapi.security import OAuth2PasswordRequestForm
 
+## Local modules: ##
+from config import INTROSPECTION_MAX_TOKENS
+
 
 class OAuth2PasswordUserForm(OAuth2PasswordRequestForm):
     """Custom form model for OAuth2"""
@@ -34,6 +37,12 @@ class TokenDecodedModel(BaseModel):
         title="Token expiration date",
         description="Token expiration date for decoded token.",
     )]
+    token_id: Annotated[Optional[str], Field(
+        default=None,
+        alias="token_id",
+        title="Token id",
+        description="Unique token id (jti claim), None for tokens issued without it.",
+    )]
 
 
 class TokenModel(BaseModel):
@@ -50,3 +59,70 @@ class TokenModel(BaseModel):
         title="Token type",
         description="Oauth2 token type",
     )]
+    refresh_token: Annotated[Optional[str], Field(
+        default=None,
+        alias="refresh_token",
+        title="Refresh token",
+        description="Single-use token for /api_v1/token_auth/refresh",
+    )]
+
+
+class RefreshTokenRequestModel(BaseModel):
+    """Refresh endpoint request body."""
+    refresh_token: Annotated[str, Field(
+        default=...,
+        alias="refresh_token",
+        title="Refresh token",
+        description="Refresh token issued with the last access token",
+        min_length=1,
+        max_length=128,
+    )]
+
+
+class IntrospectionRequestModel(BaseModel):
+    """Introspection endpoint request body."""
+    tokens: Annotated[list[str], Field(
+        default=...,
+        alias="tokens",
+        title="Access tokens",
+        description="Access tokens (or session ids) to check in one call",
+        min_length=1,
+        max_length=INTROSPECTION_MAX_TOKENS,
+    )]
+
+
+class TokenIntrospectionModel(BaseModel):
+    """Validity and claims of one introspected token."""
+    active: Annotated[bool, Field(
+        default=...,
+        alias="active",
+        title="Token is active",
+        description="Token is valid, not expired, not revoked and its user exists",
+    )]
+    login: Annotated[Optional[str], Field(
+        default=None,
+        alias="login",
+        title="User login",
+        description="Token subject, only for active tokens",
+    )]
+    expires_at: Annotated[Optional[int], Field(
+        default=None,
+        alias="expires_at",
+        title="Token expiration",
+        description="Expiration unix time, only for active JWT access tokens",
+    )]
+    token_id: Annotated[Optional[str], Field(
+        default=None,
+        alias="token_id",
+        title="Token id",
+        description="Token jti claim, only for active JWT access tokens",
+    )]
+
+
+class IntrospectionResponseModel(BaseModel):
+    """Introspection results, in the order of the request tokens."""
+    tokens: Annotated[list[TokenIntrospectionModel], Field(
+        default=...,
+        alias="tokens",
+        title="Introspected tokens",
+    )]
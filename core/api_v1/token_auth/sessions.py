@@ -0,0 +1,168 @@
+
+## Built-in modules: ##
+from typing import Optional, Protocol
+from asyncio import Task, create_task
+from collections import OrderedDict
+from secrets import token_urlsafe
+from time import time
+
+## Local modules: ##
+from config import (
+    SESSION_TTL,
+    SESSION_SHARDS,
+    SESSION_MAX_ENTRIES,
+)
+from core.async_database.repository import subscribe_user_deletions
+
+
+class SessionRecord(object):
+    """Server-side state of one opaque session."""
+    __slots__ = ("login", "expires_at")
+
+    def __init__(self, login: str, expires_at: float) -> None:
+        self.login: str = login
+        self.expires_at: float = expires_at
+
+
+class SessionBackend(Protocol):
+    """Session storage. A shared store implementation (Redis GET/SET EX/DEL,
+    plus a set of session ids per login) makes sessions valid across nodes.
+    """
+    ## True if every worker and node sees the same sessions.
+    shared: bool
+
+    async def get(self, session_id: str) -> Optional[SessionRecord]:
+        """Live record of the session, None if unknown or expired."""
+        ...
+
+    async def put(self, session_id: str, record: SessionRecord) -> None:
+        """Store the record until its `expires_at`."""
+        ...
+
+    async def delete(self, session_id: str) -> None:
+        """Forget the session, unknown ids are ignored."""
+        ...
+
+    async def delete_login(self, login: Optional[str]) -> None:
+        """Forget every session of the login, of every login if None."""
+        ...
+
+
+class InMemorySessionBackend(object):
+    """Per-process store split in LRU shards, used by single worker runs and tests.
+
+    Every shard evicts its least recently used session above
+    `max_entries / shards`, so eviction and LRU upkeep touch one small dict.
+    Session ids are also indexed by login, for logout of deleted users.
+    """
+    shared: bool = False
+
+    def __init__(self, shards: int = SESSION_SHARDS, max_entries: int = SESSION_MAX_ENTRIES) -> None:
+        """
+        Args:
+            shards (int): Number of shards.
+            max_entries (int): Max number of sessions of all shards together.
+        """
+        self.max_shard_entries: int = max(max_entries // shards, 1)
+        self._shards: tuple[OrderedDict[str, SessionRecord], ...] = tuple(
+            OrderedDict() for _ in range(shards)
+        )
+        self._by_login: dict[str, set[str]] = {}
+
+    def _shard(self, session_id: str) -> OrderedDict[str, SessionRecord]:
+        return self._shards[hash(session_id) % len(self._shards)]
+
+    async def get(self, session_id: str) -> Optional[SessionRecord]:
+        shard: OrderedDict[str, SessionRecord] = self._shard(session_id)
+        record: Optional[SessionRecord] = shard.get(session_id)
+        if record is None:
+            return None
+        if record.expires_at <= time():
+            del shard[session_id]
+            self._unindex(session_id, record)
+            return None
+        shard.move_to_end(session_id)
+        return record
+
+    async def put(self, session_id: str, record: SessionRecord) -> None:
+        shard: OrderedDict[str, SessionRecord] = self._shard(session_id)
+        shard[session_id] = record
+        self._by_login.setdefault(record.login.lower(), set()).add(session_id)
+        if len(shard) > self.max_shard_entries:
+            self._unindex(*shard.popitem(last=False))
+
+    async def delete(self, session_id: str) -> None:
+        record: Optional[SessionRecord] = self._shard(session_id).pop(session_id, None)
+        if record is not None:
+            self._unindex(session_id, record)
+
+    async def delete_login(self, login: Optional[str]) -> None:
+        if login is None:
+            for shard in self._shards:
+                shard.clear()
+            self._by_login.clear()
+            return
+        for session_id in self._by_login.pop(login.lower(), ()):
+            self._shard(session_id).pop(session_id, None)
+
+    def _unindex(self, session_id: str, record: SessionRecord) -> None:
+        ## MySQL compares logins case-insensitively, so does the index.
+        session_ids: Optional[set[str]] = self._by_login.get(record.login.lower())
+        if session_ids is not None:
+            session_ids.discard(session_id)
+            if not session_ids:
+                del self._by_login[record.login.lower()]
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+
+class SessionStore(object):
+    """Opaque session tokens, the alternative to JWT access tokens (AUTH_MODE=session).
+
+    Session id is 256 random bits; checking it is one store lookup, with no
+    signature check and no database query.
+    """
+    def __init__(self, backend: SessionBackend, ttl: float = SESSION_TTL) -> None:
+        """
+        Args:
+            backend (SessionBackend): Session storage.
+            ttl (float): Session lifetime in seconds.
+        """
+        self.backend: SessionBackend = backend
+        self.ttl: float = ttl
+        ## Strong references of running listener tasks.
+        self._tasks: set[Task] = set()
+
+    async def create(self, login: str) -> str:
+        """Start a session of the authenticated user.
+
+        Returns:
+            str: Session id for the client, sent back as the bearer token.
+        """
+        session_id: str = token_urlsafe(32)
+        await self.backend.put(session_id, SessionRecord(login=login, expires_at=time() + self.ttl))
+        return session_id
+
+    async def validate(self, session_id: str) -> Optional[str]:
+        """Login of the live session, None if the session is unknown or expired."""
+        record: Optional[SessionRecord] = await self.backend.get(session_id)
+        return None if record is None else record.login
+
+    async def revoke(self, session_id: str) -> None:
+        """End the session (logout)."""
+        await self.backend.delete(session_id)
+
+    async def revoke_login(self, login: Optional[str]) -> None:
+        """End every session of the login, of every login if None."""
+        await self.backend.delete_login(login)
+
+    def user_deleted(self, login: Optional[str]) -> None:
+        """User deletion listener. Deletions by id carry no login and end every session."""
+        task: Task = create_task(self.revoke_login(login))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+session_store: SessionStore = SessionStore(backend=InMemorySessionBackend())
+subscribe_user_deletions(session_store.user_deleted)
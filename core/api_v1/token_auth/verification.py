@@ -0,0 +1,140 @@
+
+## Built-in modules: ##
+from typing import Optional
+from collections import OrderedDict
+from time import monotonic, time
+
+## Third-party modules: ##
+from jwt.exceptions import InvalidTokenError
+
+## Local modules: ##
+from config import (
+    TOKEN_CACHE_MAX_ENTRIES,
+    USER_PRESENCE_TTL,
+    USER_PRESENCE_MAX_ENTRIES,
+)
+from core.api_v1.token_auth.oauth2 import decode_access_token
+from core.api_v1.token_auth.revocation import RevocationList, revocation_list
+from core.api_v1.token_auth.schemas import TokenDecodedModel, TokenModel
+from core.async_database import UserHook
+
+
+class TokenVerifier(object):
+    """JWT verification with LRU cache of already verified tokens.
+
+    Token string is the cache key, so a cached entry can only be hit by the
+    very same header, payload and signature. Entry lives until token `exp`.
+    Revocation is checked on every call, cached or not.
+    """
+    def __init__(
+        self,
+        max_entries: int = TOKEN_CACHE_MAX_ENTRIES,
+        revoked: RevocationList = revocation_list,
+    ) -> None:
+        """
+        Args:
+            max_entries (int): Max number of cached tokens.
+            revoked (RevocationList): Revoked token ids.
+        """
+        self.max_entries: int = max_entries
+        self.revoked: RevocationList = revoked
+        self._entries: OrderedDict[str, tuple[TokenDecodedModel, float]] = OrderedDict()
+
+    def verify(self, encoded_token: TokenModel) -> TokenDecodedModel:
+        """Decode token, skipping signature check for recently verified tokens.
+
+        Args:
+            encoded_token (TokenModel): Token from the request.
+
+        Raises:
+            InvalidTokenError: If token is invalid, expired or revoked.
+
+        Returns:
+            TokenDecodedModel: Decoded token information.
+        """
+        access_token: str = encoded_token.access_token
+        entry: Optional[tuple[TokenDecodedModel, float]] = self._entries.get(access_token)
+        if entry is not None:
+            decoded_token, expires_at = entry
+            if expires_at > time():
+                self._entries.move_to_end(access_token)
+                return self._check_revoked(decoded_token)
+            del self._entries[access_token]
+
+        decoded_token: TokenDecodedModel = decode_access_token(encoded_token=encoded_token)
+        self._entries[access_token] = (decoded_token, decoded_token.expires_delta.timestamp())
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return self._check_revoked(decoded_token)
+
+    def _check_revoked(self, decoded_token: TokenDecodedModel) -> TokenDecodedModel:
+        if self.revoked.is_revoked(decoded_token.token_id):
+            raise InvalidTokenError("Token has been revoked.")
+        return decoded_token
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class UserPresenceCache(object):
+    """In-memory answers to "does this login still exist" for token holders.
+
+    Remembers logins found (known) and not found (removed) in the database
+    for `ttl` seconds. Any UserHook/UserRepository change of a login drops
+    its entry, so this process never answers from stale data; the TTL bounds
+    staleness for changes made by other processes.
+    Logins are compared case-insensitively, like the login column collation,
+    so a change of "Alice" also drops the entry of "alice".
+    """
+    def __init__(
+        self,
+        ttl: float = USER_PRESENCE_TTL,
+        max_entries: int = USER_PRESENCE_MAX_ENTRIES,
+    ) -> None:
+        """
+        Args:
+            ttl (float): Entry time to live in seconds, 0 disables the cache.
+            max_entries (int): Max number of cached logins.
+        """
+        self.ttl: float = ttl
+        self.max_entries: int = max_entries
+        self._entries: OrderedDict[str, tuple[bool, float]] = OrderedDict()
+
+    def lookup(self, login: str) -> Optional[bool]:
+        """Cached presence of the login.
+
+        Returns:
+            Optional[bool]: True if known, False if removed, None if database must be asked.
+        """
+        login = login.lower()
+        entry: Optional[tuple[bool, float]] = self._entries.get(login)
+        if entry is None:
+            return None
+        exists, expires_at = entry
+        if expires_at <= monotonic():
+            del self._entries[login]
+            return None
+        self._entries.move_to_end(login)
+        return exists
+
+    def remember(self, login: str, exists: bool) -> None:
+        """Store database answer for the login."""
+        if self.ttl <= 0:
+            return
+        login = login.lower()
+        self._entries[login] = (exists, monotonic() + self.ttl)
+        self._entries.move_to_end(login)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, login: Optional[str] = None) -> None:
+        """Drop the entry of the login, or every entry if login is None."""
+        if login is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(login.lower(), None)
+
+
+token_verifier: TokenVerifier = TokenVerifier()
+user_presence: UserPresenceCache = UserPresenceCache()
+UserHook.subscribe(user_presence.invalidate)
@@ -1,17 +1,37 @@
 
 ## Local modules: ##
-from typing import Any, Annotated
+from typing import Annotated, Any, Optional
+from hmac import compare_digest
 
 ## Third-party modules: ##
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Request, Response
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import HTTPException
 from fastapi import status
+from jwt.exceptions import InvalidTokenError
 
 ## Local modules: ##
-from config import TOKEN_EXPIRE_TIME, TOKEN_TYPE
 from core.api_v1.sign_up.schemas import UserRegistrationModel
-from core.api_v1.token_auth.schemas import OAuth2PasswordUserForm, TokenModel
-from core.api_v1.token_auth import create_access_token, authenticate_user
+from core.api_v1.token_auth.schemas import (
+    OAuth2PasswordUserForm,
+    TokenModel,
+    TokenDecodedModel,
+    RefreshTokenRequestModel,
+    IntrospectionRequestModel,
+    IntrospectionResponseModel,
+)
+from core.api_v1.token_auth.oauth2 import issue_access_token, issue_token_pair, authenticate_user
+from core.api_v1.token_auth.refresh import RefreshTokenError, revoke_refresh_token, rotate_refresh_token
+from core.api_v1.token_auth.responses import token_response
+from core.api_v1.token_auth.revocation import revocation_store
+from core.api_v1.token_auth.sessions import session_store
+from core.api_v1.token_auth.verification import token_verifier
+from core.api_v1.sign_in.utils import get_token_dependency
+from core.async_database import UserRepository, get_user_repository, get_primary_user_repository
+from core.async_database.db_engine import session_factory
+from core.async_database.audit import audit_log
+from core.rate_limit import credential_rate_limiter, introspection_rate_limiter
+from config import AUTH_MODE, TOKEN_TYPE, INTROSPECTION_API_TOKEN
 
 
 token_auth_router: APIRouter = APIRouter(
@@ -20,39 +40,208 @@ token_auth_router: APIRouter = APIRouter(
 )
 
 
-@token_auth_router.post("/")
-async def token_auth(user_registration_form: UserRegistrationModel) -> TokenModel:
+@token_auth_router.post("/", response_model=TokenModel)
+async def token_auth(
+    request: Request,
+    user_registration_form: UserRegistrationModel,
+    repository: Annotated[UserRepository, Depends(get_user_repository)],
+) -> Response:
     """Token auth enpoint to get token after user auth.
 
     Args:
+        request (Request): Request, for the client address.
         user_registration_form (Annotated[OAuth2PasswordUserForm, Depends): User form.
+        repository (UserRepository): Users repository of the request.
 
     Returns:
-        TokenModel: OAuth2 jwt.
+        Response: OAuth2 jwt (TokenModel JSON).
     """
     user_login: str = user_registration_form.login
     user_password: str = user_registration_form.password
+    client_ip: Optional[str] = request.client.host if request.client else None
+    await credential_rate_limiter.check(client_ip=client_ip, login=user_login)
     
     user_model: UserRegistrationModel = await authenticate_user(
         user_login=user_login,
-        user_password=user_password
+        user_password=user_password,
+        repository=repository,
     )
     if not user_model:
+        audit_log.record("login_failure", login=user_login, client_ip=client_ip)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect login or password.",
             headers={"WWW-Authenticate": "Bearer"}
         )
     
-    user_data: dict[str, Any] = {
-        "sub": user_login,
-    }
-    jwt_access_token: str = create_access_token(
-        data_to_encode=user_data,
-        expires_delta=TOKEN_EXPIRE_TIME,
+    audit_log.record("login_success", login=user_model.login, client_ip=client_ip)
+    return token_response(await issue_token_pair(user_login=user_model.login, session=repository.session))
+
+
+@token_auth_router.post("/refresh", response_model=TokenModel)
+async def token_refresh(
+    request: Request,
+    refresh_request: RefreshTokenRequestModel,
+    repository: Annotated[UserRepository, Depends(get_primary_user_repository)],
+) -> Response:
+    """Exchange refresh token for a new access token and refresh token.
+    The only token endpoint touching storage besides password login.
+
+    Args:
+        request (Request): Request, for the client address.
+        refresh_request (RefreshTokenRequestModel): Refresh token from the client.
+        repository (UserRepository): Users repository of the request, on the primary.
+
+    Returns:
+        Response: New access and refresh tokens (TokenModel JSON).
+    """
+    refresh_exception: Exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token.",
+        headers={"WWW-Authenticate": TOKEN_TYPE}
+    )
+    try:
+        user_login, new_refresh_token = await rotate_refresh_token(
+            session=repository.session,
+            refresh_token=refresh_request.refresh_token,
+        )
+    except RefreshTokenError:
+        raise refresh_exception
+    if not await repository.exists(login=user_login):
+        raise refresh_exception
+    
+    audit_log.record(
+        "token_refresh",
+        login=user_login,
+        client_ip=request.client.host if request.client else None,
     )
+    return token_response(issue_access_token(user_login=user_login, refresh_token=new_refresh_token))
+
+
+@token_auth_router.post("/revoke", status_code=status.HTTP_204_NO_CONTENT)
+async def token_revoke(
+    auth_token: Annotated[TokenModel, Depends(get_token_dependency)],
+    refresh_request: Optional[RefreshTokenRequestModel] = None,
+) -> Response:
+    """Revoke the bearer token of the request (logout).
+    With a refresh token in the body its whole rotation chain is revoked too,
+    so it can not mint new access tokens after logout.
+
+    Args:
+        auth_token (Annotated[TokenModel, Depends]): Token from Authorization header.
+        refresh_request (Optional[RefreshTokenRequestModel]): Refresh token to revoke along.
+
+    Returns:
+        Response: Empty 204 response.
+    """
+    token_exception: Exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate token.",
+        headers={"WWW-Authenticate": TOKEN_TYPE}
+    )
+    if not auth_token:
+        raise token_exception
+    if AUTH_MODE == "session":
+        await session_store.revoke(auth_token.access_token)
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    try:
+        decoded_token = token_verifier.verify(encoded_token=auth_token)
+    except InvalidTokenError:
+        raise token_exception
+    if decoded_token.token_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Token can not be revoked, it has no id.",
+        )
     
-    return TokenModel(
-        access_token=jwt_access_token,
-        token_type=TOKEN_TYPE
-    )
\ No newline at end of file
+    await revocation_store.revoke(
+        jti=decoded_token.token_id,
+        expires_at=decoded_token.expires_delta.timestamp(),
+    )
+    if refresh_request is not None:
+        async with session_factory() as session:
+            await revoke_refresh_token(session=session, refresh_token=refresh_request.refresh_token)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+def require_service_token(x_service_token: Optional[str] = Header(None)) -> None:
+    """Allow the request only with valid X-Service-Token header.
+    Introspection is disabled when INTROSPECTION_API_TOKEN is not configured.
+
+    Args:
+        x_service_token (Optional[str], Header): Given service token. Defaults to None.
+
+    Raises:
+        HTTPException: 404 if introspection is disabled, 403 if token is wrong.
+    """
+    if not INTROSPECTION_API_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    if not x_service_token or not compare_digest(x_service_token.encode(), INTROSPECTION_API_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid service token.",
+        )
+
+
+@token_auth_router.post(
+    "/introspect",
+    response_model=IntrospectionResponseModel,
+    dependencies=[Depends(require_service_token)],
+)
+async def token_introspect(
+    request: Request,
+    introspection_request: IntrospectionRequestModel,
+    repository: Annotated[UserRepository, Depends(get_primary_user_repository)],
+) -> Response:
+    """Check a batch of tokens for downstream services.
+    Tokens are decoded in one pass, their logins are resolved with one IN query.
+    Needs the service token, and counts against the introspection rate limits.
+
+    Args:
+        request (Request): Request, for the client address.
+        introspection_request (IntrospectionRequestModel): Tokens to check.
+        repository (UserRepository): Users repository of the request, on the primary,
+            so users created moments ago are not reported inactive.
+
+    Returns:
+        Response: Per-token validity and claims, in request order.
+    """
+    await introspection_rate_limiter.check(
+        service_token=request.headers.get("x-service-token"),
+        client_ip=request.client.host if request.client else None,
+    )
+    claims: list[Optional[dict[str, Any]]] = []
+    for access_token in introspection_request.tokens:
+        if AUTH_MODE == "session":
+            login: Optional[str] = await session_store.validate(access_token)
+            claims.append(None if login is None else {"login": login})
+            continue
+        try:
+            decoded_token: TokenDecodedModel = token_verifier.verify(
+                encoded_token=TokenModel.model_construct(access_token=access_token, token_type=TOKEN_TYPE)
+            )
+        except InvalidTokenError:
+            claims.append(None)
+            continue
+        if not decoded_token.login:
+            claims.append(None)
+            continue
+        claims.append({
+            "login": decoded_token.login,
+            "expires_at": int(decoded_token.expires_delta.timestamp()),
+            "token_id": decoded_token.token_id,
+        })
+
+    ## MySQL compares logins case-insensitively, so does this lookup.
+    existing_logins: set[str] = {
+        login.lower() for login in await repository.existing_logins(
+            token_claims["login"] for token_claims in claims if token_claims is not None
+        )
+    }
+    inactive: dict[str, bool] = {"active": False}
+    return ORJSONResponse({"tokens": [
+        {"active": True, **token_claims}
+        if token_claims is not None and token_claims["login"].lower() in existing_logins
+        else inactive
+        for token_claims in claims
+    ]})
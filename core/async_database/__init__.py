@@ -1,5 +1,10 @@
 __all__ = [
     "UserHook",
+    "UserRepository",
+    "CreateResult",
+    "CreateStatus",
+    "get_user_repository",
+    "get_primary_user_repository",
     "delete_tables",
     "create_tables",
 ]
@@ -8,4 +13,11 @@ from core.async_database.db_crud import (
     UserHook,
     create_tables,
     delete_tables
-)
\ No newline at end of file
+)
+from core.async_database.repository import (
+    UserRepository,
+    CreateResult,
+    CreateStatus,
+    get_user_repository,
+    get_primary_user_repository
+)
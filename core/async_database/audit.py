@@ -0,0 +1,138 @@
+## Built-in modules:
+from typing import Optional
+from asyncio import CancelledError, Event, Task, create_task, wait_for
+from collections import deque
+from datetime import datetime, timezone
+
+## Pip modules:
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+## Project modules:
+from config import (
+    AUDIT_ENABLED,
+    AUDIT_QUEUE_SIZE,
+    AUDIT_BATCH_SIZE,
+    AUDIT_FLUSH_INTERVAL,
+)
+from core.async_database.db_engine import session_factory
+from core.async_database.db_models import AuditEvents
+from core.metrics import Counter, Gauge, registry
+
+
+class AuditLog:
+    """Authentication events written to the audit_events table in batches.
+
+    `record` only appends to a bounded in-memory queue, request handlers
+    never wait on audit I/O. A background task writes up to
+    AUDIT_BATCH_SIZE events per multi-row INSERT every AUDIT_FLUSH_INTERVAL
+    seconds, or as soon as a full batch is queued. When the queue is full
+    (database slow or down) new events are dropped and counted; a batch
+    whose INSERT fails is dropped and counted too, so one bad batch can not
+    stall the pipeline. The queue is flushed on shutdown.
+    """
+    def __init__(
+        self,
+        enabled: bool = AUDIT_ENABLED,
+        queue_size: int = AUDIT_QUEUE_SIZE,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        flush_interval: float = AUDIT_FLUSH_INTERVAL,
+        factory: async_sessionmaker[AsyncSession] = session_factory,
+    ):
+        self.enabled: bool = enabled
+        self.queue_size: int = queue_size
+        self.batch_size: int = batch_size
+        self.flush_interval: float = flush_interval
+        self.session_factory: async_sessionmaker[AsyncSession] = factory
+        self._queue: deque[dict] = deque()
+        self._batch_ready: Event = Event()
+        self._stopping: bool = False
+        self._task: Optional[Task] = None
+
+        self.queued: Gauge = registry.gauge(
+            "audit_queue_depth", "Audit events waiting to be written."
+        )
+        self.dropped: Counter = registry.counter(
+            "audit_events_dropped_total", "Audit events dropped because the queue was full."
+        )
+        self.written: Counter = registry.counter(
+            "audit_events_written_total", "Audit events written to the database."
+        )
+        self.failed: Counter = registry.counter(
+            "audit_events_failed_total", "Audit events lost to failed batch inserts."
+        )
+
+    def record(self, event: str, login: Optional[str] = None, client_ip: Optional[str] = None):
+        """Queue an event, never blocks.
+
+        Args:
+            event (str): Event type: sign_up, login_success, login_failure, token_refresh.
+            login (Optional[str]): User login the event is about.
+            client_ip (Optional[str]): Address of the client.
+        """
+        if not self.enabled:
+            return
+        if len(self._queue) >= self.queue_size:
+            self.dropped.inc()
+            return
+        self._queue.append({
+            "event": event,
+            "login": login,
+            "client_ip": client_ip,
+            "created_at": datetime.now(timezone.utc).replace(tzinfo=None),
+        })
+        self.queued.set(len(self._queue))
+        if len(self._queue) >= self.batch_size:
+            self._batch_ready.set()
+
+    async def flush(self):
+        """Write every queued event, one INSERT per batch"""
+        while self._queue:
+            batch: list[dict] = [
+                self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))
+            ]
+            self.queued.set(len(self._queue))
+            try:
+                async with self.session_factory() as session:
+                    ## executemany of one INSERT is sent as multi-row VALUES.
+                    await session.execute(insert(AuditEvents), batch)
+                    await session.commit()
+            except CancelledError:
+                ## Not written: back to the front of the queue for the next flush.
+                self._queue.extendleft(reversed(batch))
+                self.queued.set(len(self._queue))
+                raise
+            except Exception:
+                self.failed.inc(len(batch))
+                return
+            self.written.inc(len(batch))
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await wait_for(self._batch_ready.wait(), timeout=self.flush_interval)
+            except TimeoutError:
+                pass
+            self._batch_ready.clear()
+            await self.flush()
+
+    async def start(self):
+        """Start background writer. Called from app lifespan"""
+        if self.enabled and self._task is None:
+            self._stopping = False
+            self._task = create_task(self._run())
+
+    async def stop(self):
+        """Stop background writer and write what is still queued.
+        The writer is woken and awaited, not cancelled, so a batch being
+        inserted is never abandoned halfway.
+        """
+        if self._task is not None:
+            self._stopping = True
+            self._batch_ready.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+
+audit_log: AuditLog = AuditLog()
@@ -1,66 +1,91 @@
+## Built-in modules:
+from typing import Callable, Optional
+
 ## Pip modules:
 from sqlalchemy import select
-from sqlalchemy.exc import OperationalError
 
 ## Project modules:
-from core.async_database.db_engine import session_factory, engine
+from core.async_database.db_engine import read_session_factory, session_factory, get_engine
 from core.async_database.db_models import Users, Base
+from core.metrics import timed
+from core.async_database.repository import (
+    UserRepository,
+    subscribe_user_changes,
+    notify_user_changed,
+)
 
 ## Create tables
 async def create_tables():
-    """Create all tables"""
-    async with engine.connect() as conn:
+    """Create all tables (local runs), shared databases use
+    `python -m core.async_database.migrations upgrade`
+    """
+    async with get_engine().connect() as conn:
         await conn.run_sync(Base.metadata.create_all)
         
 ## Delete tables
 async def delete_tables():
     """Delete all tables"""
-    async with engine.connect() as conn:
+    async with get_engine().connect() as conn:
         await conn.run_sync(Base.metadata.drop_all)
 
 
 class UserHook:
+    """Session-per-call wrapper around UserRepository.
+    Prefer UserRepository with get_user_repository dependency in routers.
+    """
+    @classmethod
+    def subscribe(cls, listener: Callable[[Optional[str]], None]):
+        """Subscribe to user changes made by append/replace/remove
+
+        Args:
+            listener (Callable): called with changed login, None if unknown
+        """
+        subscribe_user_changes(listener)
+
+    @timed("db_operation_seconds", "Database operation time.", operation="UserHook.append")
     async def append(self, **kwargs):
         """Append element in table
 
         Args:
             table (str): name of table (users/)
             **kwargs: data (login/hashed_password)
+
+        Returns:
+            True if created, Users object if login already exists, False on error
         """
         try:
             async with session_factory() as session:
-                user: Users = Users(login=kwargs["login"], hashed_password=kwargs["hashed_password"])
-                session.add(user)
-                await session.commit()
+                result = await UserRepository(session).create(
+                    login=kwargs["login"],
+                    hashed_password=kwargs["hashed_password"],
+                )
+                if not result.created:
+                    return Users(**kwargs)
                 return True
 
-        except OperationalError:
-            await session.rollback()
-            return Users(**kwargs)
         except Exception:
-            await session.rollback()
             return False
     
+    @timed("db_operation_seconds", "Database operation time.", operation="UserHook.remove")
     async def remove(self, all: bool = False, **flag):
-        """Remove element in table
+        """Remove element in table with single DELETE statement
 
         Args:
+            all (bool): remove every matching row, else only the first one
             **flag: selector (id/login/hashed_password)
         """
         try:
             async with session_factory() as session:
-                query = select(Users).filter_by(**flag)
-                result = await session.execute(query)
-                users: Users = result.scalars().first() if all is False else result.scalars().all()
-                for user in users: 
-                    await session.delete(user)
-                await session.commit()
+                await UserRepository(session).delete(
+                    limit=None if all else 1,
+                    **flag
+                )
                 return True
 
         except Exception:
-            await session.rollback()
             return False
     
+    @timed("db_operation_seconds", "Database operation time.", operation="UserHook.get")
     async def get(self, one_object: bool = False, **flag):
         """Get element in table
 
@@ -69,9 +94,11 @@ class UserHook:
             **flag: selector (id/login/hashed_password)
         """
         try:
-            async with session_factory() as session:
+            async with read_session_factory() as session:
                 query = select(Users).filter_by(**flag)
-                result = await session.execute(query)
+                result = await session.execute(
+                    query, bind_arguments={"login": flag.get("login")}
+                )
                 users: list[Users] = result.scalars().all()
                 if one_object and users != []:
                     return users[0]
@@ -80,8 +107,9 @@ class UserHook:
         except Exception:
             return False
             
+    @timed("db_operation_seconds", "Database operation time.", operation="UserHook.replace")
     async def replace(self, object, all: bool = True, **flag):
-        """Replace info in object
+        """Replace info in object with single UPDATE ... WHERE id IN statement
 
         Args:
             object (): object of element
@@ -89,14 +117,18 @@ class UserHook:
         """
         try:
             async with session_factory() as session:
-                for obj in object:
-                    session.add(obj)
+                objects: list[Users] = list(object)
+                await UserRepository(session).update_by_ids(
+                    ids=[obj.id for obj in objects],
+                    values=flag,
+                )
+                for obj in objects:
+                    notify_user_changed(obj.login)
                     for key, value in flag.items():
                         setattr(obj, key, value)
-                
-                await session.commit()
+                if "login" in flag:
+                    notify_user_changed(flag["login"])
                 return True
                     
         except Exception as error:
-            await session.rollback()   
-            return error
\ No newline at end of file
+            return error
@@ -1,9 +1,19 @@
 ## Pip modules:
 from dotenv import load_dotenv
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 ## Built-in modules
 from os import getenv
+from asyncio import gather
+from contextlib import AsyncExitStack
+from time import perf_counter
+from typing import Any, Optional
+
+## Project modules:
+from core.async_database.routing import ReplicaRouter, RoutingSession
+from core.metrics import Counter, Histogram, registry
 
 ## Load .env
 load_dotenv()
@@ -15,12 +25,194 @@ class Settings:
         self.DB_PASS: str = getenv("DB_PASS")
         self.DB_NAME: str = getenv("DB_NAME")
         self.DATABASE_URL_PYMYSQL: str = f"mysql+aiomysql://{self.DB_USER}:{self.DB_PASS}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+        ## Connection pool:
+        self.DB_POOL_SIZE: int = int(getenv("DB_POOL_SIZE", 5))
+        self.DB_MAX_OVERFLOW: int = int(getenv("DB_MAX_OVERFLOW", 10))
+        self.DB_POOL_TIMEOUT: float = float(getenv("DB_POOL_TIMEOUT_SECONDS", 30))
+        ## Below MySQL wait_timeout, so the server never drops a pooled connection first.
+        self.DB_POOL_RECYCLE: int = int(getenv("DB_POOL_RECYCLE_SECONDS", 1800))
+        self.DB_POOL_PRE_PING: bool = getenv("DB_POOL_PRE_PING", "1") == "1"
+        ## Connections opened at startup, before the first request.
+        self.DB_POOL_WARMUP: int = int(getenv("DB_POOL_WARMUP", self.DB_POOL_SIZE))
+        ## Read replicas ("host:port,host:port"), same credentials and database:
+        self.DB_REPLICA_HOSTS: list[str] = [
+            host.strip() for host in getenv("DB_REPLICA_HOSTS", "").split(",") if host.strip()
+        ]
+        self.DATABASE_REPLICA_URLS: list[str] = [
+            f"mysql+aiomysql://{self.DB_USER}:{self.DB_PASS}@{host}/{self.DB_NAME}"
+            for host in self.DB_REPLICA_HOSTS
+        ]
+        self.DB_REPLICA_BALANCING: str = getenv("DB_REPLICA_BALANCING", "round_robin")
+        self.DB_READ_YOUR_WRITES: float = float(getenv("DB_READ_YOUR_WRITES_SECONDS", 5))
+        self.DB_REPLICA_RETRY: float = float(getenv("DB_REPLICA_RETRY_SECONDS", 30))
+
+
+settings: Settings = Settings()
+
+pool_checkout_wait: Histogram = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent getting a connection from the pool."
+)
+pool_saturated: Counter = Counter(
+    "db_pool_saturated_total", "Checkouts that found every pool and overflow connection in use."
+)
+pool_timed_out: Counter = Counter(
+    "db_pool_timeout_total", "Checkouts that gave up after DB_POOL_TIMEOUT."
+)
+
+
+def pool_instruments(replica: Optional[str] = None) -> tuple[Histogram, Counter, Counter]:
+    """Checkout wait, saturation and timeout metrics of a pool.
+    Replica pools get series labelled with the replica host.
+    """
+    if replica is None:
+        return pool_checkout_wait, pool_saturated, pool_timed_out
+    return (
+        registry.histogram(pool_checkout_wait.name, pool_checkout_wait.description, replica=replica),
+        registry.counter(pool_saturated.name, pool_saturated.description, replica=replica),
+        registry.counter(pool_timed_out.name, pool_timed_out.description, replica=replica),
+    )
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool recording checkout wait and saturation.
+    The pool logging name is the replica host, None for the primary; it
+    survives the pool re-creation done by dispose().
+    """
+    def _do_get(self) -> Any:
+        checkout_wait, saturated, timed_out = pool_instruments(self._orig_logging_name)
+        started_at: float = perf_counter()
+        if self._max_overflow >= 0 and self.checkedout() >= self.size() + self._max_overflow:
+            saturated.inc()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            timed_out.inc()
+            raise
+        finally:
+            checkout_wait.observe(perf_counter() - started_at)
+
+
+class LazySessionMaker(async_sessionmaker):
+    """Session factory creating the engine on the first session, not at import."""
+    def __call__(self, **local_kw) -> Any:
+        if self.kw.get("bind") is None:
+            get_engine()
+        return super().__call__(**local_kw)
+
+
+session_factory = LazySessionMaker()
+
+replica_router: ReplicaRouter = ReplicaRouter(
+    replicas=[],
+    balancing=settings.DB_REPLICA_BALANCING,
+    read_your_writes=settings.DB_READ_YOUR_WRITES,
+    retry_interval=settings.DB_REPLICA_RETRY,
+)
 
-engine = create_async_engine(
-    url=Settings().DATABASE_URL_PYMYSQL,
-    echo=False,
-    pool_size=5,
-    max_overflow=10
+## Sessions of the read-heavy login path, reads go to replicas when configured.
+read_session_factory = LazySessionMaker(
+    sync_session_class=RoutingSession,
+    router=replica_router,
 )
 
-session_factory = async_sessionmaker(engine)
\ No newline at end of file
+_engine: Optional[AsyncEngine] = None
+replica_engines: list[AsyncEngine] = []
+
+
+def bind_engine(primary: AsyncEngine):
+    """Use the given engine as primary of both session factories (benchmarks, tests)."""
+    global _engine
+    _engine = primary
+    session_factory.configure(bind=primary)
+    read_session_factory.configure(bind=primary)
+
+
+def get_engine() -> AsyncEngine:
+    """Primary engine, created with the replica engines on the first call.
+    Importing the module stays cheap, the database driver is loaded here.
+    """
+    if _engine is not None:
+        return _engine
+    pool_options: dict[str, Any] = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    for host, url in zip(settings.DB_REPLICA_HOSTS, settings.DATABASE_REPLICA_URLS):
+        replica_engine: AsyncEngine = create_async_engine(
+            url=url,
+            echo=False,
+            poolclass=InstrumentedQueuePool,
+            pool_logging_name=host,
+            **pool_options,
+        )
+        replica_engines.append(replica_engine)
+        replica_router.add(replica_engine)
+    bind_engine(create_async_engine(
+        url=settings.DATABASE_URL_PYMYSQL,
+        echo=False,
+        poolclass=InstrumentedQueuePool,
+        **pool_options,
+    ))
+    return _engine
+
+
+def current_engine() -> Optional[AsyncEngine]:
+    """Primary engine if already created, without creating it."""
+    return _engine
+
+
+def __getattr__(name: str) -> Any:
+    ## `engine` stays importable, it is created on first access.
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+async def warmup_pool(connections: int = settings.DB_POOL_WARMUP):
+    """Create the engine and open connections concurrently, then return them to the pool.
+    Called from app lifespan, so first requests after a deploy skip connection setup.
+    """
+    engine: AsyncEngine = get_engine()
+    connections = min(connections, settings.DB_POOL_SIZE)
+    async with AsyncExitStack() as stack:
+        results: list = await gather(
+            *(stack.enter_async_context(engine.connect()) for _ in range(connections)),
+            return_exceptions=True,
+        )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+
+def pool_metrics() -> dict[str, Any]:
+    """Current pool usage and checkout metrics."""
+    pool: InstrumentedQueuePool = get_engine().sync_engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "saturated": pool_saturated.value,
+        "timed_out": pool_timed_out.value,
+        "checkout_wait": pool_checkout_wait.snapshot(),
+    }
+
+
+async def dispose_engines():
+    """Close primary and replica pool connections. Called on app shutdown."""
+    if _engine is None:
+        return
+    for pooled_engine in (_engine, *replica_engines):
+        await pooled_engine.dispose()
+
+
+def dispose_engine_after_fork():
+    """Drop pool connections inherited from the parent process.
+    Call in every worker right after fork, the parent keeps its connections.
+    """
+    if _engine is None:
+        return
+    for pooled_engine in (_engine, *replica_engines):
+        pooled_engine.sync_engine.dispose(close=False)
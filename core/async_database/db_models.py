@@ -1,15 +1,41 @@
+## Built-in modules:
+from datetime import datetime
+from typing import Optional
+
 ## Pip modules:
-from sqlalchemy import VARCHAR, BINARY
+from sqlalchemy import VARCHAR, BINARY, Boolean, DateTime
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.types import TypeDecorator
+
+
+class PasswordHash(TypeDecorator):
+    """Password hash column, str in application code.
+
+    The column is VARCHAR(128). Databases where the withdrawn migration
+    0003 ran have VARBINARY(128), which returns bytes, decoded here.
+    """
+    impl = VARCHAR(128)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect) -> Optional[str]:
+        if isinstance(value, (bytes, bytearray)):
+            return value.decode("ascii")
+        return value
+
+    def process_result_value(self, value, dialect) -> Optional[str]:
+        if isinstance(value, (bytes, bytearray)):
+            return value.decode("ascii")
+        return value
+
 
 ## Declarative Base
 class Base(DeclarativeBase):
+    ## Primary key is already unique, no extra unique index.
     id: Mapped[int] = mapped_column(
         primary_key=True,
         nullable=False, 
         autoincrement=True,
-        unique=True
     )
     
 
@@ -21,7 +47,76 @@ class Users(Base):
         nullable=False,
         unique=True
     )
-    hashed_password: Mapped[bytes] = mapped_column(
-        VARCHAR(128),
+    hashed_password: Mapped[str] = mapped_column(
+        PasswordHash,
+        nullable=False
+    )
+
+
+class RevokedTokens(Base):
+    __tablename__ = "revoked_tokens"
+    jti: Mapped[str] = mapped_column(
+        VARCHAR(32),
+        nullable=False,
+        unique=True
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        index=True
+    )
+
+
+class RefreshTokens(Base):
+    __tablename__ = "refresh_tokens"
+    token_hash: Mapped[bytes] = mapped_column(
+        BINARY(32),
+        nullable=False,
+        unique=True
+    )
+    family_id: Mapped[str] = mapped_column(
+        VARCHAR(32),
+        nullable=False,
+        index=True
+    )
+    login: Mapped[str] = mapped_column(
+        VARCHAR(24),
         nullable=False
-    )
\ No newline at end of file
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        index=True
+    )
+    used: Mapped[bool] = mapped_column(
+        Boolean,
+        nullable=False,
+        default=False
+    )
+    revoked: Mapped[bool] = mapped_column(
+        Boolean,
+        nullable=False,
+        default=False
+    )
+
+
+class AuditEvents(Base):
+    __tablename__ = "audit_events"
+    event: Mapped[str] = mapped_column(
+        VARCHAR(16),
+        nullable=False
+    )
+    login: Mapped[Optional[str]] = mapped_column(
+        VARCHAR(24),
+        nullable=True,
+        index=True
+    )
+    client_ip: Mapped[Optional[str]] = mapped_column(
+        VARCHAR(45),
+        nullable=True
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        index=True
+    )
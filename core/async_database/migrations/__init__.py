@@ -0,0 +1,13 @@
+__all__ = [
+    "Migration",
+    "MigrationRunner",
+    "MIGRATIONS",
+    "online_ddl",
+]
+
+from core.async_database.migrations.runner import (
+    Migration,
+    MigrationRunner,
+    online_ddl
+)
+from core.async_database.migrations.versions import MIGRATIONS
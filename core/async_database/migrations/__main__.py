@@ -0,0 +1,39 @@
+"""Schema migrations.
+
+Usage:
+    python -m core.async_database.migrations status
+    python -m core.async_database.migrations upgrade [--target VERSION]
+"""
+
+## Built-in modules:
+from argparse import ArgumentParser, Namespace
+from asyncio import run
+
+## Project modules:
+from core.async_database.db_engine import dispose_engines, get_engine
+from core.async_database.migrations import MIGRATIONS, Migration, MigrationRunner
+
+
+async def main(arguments: Namespace):
+    runner: MigrationRunner = MigrationRunner(get_engine(), MIGRATIONS)
+    try:
+        if arguments.command == "status":
+            pending: list[Migration] = await runner.pending()
+            for migration in runner.migrations:
+                state: str = "pending" if migration in pending else "applied"
+                print(f"{migration.version}  {state:<8}  {migration.description}")
+            return
+        applied: list[Migration] = await runner.upgrade(target=arguments.target)
+        for migration in applied:
+            print(f"applied {migration.version}  {migration.description}")
+        if not applied:
+            print("Schema is up to date.")
+    finally:
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    parser: ArgumentParser = ArgumentParser(description="Schema migrations.")
+    parser.add_argument("command", choices=("status", "upgrade"))
+    parser.add_argument("--target", help="Last version to apply, all if omitted.")
+    run(main(parser.parse_args()))
@@ -0,0 +1,127 @@
+## Built-in modules:
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Optional
+
+## Pip modules:
+from sqlalchemy import Column, DateTime, MetaData, String, Table, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+schema_metadata: MetaData = MetaData()
+schema_migrations: Table = Table(
+    "schema_migrations",
+    schema_metadata,
+    Column("version", String(64), primary_key=True),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+## Serializes runners of several deploying nodes (MySQL named lock)
+MIGRATION_LOCK_NAME: str = "schema_migrations"
+MIGRATION_LOCK_TIMEOUT: int = 600
+
+
+@dataclass(frozen=True, slots=True)
+class Migration:
+    """One schema change, applied once and recorded in schema_migrations.
+    `upgrade` must be idempotent: it checks the live schema before changing it,
+    so a migration interrupted after its DDL can simply be run again.
+    """
+    version: str
+    description: str
+    upgrade: Callable[[AsyncConnection], Awaitable[None]]
+
+
+async def online_ddl(
+    connection: AsyncConnection,
+    statement: str,
+    algorithm: str = "INPLACE",
+    lock: str = "NONE",
+):
+    """Run ALTER TABLE with explicit ALGORITHM and LOCK clauses on MySQL.
+
+    MySQL fails the statement instead of silently copying the table or
+    blocking writes when the change can not be done as requested.
+    Other dialects get the plain statement.
+
+    Args:
+        statement (str): ALTER TABLE ... statement without the clauses.
+        algorithm (str): INPLACE, INSTANT or COPY.
+        lock (str): NONE, SHARED or EXCLUSIVE.
+    """
+    if connection.dialect.name == "mysql":
+        statement = f"{statement}, ALGORITHM={algorithm}, LOCK={lock}"
+    await connection.execute(text(statement))
+
+
+async def index_exists(connection: AsyncConnection, table: str, index: str) -> bool:
+    """Check a MySQL index in the current database."""
+    result = await connection.execute(
+        text(
+            "SELECT 1 FROM information_schema.statistics "
+            "WHERE table_schema = DATABASE() AND table_name = :table AND index_name = :index "
+            "LIMIT 1"
+        ),
+        {"table": table, "index": index},
+    )
+    return result.first() is not None
+
+
+class MigrationRunner:
+    """Applies pending migrations in version order through the async engine"""
+    def __init__(self, engine: AsyncEngine, migrations: list[Migration]):
+        self.engine: AsyncEngine = engine
+        self.migrations: list[Migration] = sorted(migrations, key=lambda migration: migration.version)
+
+    async def applied_versions(self, connection: AsyncConnection) -> set[str]:
+        await connection.run_sync(schema_metadata.create_all)
+        await connection.commit()
+        result = await connection.execute(select(schema_migrations.c.version))
+        return set(result.scalars())
+
+    async def pending(self) -> list[Migration]:
+        """Migrations not applied yet"""
+        async with self.engine.connect() as connection:
+            applied: set[str] = await self.applied_versions(connection)
+        return [migration for migration in self.migrations if migration.version not in applied]
+
+    async def upgrade(self, target: Optional[str] = None) -> list[Migration]:
+        """Apply pending migrations up to `target` version (all if None).
+
+        Every migration is recorded right after it succeeds, so a failure
+        keeps the earlier ones applied and the next run resumes from it.
+
+        Returns:
+            list[Migration]: migrations applied by this call
+        """
+        applied_now: list[Migration] = []
+        async with self.engine.connect() as connection:
+            mysql: bool = connection.dialect.name == "mysql"
+            if mysql:
+                result = await connection.execute(
+                    text("SELECT GET_LOCK(:name, :timeout)"),
+                    {"name": MIGRATION_LOCK_NAME, "timeout": MIGRATION_LOCK_TIMEOUT},
+                )
+                if result.scalar() != 1:
+                    raise RuntimeError("Another node is running migrations.")
+            try:
+                applied: set[str] = await self.applied_versions(connection)
+                for migration in self.migrations:
+                    if target is not None and migration.version > target:
+                        break
+                    if migration.version in applied:
+                        continue
+                    await migration.upgrade(connection)
+                    await connection.execute(insert(schema_migrations).values(
+                        version=migration.version,
+                        description=migration.description,
+                        applied_at=datetime.now(timezone.utc).replace(tzinfo=None),
+                    ))
+                    await connection.commit()
+                    applied_now.append(migration)
+            finally:
+                if mysql:
+                    await connection.execute(
+                        text("SELECT RELEASE_LOCK(:name)"), {"name": MIGRATION_LOCK_NAME}
+                    )
+        return applied_now
@@ -0,0 +1,104 @@
+## Pip modules:
+from sqlalchemy import BINARY, VARCHAR, Boolean, Column, DateTime, Integer, MetaData, Table
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+## Project modules:
+from core.async_database.migrations.runner import Migration, index_exists, online_ddl
+
+## Tables as create_tables made them before migrations existed. Frozen on
+## purpose: model changes are made by later migrations, a fresh database
+## goes through the same steps as an existing one.
+baseline_metadata: MetaData = MetaData()
+Table(
+    "users",
+    baseline_metadata,
+    Column("id", Integer, primary_key=True, nullable=False, autoincrement=True, unique=True),
+    Column("login", VARCHAR(24), nullable=False, unique=True),
+    Column("hashed_password", VARCHAR(128), nullable=False),
+)
+Table(
+    "revoked_tokens",
+    baseline_metadata,
+    Column("id", Integer, primary_key=True, nullable=False, autoincrement=True, unique=True),
+    Column("jti", VARCHAR(32), nullable=False, unique=True),
+    Column("expires_at", DateTime, nullable=False, index=True),
+)
+Table(
+    "refresh_tokens",
+    baseline_metadata,
+    Column("id", Integer, primary_key=True, nullable=False, autoincrement=True, unique=True),
+    Column("token_hash", BINARY(32), nullable=False, unique=True),
+    Column("family_id", VARCHAR(32), nullable=False, index=True),
+    Column("login", VARCHAR(24), nullable=False),
+    Column("expires_at", DateTime, nullable=False),
+    Column("used", Boolean, nullable=False, default=False),
+    Column("revoked", Boolean, nullable=False, default=False),
+)
+
+## audit_events as first released, frozen like the baseline.
+audit_events_metadata: MetaData = MetaData()
+audit_events: Table = Table(
+    "audit_events",
+    audit_events_metadata,
+    Column("id", Integer, primary_key=True, nullable=False, autoincrement=True),
+    Column("event", VARCHAR(16), nullable=False),
+    Column("login", VARCHAR(24), nullable=True, index=True),
+    Column("client_ip", VARCHAR(45), nullable=True),
+    Column("created_at", DateTime, nullable=False, index=True),
+)
+
+
+async def baseline(connection: AsyncConnection):
+    """Tables that create_tables used to make, created if missing.
+    Existing databases are left as they are, later migrations align them.
+    """
+    await connection.run_sync(baseline_metadata.create_all)
+
+
+async def drop_redundant_id_indexes(connection: AsyncConnection):
+    """`id` had both PRIMARY KEY and UNIQUE, MySQL kept a second index named `id`.
+    Dropping a secondary index is in-place and does not block reads or writes.
+    """
+    if connection.dialect.name != "mysql":
+        return
+    for table in ("users", "revoked_tokens", "refresh_tokens"):
+        if await index_exists(connection, table, "id"):
+            await online_ddl(connection, f"ALTER TABLE {table} DROP INDEX id")
+
+
+async def hashed_password_varbinary(connection: AsyncConnection):
+    """Withdrawn, does nothing. Kept so version numbers stay stable.
+
+    It turned users.hashed_password VARCHAR(128) into VARBINARY(128) with a
+    table copy under LOCK=SHARED, blocking writes for the whole copy. It
+    saved nothing: both types store the same ASCII bytes behind the same
+    1-byte length prefix. Databases where it already ran keep VARBINARY,
+    the PasswordHash column type reads both.
+    """
+
+
+async def create_audit_events(connection: AsyncConnection):
+    """New audit_events table, nothing existing is locked."""
+    await connection.run_sync(audit_events.create, checkfirst=True)
+
+
+async def index_refresh_tokens_expires_at(connection: AsyncConnection):
+    """Index for the periodic prune of expired refresh tokens.
+    Adding a secondary index is in-place and does not block reads or writes.
+    """
+    if connection.dialect.name != "mysql":
+        return
+    if not await index_exists(connection, "refresh_tokens", "ix_refresh_tokens_expires_at"):
+        await online_ddl(
+            connection,
+            "ALTER TABLE refresh_tokens ADD INDEX ix_refresh_tokens_expires_at (expires_at)",
+        )
+
+
+MIGRATIONS: list[Migration] = [
+    Migration("0001", "baseline schema", baseline),
+    Migration("0002", "drop redundant unique indexes on id", drop_redundant_id_indexes),
+    Migration("0003", "withdrawn: users.hashed_password as VARBINARY(128)", hashed_password_varbinary),
+    Migration("0004", "create audit_events table", create_audit_events),
+    Migration("0005", "index refresh_tokens.expires_at", index_refresh_tokens_expires_at),
+]
@@ -0,0 +1,263 @@
+## Built-in modules:
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, AsyncIterator, Callable, Iterable, Optional
+
+## Pip modules:
+from sqlalchemy import bindparam, delete, select, update
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+## Project modules:
+from core.async_database.db_engine import read_session_factory, replica_router, session_factory
+from core.async_database.db_models import Users
+from core.metrics import timed
+
+
+## Callbacks called with changed user login (None if any user could be changed)
+_change_listeners: list[Callable[[Optional[str]], None]] = []
+
+
+def subscribe_user_changes(listener: Callable[[Optional[str]], None]):
+    """Subscribe to user creation, updates and deletions"""
+    _change_listeners.append(listener)
+
+
+def notify_user_changed(login: Optional[str]):
+    for listener in _change_listeners:
+        listener(login)
+
+
+## Callbacks called with deleted user login (None if any user could be deleted)
+_deletion_listeners: list[Callable[[Optional[str]], None]] = []
+
+
+def subscribe_user_deletions(listener: Callable[[Optional[str]], None]):
+    """Subscribe to user deletions only, not to updates (password rehash...)"""
+    _deletion_listeners.append(listener)
+
+
+def notify_user_deleted(login: Optional[str]):
+    for listener in _deletion_listeners:
+        listener(login)
+
+
+## Reads of just written logins go to the primary.
+subscribe_user_changes(replica_router.mark_written)
+
+
+## Projection statements built once, so every call hits the compiled cache
+## without rebuilding the construct and its cache key.
+_EXISTS_BY_LOGIN = select(Users.id).where(Users.login == bindparam("login")).limit(1)
+_PASSWORD_HASH_BY_LOGIN = (
+    select(Users.id, Users.hashed_password)
+    .where(Users.login == bindparam("login"))
+    .limit(1)
+)
+_LOGINS_IN = select(Users.login).where(Users.login.in_(bindparam("logins", expanding=True)))
+
+
+class CreateStatus(Enum):
+    CREATED = "created"
+    CONFLICT = "conflict"
+
+
+@dataclass(frozen=True, slots=True)
+class CreateResult:
+    """Result of user creation"""
+    status: CreateStatus
+    user_id: Optional[int] = None
+
+    @property
+    def created(self) -> bool:
+        return self.status is CreateStatus.CREATED
+
+
+def dialect_insert(session: AsyncSession):
+    """Dialect specific INSERT construct (needed for upserts)"""
+    if session.bind.dialect.name == "sqlite":
+        return sqlite.insert(Users)
+    return mysql.insert(Users)
+
+
+class UserRepository:
+    """Users table access with one statement per operation.
+
+    Every write is a single INSERT/UPDATE/DELETE ... WHERE, no SELECT before it.
+    Errors are raised as SQLAlchemyError, results are typed.
+    """
+    def __init__(self, session: AsyncSession):
+        """
+        Args:
+            session (AsyncSession): session, can be shared by the whole request
+        """
+        self.session: AsyncSession = session
+
+    @timed("db_operation_seconds", "Database operation time.", operation="UserRepository.get")
+    async def get(self, **flag) -> Optional[Users]:
+        """Get first user matching selector
+
+        Args:
+            **flag: selector (id/login/hashed_password)
+        """
+        result = await self.session.execute(
+            select(Users).filter_by(**flag).limit(1),
+            bind_arguments={"login": flag.get("login")},
+        )
+        return result.scalars().first()
+
+    @timed("db_operation_seconds", "Database operation time.", operation="UserRepository.exists")
+    async def exists(self, login: str) -> bool:
+        """Check if login exists without loading ORM object"""
+        result = await self.session.execute(
+            _EXISTS_BY_LOGIN, {"login": login}, bind_arguments={"login": login}
+        )
+        return result.first() is not None
+
+    @timed("db_operation_seconds", "Database operation time.", operation="UserRepository.get_password_hash")
+    async def get_password_hash(self, login: str) -> Optional[tuple[int, str]]:
+        """Get (id, hashed_password) of the login as plain tuple
+
+        Returns:
+            Optional[tuple[int, str]]: None if login does not exist
+        """
+        result = await self.session.execute(
+            _PASSWORD_HASH_BY_LOGIN, {"login": login}, bind_arguments={"login": login}
+        )
+        row = result.first()
+        return None if row is None else tuple(row)
+
+    @timed("db_operation_seconds", "Database operation time.", operation="UserRepository.existing_logins")
+    async def existing_logins(self, logins: Iterable[str]) -> set[str]:
+        """SELECT login FROM users WHERE login IN (logins), one query for the batch
+
+        Returns:
+            set[str]: logins found, as stored
+        """
+        logins = list(set(logins))
+        if not logins:
+            return set()
+        result = await self.session.execute(_LOGINS_IN, {"logins": logins})
+        return set(result.scalars())
+
+    @timed("db_operation_seconds", "Database operation time.", operation="UserRepository.create")
+    async def create(self, login: str, hashed_password: str) -> CreateResult:
+        """INSERT user, duplicate login is reported as CONFLICT"""
+        statement = dialect_insert(self.session).values(
+            login=login,
+            hashed_password=hashed_password,
+        )
+        try:
+            result = await self.session.execute(statement)
+            await self.session.commit()
+        except IntegrityError:
+            await self.session.rollback()
+            return CreateResult(status=CreateStatus.CONFLICT)
+        notify_user_changed(login)
+        return CreateResult(
+            status=CreateStatus.CREATED,
+            user_id=result.inserted_primary_key[0],
+        )
+
+    @timed("db_operation_seconds", "Database operation time.", operation="UserRepository.upsert")
+    async def upsert(self, login: str, hashed_password: str) -> int:
+        """INSERT ... ON DUPLICATE KEY UPDATE hashed_password
+
+        Returns:
+            int: affected rows as reported by the driver
+        """
+        statement = dialect_insert(self.session).values(
+            login=login,
+            hashed_password=hashed_password,
+        )
+        if self.session.bind.dialect.name == "sqlite":
+            statement = statement.on_conflict_do_update(
+                index_elements=[Users.login],
+                set_={"hashed_password": statement.excluded.hashed_password},
+            )
+        else:
+            statement = statement.on_duplicate_key_update(
+                hashed_password=statement.inserted.hashed_password,
+            )
+        result = await self.session.execute(statement)
+        await self.session.commit()
+        notify_user_changed(login)
+        return result.rowcount
+
+    @timed("db_operation_seconds", "Database operation time.", operation="UserRepository.update_by_ids")
+    async def update_by_ids(self, ids: list[int], values: dict[str, Any]) -> int:
+        """UPDATE users SET values WHERE id IN (ids)
+
+        Returns:
+            int: number of updated rows
+        """
+        statement = update(Users).where(Users.id.in_(ids)).values(**values)
+        result = await self.session.execute(statement)
+        await self.session.commit()
+        return result.rowcount
+
+    @timed("db_operation_seconds", "Database operation time.", operation="UserRepository.update")
+    async def update(self, values: dict[str, Any], **flag) -> int:
+        """UPDATE users SET values WHERE selector
+
+        Args:
+            values (dict[str, Any]): new column values
+            **flag: selector (id/login/hashed_password)
+
+        Returns:
+            int: number of updated rows
+        """
+        statement = update(Users).filter_by(**flag).values(**values)
+        result = await self.session.execute(statement)
+        await self.session.commit()
+        notify_user_changed(flag.get("login"))
+        if "login" in values and result.rowcount:
+            notify_user_changed(values["login"])
+        return result.rowcount
+
+    @timed("db_operation_seconds", "Database operation time.", operation="UserRepository.delete")
+    async def delete(self, limit: Optional[int] = None, **flag) -> int:
+        """DELETE FROM users WHERE selector, at most `limit` rows
+
+        Args:
+            limit (Optional[int]): max rows to delete, None deletes every matching row
+            **flag: selector (id/login/hashed_password)
+
+        Returns:
+            int: number of deleted rows
+        """
+        statement = delete(Users).filter_by(**flag)
+        if limit is not None:
+            # DELETE ... LIMIT is MySQL only (other dialects drop it silently),
+            # select the ids first and delete by primary key
+            ids: list[int] = list(
+                (await self.session.execute(
+                    select(Users.id).filter_by(**flag).order_by(Users.id).limit(limit)
+                )).scalars()
+            )
+            if not ids:
+                return 0
+            statement = delete(Users).where(Users.id.in_(ids))
+        result = await self.session.execute(statement)
+        await self.session.commit()
+        notify_user_changed(flag.get("login"))
+        if result.rowcount:
+            notify_user_deleted(flag.get("login"))
+        return result.rowcount
+
+
+async def get_user_repository() -> AsyncIterator[UserRepository]:
+    """FastAPI dependency, one session per request shared by every call.
+    Reads go to a replica when replicas are configured.
+    """
+    async with read_session_factory() as session:
+        yield UserRepository(session)
+
+
+async def get_primary_user_repository() -> AsyncIterator[UserRepository]:
+    """FastAPI dependency like get_user_repository, every statement on the primary.
+    For reads that must not lag: refresh token rotation, token introspection.
+    """
+    async with session_factory() as session:
+        yield UserRepository(session)
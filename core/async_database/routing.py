@@ -0,0 +1,154 @@
+## Built-in modules:
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import count
+from time import monotonic
+from typing import Any, Optional
+
+## Pip modules:
+from sqlalchemy import Engine, event
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+## Project modules:
+from core.metrics import Counter
+
+
+@dataclass(slots=True)
+class Replica:
+    """Read replica engine and the time it is considered down until"""
+    engine: AsyncEngine
+    down_until: float = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        return self.down_until <= monotonic()
+
+
+class ReplicaRouter:
+    """Chooses the engine for read statements.
+
+    Replicas are balanced round-robin or by least checked out connections.
+    A replica that fails with a disconnect error is skipped for
+    `retry_interval` seconds. Reads of a login written by this process in
+    the last `read_your_writes` seconds go to the primary, so they never
+    see replication lag.
+    """
+    def __init__(
+        self,
+        replicas: list[AsyncEngine],
+        balancing: str = "round_robin",
+        read_your_writes: float = 5.0,
+        retry_interval: float = 30.0,
+    ):
+        """
+        Args:
+            replicas (list[AsyncEngine]): replica engines, none means primary only
+            balancing (str): "round_robin" or "least_connections"
+            read_your_writes (float): seconds reads stay on primary after a write
+            retry_interval (float): seconds a failed replica is skipped
+        """
+        if balancing not in ("round_robin", "least_connections"):
+            raise ValueError(f"Unknown replica balancing: {balancing}")
+        self.balancing: str = balancing
+        self.read_your_writes: float = read_your_writes
+        self.retry_interval: float = retry_interval
+        self.replicas: list[Replica] = []
+        self._turn = count()
+        ## login -> primary-only deadline, ordered by deadline (window is constant)
+        self._written: OrderedDict[str, float] = OrderedDict()
+        self._all_written_until: float = 0.0
+
+        self.replica_failures: Counter = Counter(
+            "db_replica_failures_total", "Replicas marked down after a disconnect error."
+        )
+        for engine in replicas:
+            self.add(engine)
+
+    def add(self, engine: AsyncEngine):
+        """Start sending reads to the replica engine"""
+        replica: Replica = Replica(engine)
+        self.replicas.append(replica)
+
+        def on_error(context: ExceptionContext):
+            if context.is_disconnect or context.connection is None:
+                self.mark_down(replica)
+
+        event.listen(replica.engine.sync_engine, "handle_error", on_error)
+
+    def mark_down(self, replica: Replica):
+        replica.down_until = monotonic() + self.retry_interval
+        self.replica_failures.inc()
+
+    def mark_written(self, login: Optional[str]):
+        """Keep reads of the login on primary for the read-your-writes window.
+        None means any login could be changed.
+        """
+        now: float = monotonic()
+        until: float = now + self.read_your_writes
+        if login is None:
+            self._all_written_until = until
+            return
+        self._written[login] = until
+        self._written.move_to_end(login)
+        while self._written:
+            oldest: str = next(iter(self._written))
+            if self._written[oldest] > now:
+                break
+            del self._written[oldest]
+
+    def recently_written(self, login: Optional[str]) -> bool:
+        """Check if reads of the login must stay on primary"""
+        now: float = monotonic()
+        if self._all_written_until > now:
+            return True
+        return login is not None and self._written.get(login, 0.0) > now
+
+    def read_engine(self) -> Optional[Engine]:
+        """Healthy replica engine, None if every replica is down"""
+        healthy: list[Replica] = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        if self.balancing == "least_connections":
+            replica: Replica = min(healthy, key=lambda r: r.engine.sync_engine.pool.checkedout())
+        else:
+            replica = healthy[next(self._turn) % len(healthy)]
+        return replica.engine.sync_engine
+
+    def metrics(self) -> dict[str, Any]:
+        """Routing counters and replica health"""
+        return {
+            "replicas": len(self.replicas),
+            "healthy": sum(replica.healthy for replica in self.replicas),
+            "replica_failures": self.replica_failures.value,
+        }
+
+
+class RoutingSession(Session):
+    """Session sending reads to replicas and writes to its primary bind.
+
+    A session reads from one replica picked on its first read. Once it
+    writes, its later reads stay on the primary too. Pass
+    `bind_arguments={"login": login}` to apply the per-login
+    read-your-writes window.
+    """
+    def __init__(self, *args, router: Optional[ReplicaRouter] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.router: Optional[ReplicaRouter] = router
+
+    def get_bind(self, mapper=None, clause=None, login: Optional[str] = None, **kwargs):
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info["wrote"] = True
+        elif (
+            self.router is not None
+            and self.router.replicas
+            and not self.info.get("wrote")
+            and not self.router.recently_written(login)
+        ):
+            replica: Optional[Engine] = self.info.get("replica") or self.router.read_engine()
+            if replica is not None:
+                self.info["replica"] = replica
+                return replica
+        return super().get_bind(mapper, clause=clause, **kwargs)
@@ -0,0 +1,21 @@
+__all__ = [
+    "BulkExecutor",
+    "bulk_executor",
+    "UserImporter",
+    "ImportReport",
+    "RowConflict",
+    "export_users",
+    "iter_lines",
+    "parse_records",
+]
+
+from .pipeline import (
+    BulkExecutor,
+    bulk_executor,
+    UserImporter,
+    ImportReport,
+    RowConflict,
+    export_users,
+    iter_lines,
+    parse_records
+)
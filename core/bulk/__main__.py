@@ -0,0 +1,83 @@
+"""Bulk users import/export.
+
+Usage:
+    python -m core.bulk import users.csv [--format csv|ndjson] [--batch-size N] [--workers N]
+    python -m core.bulk export users.ndjson [--format csv|ndjson]
+"""
+
+## Built-in modules: ##
+from typing import AsyncIterator
+from argparse import ArgumentParser, Namespace
+from asyncio import run
+from concurrent.futures import ProcessPoolExecutor
+from os import cpu_count
+from sys import stderr
+from time import perf_counter
+
+## Local modules: ##
+from config import BULK_BATCH_SIZE
+from core.async_database.db_engine import session_factory
+from core.bulk.pipeline import (
+    SUPPORTED_FORMATS,
+    RowConflict,
+    UserImporter,
+    export_users,
+    iter_lines,
+    parse_records,
+)
+
+FILE_CHUNK_SIZE: int = 1 << 20
+
+
+async def read_chunks(path: str) -> AsyncIterator[bytes]:
+    with open(path, "rb") as file:
+        while chunk := file.read(FILE_CHUNK_SIZE):
+            yield chunk
+
+
+async def import_command(arguments: Namespace) -> None:
+    started_at: float = perf_counter()
+    with ProcessPoolExecutor(max_workers=arguments.workers) as executor:
+        importer: UserImporter = UserImporter(
+            session_factory=session_factory,
+            executor=executor,
+            batch_size=arguments.batch_size,
+            workers=arguments.workers,
+        )
+        records = parse_records(iter_lines(read_chunks(arguments.path)), arguments.format)
+        conflict: RowConflict
+        async for conflict in importer.run(records):
+            print(f"line {conflict.line}: {conflict.login}: {conflict.reason}", file=stderr)
+
+    elapsed: float = perf_counter() - started_at
+    print(
+        f"imported={importer.report.imported} rejected={importer.report.rejected} "
+        f"batches={importer.report.batches} elapsed={elapsed:.1f}s"
+    )
+
+
+async def export_command(arguments: Namespace) -> None:
+    with open(arguments.path, "wb") as file:
+        async for chunk in export_users(session_factory, arguments.format, arguments.batch_size):
+            file.write(chunk)
+
+
+def main() -> None:
+    parser: ArgumentParser = ArgumentParser(description="Bulk users import/export.")
+    parser.add_argument("command", choices=("import", "export"))
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=SUPPORTED_FORMATS, default=None)
+    parser.add_argument("--batch-size", type=int, default=BULK_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=cpu_count() or 1)
+    arguments: Namespace = parser.parse_args()
+    if arguments.format is None:
+        arguments.format = "csv" if arguments.path.endswith(".csv") else "ndjson"
+
+    if arguments.command == "import":
+        run(import_command(arguments))
+    else:
+        run(export_command(arguments))
+
+
+if __name__ == "__main__":
+    main()
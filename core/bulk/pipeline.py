@@ -0,0 +1,315 @@
+
+## Built-in modules: ##
+from typing import Any, AsyncIterator, Iterable, Optional
+from asyncio import get_running_loop, gather, to_thread
+from concurrent.futures import Executor, ProcessPoolExecutor
+from csv import reader as csv_reader, writer as csv_writer
+from dataclasses import dataclass
+from io import StringIO
+from json import JSONDecodeError, dumps, loads
+from multiprocessing import get_context
+
+## Third-party modules: ##
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+## Local modules: ##
+from config import BULK_BATCH_SIZE, BULK_WORKERS
+from core.api_v1.token_auth.hashers import PasswordHasher, hasher_registry
+from core.async_database.db_models import Users
+from core.async_database.repository import notify_user_changed
+
+SUPPORTED_FORMATS: tuple[str, ...] = ("csv", "ndjson")
+LOGIN_MIN_LENGTH: int = 4
+LOGIN_MAX_LENGTH: int = 16
+PASSWORD_MIN_LENGTH: int = 8
+
+
+@dataclass(slots=True)
+class RowConflict:
+    """Row that was not imported."""
+    line: int
+    login: Optional[str]
+    reason: str
+
+
+@dataclass(slots=True)
+class ImportReport:
+    """Summary of an import run."""
+    imported: int = 0
+    rejected: int = 0
+    batches: int = 0
+
+
+@dataclass(slots=True)
+class _PendingRow:
+    line: int
+    login: str
+    password: Optional[bytes] = None
+    hashed_password: Optional[str] = None
+
+
+def hash_passwords(hasher: PasswordHasher, passwords: list[bytes]) -> list[bytes]:
+    """Hash a chunk of passwords. Runs inside a pool worker."""
+    return [hasher.hash(password) for password in passwords]
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split byte stream into decoded lines without reading it whole."""
+    buffer: bytes = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode().rstrip("\r")
+    if buffer:
+        yield buffer.decode().rstrip("\r")
+
+
+async def parse_records(lines: AsyncIterator[str], file_format: str) -> AsyncIterator[tuple[int, Any]]:
+    """Parse CSV (with header row) or NDJSON lines into (line number, record) pairs.
+    Unparsable lines are yielded with an error string instead of a record dict.
+
+    Args:
+        lines (AsyncIterator[str]): Input lines.
+        file_format (str): "csv" or "ndjson".
+    """
+    if file_format not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported format: {file_format}")
+    header: Optional[list[str]] = None
+    line_number: int = 0
+    async for line in lines:
+        line_number += 1
+        if not line.strip():
+            continue
+        if file_format == "ndjson":
+            try:
+                record: Any = loads(line)
+            except JSONDecodeError:
+                yield line_number, "invalid JSON"
+                continue
+            yield line_number, record if isinstance(record, dict) else "record is not an object"
+            continue
+
+        row: list[str] = next(csv_reader((line,)))
+        if header is None:
+            header = [column.strip() for column in row]
+            continue
+        if len(row) != len(header):
+            yield line_number, "wrong number of columns"
+            continue
+        yield line_number, dict(zip(header, row))
+
+
+def _validate(line: int, record: Any) -> _PendingRow | RowConflict:
+    if isinstance(record, str):
+        return RowConflict(line=line, login=None, reason=record)
+    login: Any = record.get("login")
+    if not isinstance(login, str) or not LOGIN_MIN_LENGTH <= len(login) <= LOGIN_MAX_LENGTH:
+        return RowConflict(line=line, login=login if isinstance(login, str) else None, reason="invalid login")
+
+    hashed_password: Any = record.get("hashed_password")
+    if hashed_password:
+        if hasher_registry.identify(str(hashed_password)) is None:
+            return RowConflict(line=line, login=login, reason="unknown password hash scheme")
+        return _PendingRow(line=line, login=login, hashed_password=str(hashed_password))
+
+    password: Any = record.get("password")
+    if not isinstance(password, str) or len(password) < PASSWORD_MIN_LENGTH:
+        return RowConflict(line=line, login=login, reason="invalid password")
+    return _PendingRow(line=line, login=login, password=password.encode())
+
+
+class BulkExecutor(object):
+    """Process pool shared by every admin import of the app.
+
+    Created by the app lifespan, not per request. Workers are spawned, not
+    forked, so they do not inherit the threads and sockets of the server.
+    """
+    def __init__(self, workers: int = BULK_WORKERS) -> None:
+        self.workers: int = max(workers, 1)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def start(self) -> None:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=get_context("spawn"),
+            )
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            raise RuntimeError("Bulk executor is not started.")
+        return self._executor
+
+    async def stop(self) -> None:
+        """Wait for running hashing chunks off the event loop."""
+        if self._executor is not None:
+            executor: ProcessPoolExecutor = self._executor
+            self._executor = None
+            await to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+
+class UserImporter(object):
+    """Streaming users import: validate, hash in parallel, insert in batches.
+
+    Each batch costs one SELECT ... IN for already existing logins and one
+    multi-row INSERT, plaintext passwords are hashed across the executor
+    workers. Pre-hashed values of any registered scheme are stored as is.
+    User change listeners get every login once its batch is committed.
+    """
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        executor: Executor,
+        batch_size: int = BULK_BATCH_SIZE,
+        workers: int = 1,
+    ) -> None:
+        """
+        Args:
+            session_factory (async_sessionmaker): Session factory of the target database.
+            executor (Executor): Pool used for password hashing (process pool for real imports).
+            batch_size (int): Rows per INSERT statement.
+            workers (int): Number of hashing chunks per batch.
+        """
+        self.session_factory: async_sessionmaker[AsyncSession] = session_factory
+        self.executor: Executor = executor
+        self.batch_size: int = batch_size
+        self.workers: int = max(workers, 1)
+        self.report: ImportReport = ImportReport()
+
+    async def run(self, records: AsyncIterator[tuple[int, Any]]) -> AsyncIterator[RowConflict]:
+        """Import records, yielding every rejected row. Summary is in `report` afterwards."""
+        batch: list[_PendingRow] = []
+        async for line, record in records:
+            validated: _PendingRow | RowConflict = _validate(line, record)
+            if isinstance(validated, RowConflict):
+                self.report.rejected += 1
+                yield validated
+                continue
+            batch.append(validated)
+            if len(batch) >= self.batch_size:
+                for conflict in await self._flush(batch):
+                    yield conflict
+                batch = []
+        if batch:
+            for conflict in await self._flush(batch):
+                yield conflict
+
+    async def _hash(self, rows: list[_PendingRow]) -> None:
+        to_hash: list[_PendingRow] = [row for row in rows if row.hashed_password is None]
+        if not to_hash:
+            return
+        chunk_size: int = -(-len(to_hash) // self.workers)
+        chunks: list[list[_PendingRow]] = [
+            to_hash[start:start + chunk_size] for start in range(0, len(to_hash), chunk_size)
+        ]
+        loop = get_running_loop()
+        results: list[list[bytes]] = await gather(*(
+            loop.run_in_executor(
+                self.executor,
+                hash_passwords,
+                hasher_registry.default,
+                [row.password for row in chunk],
+            )
+            for chunk in chunks
+        ))
+        for chunk, hashed_passwords in zip(chunks, results):
+            for row, hashed_password in zip(chunk, hashed_passwords):
+                row.hashed_password = hashed_password.decode()
+
+    async def _flush(self, batch: list[_PendingRow]) -> list[RowConflict]:
+        self.report.batches += 1
+        conflicts: list[RowConflict] = []
+        unique_rows: dict[str, _PendingRow] = {}
+        for row in batch:
+            if row.login in unique_rows:
+                conflicts.append(RowConflict(line=row.line, login=row.login, reason="duplicate login in input"))
+            else:
+                unique_rows[row.login] = row
+
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(Users.login).where(Users.login.in_(list(unique_rows)))
+            )
+            for login in result.scalars():
+                row: Optional[_PendingRow] = unique_rows.pop(login, None)
+                if row is None:
+                    ## Case-insensitive collation matched another spelling, INSERT will report it.
+                    continue
+                conflicts.append(RowConflict(line=row.line, login=login, reason="login already exists"))
+
+            rows: list[_PendingRow] = list(unique_rows.values())
+            if rows:
+                await self._hash(rows)
+                conflicts.extend(await self._insert(session, rows))
+
+        self.report.rejected += len(conflicts)
+        conflicts.sort(key=lambda conflict: conflict.line)
+        return conflicts
+
+    async def _insert(self, session: AsyncSession, rows: list[_PendingRow]) -> list[RowConflict]:
+        values: list[dict[str, str]] = [
+            {"login": row.login, "hashed_password": row.hashed_password} for row in rows
+        ]
+        try:
+            await session.execute(insert(Users).values(values))
+            await session.commit()
+            self.report.imported += len(rows)
+            for row in rows:
+                notify_user_changed(row.login)
+            return []
+        except IntegrityError:
+            await session.rollback()
+
+        ## Concurrent writer took some logins: retry row by row to find them.
+        conflicts: list[RowConflict] = []
+        for row, row_values in zip(rows, values):
+            try:
+                await session.execute(insert(Users).values(row_values))
+                await session.commit()
+                self.report.imported += 1
+                notify_user_changed(row.login)
+            except IntegrityError:
+                await session.rollback()
+                conflicts.append(RowConflict(line=row.line, login=row.login, reason="login already exists"))
+        return conflicts
+
+
+def format_rows(rows: Iterable[tuple[str, str]], file_format: str) -> str:
+    """Serialize (login, hashed_password) rows as CSV or NDJSON lines."""
+    if file_format == "ndjson":
+        return "".join(
+            dumps({"login": login, "hashed_password": hashed_password}) + "\n"
+            for login, hashed_password in rows
+        )
+    buffer: StringIO = StringIO()
+    csv_writer(buffer, lineterminator="\n").writerows(rows)
+    return buffer.getvalue()
+
+
+async def export_users(
+    session_factory: async_sessionmaker[AsyncSession],
+    file_format: str,
+    batch_size: int = BULK_BATCH_SIZE,
+) -> AsyncIterator[bytes]:
+    """Stream every user as CSV or NDJSON, `batch_size` rows per chunk.
+    Server side cursor keeps memory flat for any table size.
+    """
+    if file_format not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported format: {file_format}")
+    if file_format == "csv":
+        yield b"login,hashed_password\n"
+    async with session_factory() as session:
+        result = await session.stream(
+            select(Users.login, Users.hashed_password)
+            .order_by(Users.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async for partition in result.partitions():
+            yield format_rows(partition, file_format).encode()
+
+
+bulk_executor: BulkExecutor = BulkExecutor()
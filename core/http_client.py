@@ -0,0 +1,191 @@
+
+"""Shared outbound HTTP client for service-to-service calls (webhooks,
+upstream identity providers).
+
+One aiohttp session per process, opened by the app lifespan: connections are
+kept alive and reused, instead of a new connector, DNS lookup and handshake
+per call. aiohttp is imported when the client starts, not at app import.
+"""
+
+## Built-in modules: ##
+from typing import Any, Optional
+from asyncio import sleep
+from dataclasses import dataclass
+from json import loads
+from random import uniform
+from time import perf_counter
+from urllib.parse import urlsplit
+
+## Local modules: ##
+from config import (
+    HTTP_CLIENT_MAX_CONNECTIONS,
+    HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST,
+    HTTP_CLIENT_CONNECT_TIMEOUT,
+    HTTP_CLIENT_TIMEOUT,
+    HTTP_CLIENT_KEEPALIVE_TIMEOUT,
+    HTTP_CLIENT_RETRIES,
+    HTTP_CLIENT_BACKOFF,
+    HTTP_CLIENT_METRIC_HOSTS,
+)
+from core.metrics import Counter, Histogram, registry
+
+RETRY_STATUSES: frozenset[int] = frozenset({502, 503, 504})
+IDEMPOTENT_METHODS: frozenset[str] = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class OutboundRequestError(Exception):
+    """Outbound call failed on every attempt (connection error or timeout)."""
+
+
+@dataclass(frozen=True, slots=True)
+class OutboundResponse:
+    """Fully read response, the connection is already back in the pool."""
+    status: int
+    headers: dict[str, str]
+    body: bytes
+
+    def json(self) -> Any:
+        return loads(self.body)
+
+
+class OutboundHTTPClient(object):
+    """Pooled keep-alive HTTP client with timeouts, retries and metrics.
+
+    Idempotent methods are retried on connection errors, timeouts and
+    502/503/504 answers, with full-jitter exponential backoff, so callers
+    of a failing upstream do not retry in lockstep.
+    """
+    def __init__(
+        self,
+        max_connections: int = HTTP_CLIENT_MAX_CONNECTIONS,
+        max_connections_per_host: int = HTTP_CLIENT_MAX_CONNECTIONS_PER_HOST,
+        connect_timeout: float = HTTP_CLIENT_CONNECT_TIMEOUT,
+        timeout: float = HTTP_CLIENT_TIMEOUT,
+        keepalive_timeout: float = HTTP_CLIENT_KEEPALIVE_TIMEOUT,
+        retries: int = HTTP_CLIENT_RETRIES,
+        backoff: float = HTTP_CLIENT_BACKOFF,
+        metric_hosts: frozenset[str] = HTTP_CLIENT_METRIC_HOSTS,
+    ) -> None:
+        """
+        Args:
+            max_connections (int): Open connections limit of all hosts.
+            max_connections_per_host (int): Open connections limit per host.
+            connect_timeout (float): Seconds to get a connection.
+            timeout (float): Seconds for the whole call, body included.
+            keepalive_timeout (float): Seconds an idle connection is kept.
+            retries (int): Extra attempts of retryable calls.
+            backoff (float): Backoff base in seconds, doubled per attempt.
+            metric_hosts (frozenset[str]): Hosts with their own latency series,
+                bounded so callers passing arbitrary URLs do not grow the label set.
+        """
+        self.max_connections: int = max_connections
+        self.max_connections_per_host: int = max_connections_per_host
+        self.connect_timeout: float = connect_timeout
+        self.timeout: float = timeout
+        self.keepalive_timeout: float = keepalive_timeout
+        self.retries: int = retries
+        self.backoff: float = backoff
+        self.metric_hosts: frozenset[str] = metric_hosts
+        self._session: Optional[Any] = None
+        self._latency: dict[str, Histogram] = {}
+
+        self.retried: Counter = registry.counter(
+            "http_client_retries_total", "Outbound HTTP attempts retried."
+        )
+        self.failed: Counter = registry.counter(
+            "http_client_failures_total", "Outbound HTTP calls failed after every attempt."
+        )
+
+    async def start(self) -> None:
+        """Open the pooled session. Called from app lifespan."""
+        if self._session is not None:
+            return
+        from aiohttp import ClientSession, ClientTimeout, TCPConnector
+
+        self._session = ClientSession(
+            connector=TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300,
+            ),
+            timeout=ClientTimeout(total=self.timeout, connect=self.connect_timeout),
+        )
+
+    async def stop(self) -> None:
+        """Close pooled connections. Called from app lifespan."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _host_latency(self, host: str) -> Histogram:
+        if host not in self.metric_hosts:
+            host = "other"
+        histogram: Optional[Histogram] = self._latency.get(host)
+        if histogram is None:
+            histogram = registry.histogram(
+                "http_client_request_seconds", "Outbound HTTP response time by host.", host=host
+            )
+            self._latency[host] = histogram
+        return histogram
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        retry: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> OutboundResponse:
+        """Send the request and read the whole response.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Absolute URL.
+            retry (Optional[bool]): Retry the call, default only for idempotent methods.
+            **kwargs: aiohttp request options (json, data, headers, params...).
+
+        Raises:
+            OutboundRequestError: If every attempt failed to get a response.
+
+        Returns:
+            OutboundResponse: Last response, may be a 502/503/504 after the last retry.
+        """
+        from aiohttp import ClientError
+
+        if self._session is None:
+            await self.start()
+        method = method.upper()
+        if retry is None:
+            retry = method in IDEMPOTENT_METHODS
+        attempts: int = 1 + (self.retries if retry else 0)
+        latency: Histogram = self._host_latency(urlsplit(url).netloc)
+
+        for attempt in range(attempts):
+            started_at: float = perf_counter()
+            try:
+                async with self._session.request(method, url, **kwargs) as response:
+                    result: OutboundResponse = OutboundResponse(
+                        status=response.status,
+                        headers=dict(response.headers),
+                        body=await response.read(),
+                    )
+            except (ClientError, TimeoutError) as error:
+                latency.observe(perf_counter() - started_at)
+                if attempt + 1 == attempts:
+                    self.failed.inc()
+                    raise OutboundRequestError(f"{method} {url} failed: {error!r}") from error
+            else:
+                latency.observe(perf_counter() - started_at)
+                if result.status not in RETRY_STATUSES or attempt + 1 == attempts:
+                    return result
+            self.retried.inc()
+            await sleep(uniform(0, self.backoff * 2 ** attempt))
+
+    async def get(self, url: str, **kwargs: Any) -> OutboundResponse:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> OutboundResponse:
+        return await self.request("POST", url, **kwargs)
+
+
+http_client: OutboundHTTPClient = OutboundHTTPClient()
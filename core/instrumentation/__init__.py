@@ -0,0 +1,7 @@
+__all__ = [
+    "MetricsMiddleware",
+    "metrics_router",
+]
+
+from .middleware import MetricsMiddleware
+from .views import metrics_router
@@ -0,0 +1,58 @@
+
+## Local modules: ##
+from core.metrics import Gauge, registry
+from core.api_v1.token_auth.hashing import hashing_engine
+from core.async_database.db_engine import (
+    current_engine,
+    pool_checkout_wait,
+    pool_saturated,
+    pool_timed_out,
+    replica_router,
+)
+
+
+pool_checked_out: Gauge = registry.gauge(
+    "db_pool_checked_out", "Connections in use by the primary pool."
+)
+pool_overflow: Gauge = registry.gauge(
+    "db_pool_overflow", "Overflow connections open in the primary pool."
+)
+healthy_replicas: Gauge = registry.gauge(
+    "db_replicas_healthy", "Read replicas currently accepting reads."
+)
+
+
+def collect_database() -> None:
+    engine = current_engine()
+    if engine is None:
+        return
+    pool = engine.sync_engine.pool
+    pool_checked_out.set(pool.checkedout())
+    pool_overflow.set(max(pool.overflow(), 0))
+    healthy_replicas.set(sum(replica.healthy for replica in replica_router.replicas))
+    for replica in replica_router.replicas:
+        replica_pool = replica.engine.sync_engine.pool
+        host: str = replica_pool._orig_logging_name or replica.engine.url.host
+        registry.gauge(
+            pool_checked_out.name, "Connections in use by the pool.", replica=host
+        ).set(replica_pool.checkedout())
+        registry.gauge(
+            pool_overflow.name, "Overflow connections open in the pool.", replica=host
+        ).set(max(replica_pool.overflow(), 0))
+
+
+def register_service_metrics() -> None:
+    """Export metrics owned by the hashing engine and the database layer."""
+    registry.register(
+        hashing_engine.queue_depth,
+        hashing_engine.in_flight,
+        hashing_engine.rejected,
+        hashing_engine.timed_out,
+        hashing_engine.queue_wait,
+        hashing_engine.latency,
+        pool_checkout_wait,
+        pool_saturated,
+        pool_timed_out,
+        replica_router.replica_failures,
+    )
+    registry.add_collector(collect_database)
@@ -0,0 +1,80 @@
+
+## Built-in modules: ##
+from time import perf_counter
+from typing import Any, Optional
+
+## Third-party modules: ##
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+## Local modules: ##
+from core.metrics import Counter, Gauge, Histogram, MetricsRegistry, registry
+
+UNMATCHED_ROUTE: str = "unmatched"
+
+
+class MetricsMiddleware(object):
+    """ASGI middleware recording per-route latency, responses by status
+    and in-flight requests.
+
+    Routes are labelled by their path template, so path parameters and
+    unknown URLs do not create new series.
+    """
+    def __init__(self, app: ASGIApp, metrics_registry: MetricsRegistry = registry) -> None:
+        self.app: ASGIApp = app
+        self.registry: MetricsRegistry = metrics_registry
+        self.in_flight: Gauge = metrics_registry.gauge(
+            "http_requests_in_flight", "HTTP requests being processed."
+        )
+        self._latency: dict[tuple[str, str], Histogram] = {}
+        self._responses: dict[tuple[str, str, int], Counter] = {}
+
+    def _observe(self, method: str, route: str, status_code: int, elapsed: float) -> None:
+        histogram: Optional[Histogram] = self._latency.get((method, route))
+        if histogram is None:
+            histogram = self.registry.histogram(
+                "http_request_duration_seconds",
+                "HTTP request latency by route.",
+                method=method,
+                route=route,
+            )
+            self._latency[(method, route)] = histogram
+        histogram.observe(elapsed)
+
+        counter: Optional[Counter] = self._responses.get((method, route, status_code))
+        if counter is None:
+            counter = self.registry.counter(
+                "http_responses_total",
+                "HTTP responses by route and status code.",
+                method=method,
+                route=route,
+                status=str(status_code),
+            )
+            self._responses[(method, route, status_code)] = counter
+        counter.inc()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code: int = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self.in_flight.inc()
+        started_at: float = perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.in_flight.dec()
+            route: Any = scope.get("route")
+            self._observe(
+                method=scope["method"],
+                route=getattr(route, "path", UNMATCHED_ROUTE),
+                status_code=status_code,
+                elapsed=perf_counter() - started_at,
+            )
@@ -0,0 +1,54 @@
+## Built-in modules: ##
+from typing import Optional
+from hmac import compare_digest
+
+## Third-party modules: ##
+from fastapi import APIRouter, Depends, Header, Response, status
+from fastapi.exceptions import HTTPException
+
+## Local modules: ##
+from config import METRICS_API_TOKEN
+from core.metrics import registry
+from core.instrumentation.collectors import register_service_metrics
+
+
+def require_metrics_token(authorization: Optional[str] = Header(None)) -> None:
+    """Allow the scrape only with `Authorization: Bearer <METRICS_API_TOKEN>`.
+    The endpoint is disabled when METRICS_API_TOKEN is not configured.
+
+    Raises:
+        HTTPException: 404 if metrics are disabled, 403 if token is wrong.
+    """
+    if not METRICS_API_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    _, _, token = (authorization or "").partition(" ")
+    if not token or not compare_digest(token.encode(), METRICS_API_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid metrics token.",
+        )
+
+
+metrics_router: APIRouter = APIRouter(
+    tags=["Metrics"],
+    dependencies=[Depends(require_metrics_token)],
+)
+register_service_metrics()
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Metrics in Prometheus text exposition format.
+
+    Values are those of the worker process answering the scrape: with
+    several workers (serve.py) each one keeps its own counters and
+    histograms. Scrape every worker directly, or run one worker per
+    container and let Prometheus sum over instances.
+
+    Returns:
+        Response: Every registered metric of this worker.
+    """
+    return Response(
+        content=registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -0,0 +1,232 @@
+
+## Built-in modules: ##
+from bisect import bisect_left
+from functools import wraps
+from inspect import iscoroutinefunction
+from time import perf_counter
+from typing import Any, Callable, Iterator, Optional
+
+DEFAULT_LATENCY_BUCKETS: tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def format_labels(labels: dict[str, str]) -> str:
+    """Prometheus label set, empty string without labels."""
+    if not labels:
+        return ""
+    pairs: str = ",".join(
+        '{}="{}"'.format(
+            key,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for key, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+class Counter(object):
+    """Monotonic counter."""
+    __slots__ = ("name", "description", "labels", "value")
+    kind: str = "counter"
+
+    def __init__(self, name: str, description: str = "", labels: Optional[dict[str, str]] = None) -> None:
+        self.name: str = name
+        self.description: str = description
+        self.labels: dict[str, str] = labels or {}
+        self.value: float = 0
+
+    def inc(self, amount: float = 1) -> None:
+        """Increase counter by the given amount."""
+        self.value += amount
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        yield self.name, format_labels(self.labels), self.value
+
+
+class Gauge(object):
+    """Value that can go up and down (queue depth, in-flight requests)."""
+    __slots__ = ("name", "description", "labels", "value")
+    kind: str = "gauge"
+
+    def __init__(self, name: str, description: str = "", labels: Optional[dict[str, str]] = None) -> None:
+        self.name: str = name
+        self.description: str = description
+        self.labels: dict[str, str] = labels or {}
+        self.value: float = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        yield self.name, format_labels(self.labels), self.value
+
+
+class Histogram(object):
+    """Histogram with fixed upper bounds, cumulative only on export."""
+    __slots__ = ("name", "description", "labels", "buckets", "counts", "sum", "count")
+    kind: str = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str = "",
+        buckets: Optional[tuple[float, ...]] = DEFAULT_LATENCY_BUCKETS,
+        labels: Optional[dict[str, str]] = None,
+    ) -> None:
+        self.name: str = name
+        self.description: str = description
+        self.labels: dict[str, str] = labels or {}
+        self.buckets: tuple[float, ...] = tuple(sorted(buckets))
+        ## Last slot is the +Inf bucket.
+        self.counts: list[int] = [0] * (len(self.buckets) + 1)
+        self.sum: float = 0.0
+        self.count: int = 0
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate quantile as the upper bound of the bucket holding it.
+
+        Args:
+            q (float): Quantile in the [0, 1] range.
+
+        Returns:
+            float: Bucket upper bound, inf when quantile is in the last bucket.
+        """
+        if not self.count:
+            return 0.0
+        rank: float = q * self.count
+        seen: int = 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self) -> dict[str, float]:
+        """Summary of the histogram for debug output."""
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        cumulative: int = 0
+        for bound, bucket_count in zip((*self.buckets, float("inf")), self.counts):
+            cumulative += bucket_count
+            le: str = "+Inf" if bound == float("inf") else repr(bound)
+            yield f"{self.name}_bucket", format_labels({**self.labels, "le": le}), cumulative
+        labels: str = format_labels(self.labels)
+        yield f"{self.name}_sum", labels, self.sum
+        yield f"{self.name}_count", labels, self.count
+
+
+Metric = Counter | Gauge | Histogram
+
+
+class MetricsRegistry(object):
+    """Metrics exported in Prometheus text format.
+
+    Metrics are plain attribute updates without locks, so they are cheap
+    enough for the hot path. Collectors run only on export, to refresh
+    gauges read from other objects (pool usage, cache sizes).
+    """
+    def __init__(self) -> None:
+        self._metrics: dict[tuple[str, tuple[tuple[str, str], ...]], Metric] = {}
+        self._collectors: list[Callable[[], None]] = []
+
+    def register(self, *metrics: Metric) -> None:
+        """Export already created metrics."""
+        for metric in metrics:
+            self._metrics[(metric.name, tuple(metric.labels.items()))] = metric
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Call the function before every export."""
+        self._collectors.append(collector)
+
+    def _get_or_create(self, metric_class: type, name: str, description: str, labels: dict[str, str]) -> Any:
+        key: tuple[str, tuple[tuple[str, str], ...]] = (name, tuple(labels.items()))
+        metric: Optional[Metric] = self._metrics.get(key)
+        if metric is None:
+            metric = metric_class(name, description, labels=labels)
+            self._metrics[key] = metric
+        return metric
+
+    def counter(self, name: str, description: str = "", **labels: str) -> Counter:
+        return self._get_or_create(Counter, name, description, labels)
+
+    def gauge(self, name: str, description: str = "", **labels: str) -> Gauge:
+        return self._get_or_create(Gauge, name, description, labels)
+
+    def histogram(self, name: str, description: str = "", **labels: str) -> Histogram:
+        return self._get_or_create(Histogram, name, description, labels)
+
+    def render(self) -> str:
+        """All metrics in Prometheus text exposition format."""
+        for collector in self._collectors:
+            collector()
+        families: dict[str, list[Metric]] = {}
+        for metric in self._metrics.values():
+            families.setdefault(metric.name, []).append(metric)
+
+        lines: list[str] = []
+        for name, metrics in families.items():
+            lines.append(f"# HELP {name} {metrics[0].description}")
+            lines.append(f"# TYPE {name} {metrics[0].kind}")
+            for metric in metrics:
+                for sample_name, labels, value in metric.samples():
+                    lines.append(f"{sample_name}{labels} {value}")
+        lines.append("")
+        return "\n".join(lines)
+
+
+registry: MetricsRegistry = MetricsRegistry()
+
+
+def timed(name: str, description: str = "", **labels: str) -> Callable:
+    """Decorator recording call duration of a function or coroutine function
+    into a histogram of the default registry.
+
+    Args:
+        name (str): Histogram name, shared by functions told apart by labels.
+        description (str): Histogram help text.
+        **labels (str): Labels of this function histogram.
+    """
+    histogram: Histogram = registry.histogram(name, description, **labels)
+
+    def decorator(function: Callable) -> Callable:
+        if iscoroutinefunction(function):
+            @wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                started_at: float = perf_counter()
+                try:
+                    return await function(*args, **kwargs)
+                finally:
+                    histogram.observe(perf_counter() - started_at)
+            return async_wrapper
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            started_at: float = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                histogram.observe(perf_counter() - started_at)
+        return wrapper
+
+    return decorator
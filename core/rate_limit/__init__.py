@@ -0,0 +1,31 @@
+__all__ = [
+    "RateLimit",
+    "RateLimitBackend",
+    "InMemoryBackend",
+    "KeyValueStore",
+    "InMemoryKeyValueStore",
+    "SharedStoreBackend",
+    "CredentialRateLimiter",
+    "IntrospectionRateLimiter",
+    "RateLimitExceeded",
+    "credential_rate_limiter",
+    "introspection_rate_limiter",
+    "retry_after_header",
+]
+
+from .backends import (
+    RateLimit,
+    RateLimitBackend,
+    InMemoryBackend,
+    KeyValueStore,
+    InMemoryKeyValueStore,
+    SharedStoreBackend,
+    retry_after_header
+)
+from .limiter import (
+    CredentialRateLimiter,
+    IntrospectionRateLimiter,
+    RateLimitExceeded,
+    credential_rate_limiter,
+    introspection_rate_limiter
+)
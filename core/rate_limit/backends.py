@@ -0,0 +1,163 @@
+
+## Built-in modules: ##
+from typing import Optional, Protocol
+from collections import OrderedDict
+from dataclasses import dataclass
+from math import ceil
+from time import monotonic, time
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimit:
+    """`limit` requests per `period` seconds, `limit` is also the burst size."""
+    limit: int
+    period: float
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitDecision:
+    allowed: bool
+    retry_after: float = 0.0
+
+
+ALLOWED: RateLimitDecision = RateLimitDecision(allowed=True)
+
+
+class RateLimitBackend(object):
+    """Counter storage of the rate limiter."""
+    async def hit(self, key: str, rate_limit: RateLimit) -> RateLimitDecision:
+        """Count one request of the key against the limit.
+
+        Args:
+            key (str): Limited subject (login, ip, global).
+            rate_limit (RateLimit): Limit of the subject.
+
+        Returns:
+            RateLimitDecision: Whether request is allowed, and when to retry if not.
+        """
+        raise NotImplementedError
+
+    async def peek(self, key: str, rate_limit: RateLimit) -> RateLimitDecision:
+        """Same decision as `hit` would make, without counting the request."""
+        raise NotImplementedError
+
+
+class InMemoryBackend(RateLimitBackend):
+    """Per-process token buckets, LRU evicted above `max_keys`.
+
+    Evicting a bucket forgets its debt, which only matters for keys idle long
+    enough to fall out of the LRU, by then mostly refilled anyway.
+    """
+    def __init__(self, max_keys: int) -> None:
+        self.max_keys: int = max_keys
+        ## key -> [tokens left, last refill time]
+        self._buckets: OrderedDict[str, list[float]] = OrderedDict()
+
+    async def hit(self, key: str, rate_limit: RateLimit) -> RateLimitDecision:
+        now: float = monotonic()
+        refill_rate: float = rate_limit.limit / rate_limit.period
+        bucket: Optional[list[float]] = self._buckets.get(key)
+        if bucket is None:
+            bucket = [float(rate_limit.limit), now]
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(rate_limit.limit, bucket[0] + (now - bucket[1]) * refill_rate)
+            bucket[1] = now
+
+        if bucket[0] < 1:
+            return RateLimitDecision(allowed=False, retry_after=(1 - bucket[0]) / refill_rate)
+        bucket[0] -= 1
+        return ALLOWED
+
+    async def peek(self, key: str, rate_limit: RateLimit) -> RateLimitDecision:
+        bucket: Optional[list[float]] = self._buckets.get(key)
+        if bucket is None:
+            return ALLOWED
+        refill_rate: float = rate_limit.limit / rate_limit.period
+        tokens: float = min(rate_limit.limit, bucket[0] + (monotonic() - bucket[1]) * refill_rate)
+        if tokens < 1:
+            return RateLimitDecision(allowed=False, retry_after=(1 - tokens) / refill_rate)
+        return ALLOWED
+
+
+class KeyValueStore(Protocol):
+    """Minimal shared store interface (Redis INCR + EXPIRE semantics)."""
+    async def incr(self, key: str, ttl: float) -> int:
+        """Increase counter by one, set its ttl when created. Returns new value."""
+        ...
+
+    async def get(self, key: str) -> int:
+        """Counter value, 0 if missing."""
+        ...
+
+
+class InMemoryKeyValueStore(object):
+    """Local stand-in for a shared store, for tests and single node runs.
+    Holds at most `max_keys` counters, least recently used ones are evicted.
+    """
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self.max_keys: int = max_keys
+        self._values: OrderedDict[str, tuple[int, float]] = OrderedDict()
+
+    async def incr(self, key: str, ttl: float) -> int:
+        now: float = monotonic()
+        value, expires_at = self._values.get(key, (0, now + ttl))
+        if expires_at <= now:
+            value, expires_at = 0, now + ttl
+        self._values[key] = (value + 1, expires_at)
+        self._values.move_to_end(key)
+        if len(self._values) > self.max_keys:
+            self._values.popitem(last=False)
+        return value + 1
+
+    async def get(self, key: str) -> int:
+        value, expires_at = self._values.get(key, (0, 0.0))
+        return value if expires_at > monotonic() else 0
+
+
+class SharedStoreBackend(RateLimitBackend):
+    """Sliding window counter on a shared store, limits hold across nodes.
+
+    Uses two fixed window counters per key and weights the previous one by
+    its overlap with the sliding window: two store calls per request.
+    """
+    def __init__(self, store: KeyValueStore, prefix: str = "rate_limit") -> None:
+        self.store: KeyValueStore = store
+        self.prefix: str = prefix
+
+    async def hit(self, key: str, rate_limit: RateLimit) -> RateLimitDecision:
+        now: float = time()
+        window: int = int(now // rate_limit.period)
+        elapsed: float = now - window * rate_limit.period
+        previous: int = await self.store.get(f"{self.prefix}:{key}:{window - 1}")
+        current: int = await self.store.incr(
+            f"{self.prefix}:{key}:{window}",
+            ttl=rate_limit.period * 2,
+        )
+        weighted: float = previous * (1 - elapsed / rate_limit.period) + current
+        if weighted > rate_limit.limit:
+            return RateLimitDecision(
+                allowed=False,
+                retry_after=max(rate_limit.period - elapsed, 0.0),
+            )
+        return ALLOWED
+
+    async def peek(self, key: str, rate_limit: RateLimit) -> RateLimitDecision:
+        now: float = time()
+        window: int = int(now // rate_limit.period)
+        elapsed: float = now - window * rate_limit.period
+        previous: int = await self.store.get(f"{self.prefix}:{key}:{window - 1}")
+        current: int = await self.store.get(f"{self.prefix}:{key}:{window}")
+        if previous * (1 - elapsed / rate_limit.period) + current + 1 > rate_limit.limit:
+            return RateLimitDecision(
+                allowed=False,
+                retry_after=max(rate_limit.period - elapsed, 0.0),
+            )
+        return ALLOWED
+
+
+def retry_after_header(retry_after: float) -> str:
+    return str(max(ceil(retry_after), 1))
@@ -0,0 +1,202 @@
+
+## Built-in modules: ##
+from typing import Optional
+from hashlib import sha256
+
+## Local modules: ##
+from config import (
+    RATE_LIMIT_ENABLED,
+    RATE_LIMIT_BACKEND,
+    RATE_LIMIT_MAX_KEYS,
+    RATE_LIMIT_LOGIN_PER_MINUTE,
+    RATE_LIMIT_IP_PER_MINUTE,
+    RATE_LIMIT_GLOBAL_PER_SECOND,
+    RATE_LIMIT_INTROSPECT_PER_SECOND,
+    RATE_LIMIT_INTROSPECT_GLOBAL_PER_SECOND,
+)
+from core.rate_limit.backends import (
+    RateLimit,
+    RateLimitBackend,
+    RateLimitDecision,
+    InMemoryBackend,
+    KeyValueStore,
+    SharedStoreBackend,
+)
+
+
+class RateLimitExceeded(Exception):
+    """Request rejected by the rate limiter. Answered with 429."""
+    def __init__(self, retry_after: float) -> None:
+        super().__init__("Too many requests.")
+        self.retry_after: float = retry_after
+
+
+async def check_limits(backend: RateLimitBackend, checks: list[tuple[str, RateLimit]]) -> None:
+    """Count the request against every (key, limit), only if all of them allow it.
+
+    Raises:
+        RateLimitExceeded: If any limit is exhausted.
+    """
+    rejected: list[RateLimitDecision] = [
+        decision for decision in [
+            await backend.peek(key, rate_limit) for key, rate_limit in checks
+        ]
+        if not decision.allowed
+    ]
+    if rejected:
+        raise RateLimitExceeded(retry_after=max(decision.retry_after for decision in rejected))
+    for key, rate_limit in checks:
+        decision: RateLimitDecision = await backend.hit(key, rate_limit)
+        if not decision.allowed:
+            ## Concurrent requests took the last tokens since the peek.
+            raise RateLimitExceeded(retry_after=decision.retry_after)
+
+
+class CredentialRateLimiter(object):
+    """Global, per client IP and per login limits of credential endpoints.
+
+    Routers call `check` before any password hashing or database work.
+    A request is counted only if every limit allows it, so requests
+    rejected for one login do not use up the IP and global budgets.
+    """
+    def __init__(
+        self,
+        backend: Optional[RateLimitBackend],
+        per_login: RateLimit,
+        per_ip: RateLimit,
+        global_limit: RateLimit,
+        enabled: bool = True,
+    ) -> None:
+        self.backend: Optional[RateLimitBackend] = backend
+        self.per_login: RateLimit = per_login
+        self.per_ip: RateLimit = per_ip
+        self.global_limit: RateLimit = global_limit
+        self.enabled: bool = enabled
+
+    def use_store(self, store: KeyValueStore) -> None:
+        """Count on the shared store, needed before start with RATE_LIMIT_BACKEND=shared."""
+        self.backend = build_backend("shared", store=store)
+
+    async def start(self) -> None:
+        """Fail app startup if limits are enabled without a backend. Called from app lifespan."""
+        if self.enabled and self.backend is None:
+            raise RuntimeError(
+                "RATE_LIMIT_BACKEND=shared needs a shared store, "
+                "call credential_rate_limiter.use_store(store) before startup."
+            )
+
+    async def check(self, client_ip: Optional[str], login: Optional[str] = None) -> None:
+        """Count the request against every limit.
+
+        Args:
+            client_ip (Optional[str]): Client address, None if unknown.
+            login (Optional[str]): Login the request is about, None if no credentials.
+
+        Raises:
+            RateLimitExceeded: If any limit is exhausted.
+        """
+        if not self.enabled:
+            return
+        checks: list[tuple[str, RateLimit]] = [("global", self.global_limit)]
+        if client_ip:
+            checks.append((f"ip:{client_ip}", self.per_ip))
+        if login:
+            checks.append((f"login:{login.lower()}", self.per_login))
+        await check_limits(self.backend, checks)
+
+
+class IntrospectionRateLimiter(object):
+    """Global and per caller limits of token introspection.
+
+    Downstream services call introspection for every request they serve,
+    so it has its own budgets: a busy service can not use up the global
+    and per IP limits that protect login, and logins can not starve it.
+    Callers are told apart by their service token (hashed, the token is
+    never used as a key), or by client IP without one.
+    """
+    def __init__(
+        self,
+        backend: Optional[RateLimitBackend],
+        per_caller: RateLimit,
+        global_limit: RateLimit,
+        enabled: bool = True,
+    ) -> None:
+        self.backend: Optional[RateLimitBackend] = backend
+        self.per_caller: RateLimit = per_caller
+        self.global_limit: RateLimit = global_limit
+        self.enabled: bool = enabled
+
+    def use_store(self, store: KeyValueStore) -> None:
+        """Count on the shared store, needed before start with RATE_LIMIT_BACKEND=shared."""
+        self.backend = build_backend("shared", store=store)
+
+    async def start(self) -> None:
+        """Fail app startup if limits are enabled without a backend. Called from app lifespan."""
+        if self.enabled and self.backend is None:
+            raise RuntimeError(
+                "RATE_LIMIT_BACKEND=shared needs a shared store, "
+                "call introspection_rate_limiter.use_store(store) before startup."
+            )
+
+    async def check(self, service_token: Optional[str], client_ip: Optional[str]) -> None:
+        """Count the request against the global and the caller limits.
+
+        Args:
+            service_token (Optional[str]): Service token of the caller.
+            client_ip (Optional[str]): Client address, used without service token.
+
+        Raises:
+            RateLimitExceeded: If any limit is exhausted.
+        """
+        if not self.enabled:
+            return
+        ## Keys are prefixed, a shared store may also hold the credential limits.
+        checks: list[tuple[str, RateLimit]] = [("introspect:global", self.global_limit)]
+        if service_token:
+            caller: str = "token:" + sha256(service_token.encode()).hexdigest()[:32]
+            checks.append((f"introspect:{caller}", self.per_caller))
+        elif client_ip:
+            checks.append((f"introspect:ip:{client_ip}", self.per_caller))
+        await check_limits(self.backend, checks)
+
+
+def build_backend(
+    name: str = RATE_LIMIT_BACKEND,
+    store: Optional[KeyValueStore] = None,
+) -> RateLimitBackend:
+    """Configured backend: "memory" (per process) or "shared" (shared store).
+
+    Args:
+        name (str): Backend name.
+        store (Optional[KeyValueStore]): Shared store (Redis client adapter...) of "shared".
+
+    Raises:
+        ValueError: If the backend is unknown, or "shared" is used without a store,
+            a per-process store would silently not share the limits.
+    """
+    if name == "memory":
+        return InMemoryBackend(max_keys=RATE_LIMIT_MAX_KEYS)
+    if name == "shared":
+        if store is None:
+            raise ValueError(
+                "RATE_LIMIT_BACKEND=shared needs a shared KeyValueStore, "
+                "build the limiter with build_backend(\"shared\", store=...)."
+            )
+        return SharedStoreBackend(store=store)
+    raise ValueError(f"Unknown rate limit backend: {name}")
+
+
+credential_rate_limiter: CredentialRateLimiter = CredentialRateLimiter(
+    ## Shared store is plugged in with use_store, startup fails without it.
+    backend=None if RATE_LIMIT_BACKEND == "shared" else build_backend(),
+    per_login=RateLimit(limit=RATE_LIMIT_LOGIN_PER_MINUTE, period=60),
+    per_ip=RateLimit(limit=RATE_LIMIT_IP_PER_MINUTE, period=60),
+    global_limit=RateLimit(limit=RATE_LIMIT_GLOBAL_PER_SECOND, period=1),
+    enabled=RATE_LIMIT_ENABLED,
+)
+introspection_rate_limiter: IntrospectionRateLimiter = IntrospectionRateLimiter(
+    backend=None if RATE_LIMIT_BACKEND == "shared" else build_backend(),
+    per_caller=RateLimit(limit=RATE_LIMIT_INTROSPECT_PER_SECOND, period=1),
+    global_limit=RateLimit(limit=RATE_LIMIT_INTROSPECT_GLOBAL_PER_SECOND, period=1),
+    enabled=RATE_LIMIT_ENABLED,
+)
@@ -0,0 +1,5 @@
+__all__ = [
+    "BloomFilter",
+]
+
+from .bloom import BloomFilter
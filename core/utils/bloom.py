@@ -0,0 +1,69 @@
+
+## Built-in modules: ##
+from typing import Hashable
+from math import ceil, log
+
+HASH_MASK: int = (1 << 64) - 1
+
+
+def optimal_parameters(capacity: int, error_rate: float) -> tuple[int, int]:
+    """Bit count and hash count for the capacity and false positive rate.
+
+    Args:
+        capacity (int): Expected number of items.
+        error_rate (float): Wanted false positive rate.
+
+    Returns:
+        tuple[int, int]: (bits, hashes)
+    """
+    bits: int = max(ceil(-capacity * log(error_rate) / (log(2) ** 2)), 64)
+    hashes: int = max(round(bits / capacity * log(2)), 1)
+    return bits, hashes
+
+
+class BloomFilter(object):
+    """Bit array Bloom filter over Python hash() of the items.
+
+    hash() of str is cached on the object and randomized per process, so
+    the filter is cheap to query but must be built in the process using it.
+    """
+    __slots__ = ("capacity", "error_rate", "bits", "hashes", "count", "_array")
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        """
+        Args:
+            capacity (int): Expected number of items.
+            error_rate (float): False positive rate at full capacity.
+        """
+        self.capacity: int = max(capacity, 1)
+        self.error_rate: float = error_rate
+        self.bits, self.hashes = optimal_parameters(self.capacity, error_rate)
+        self.count: int = 0
+        self._array: bytearray = bytearray((self.bits + 7) // 8)
+
+    def _positions(self, item: Hashable):
+        item_hash: int = hash(item) & HASH_MASK
+        first: int = item_hash & 0xFFFFFFFF
+        step: int = (item_hash >> 32) | 1
+        bits: int = self.bits
+        for index in range(self.hashes):
+            yield (first + index * step) % bits
+
+    def add(self, item: Hashable) -> None:
+        array: bytearray = self._array
+        for position in self._positions(item):
+            array[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: Hashable) -> bool:
+        array: bytearray = self._array
+        for position in self._positions(item):
+            if not array[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    @property
+    def saturated(self) -> bool:
+        """True when more items were added than the filter was sized for."""
+        return self.count > self.capacity
+
@@ -0,0 +1,5 @@
+__all__ = [
+    "well_known_router"
+]
+
+from .views import well_known_router
@@ -0,0 +1,39 @@
+
+## Third-party modules: ##
+from fastapi import APIRouter, Request, Response
+from fastapi import status
+
+## Local modules: ##
+from config import JWKS_MAX_AGE
+from core.api_v1.token_auth.keyring import key_ring
+
+
+well_known_router: APIRouter = APIRouter(
+    prefix="/.well-known",
+    tags=["Well-known"]
+)
+
+
+@well_known_router.get("/jwks.json")
+async def jwks(request: Request) -> Response:
+    """Public signing keys, so other services verify tokens locally.
+
+    Args:
+        request (Request): Request, for the If-None-Match header.
+
+    Returns:
+        Response: JWKS document, or 304 if client copy is current.
+    """
+    ## Retired keys leave the document once their grace period is over.
+    key_ring.prune()
+    headers: dict[str, str] = {
+        "ETag": key_ring.etag,
+        "Cache-Control": f"public, max-age={JWKS_MAX_AGE}",
+    }
+    if request.headers.get("if-none-match") == key_ring.etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(
+        content=key_ring.jwks,
+        media_type="application/json",
+        headers=headers,
+    )
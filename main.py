@@ -1,25 +1,72 @@
 
 ## Built-in modules: ##
+from typing import AsyncIterator
+from contextlib import asynccontextmanager
 
 ## Third-party modules: ##
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from uvicorn import run
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 ## Local modules: ##
-from config import APP_VERSION, CORSMiddleWareSettings
+from config import APP_VERSION, DEBUG, CORSMiddleWareSettings
 from core.api_v1.sign_up import registration_router
-from core.api_v1.token_auth import token_auth_router
+from core.api_v1.token_auth import token_auth_router, hashing_engine, hasher_registry, HashingEngineError
+from core.api_v1.token_auth.keyring import key_ring
+from core.api_v1.token_auth.revocation import revocation_store
+from core.api_v1.token_auth.refresh import refresh_token_pruner
+from core.async_database.db_engine import dispose_engines, warmup_pool
 from core.api_v1.sign_in import authorization_router
+from core.api_v1.admin import admin_router
+from core.bulk import bulk_executor
+from core.well_known import well_known_router
+from core.rate_limit import (
+    RateLimitExceeded,
+    credential_rate_limiter,
+    introspection_rate_limiter,
+    retry_after_header,
+)
+from core.instrumentation import MetricsMiddleware, metrics_router
+from core.http_client import http_client
+from core.async_database.audit import audit_log
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Application startup and shutdown hooks."""
+    ## Configuration errors (missing key file, unknown hash scheme) fail startup.
+    key_ring.load()
+    hasher_registry.configure()
+    await credential_rate_limiter.start()
+    await introspection_rate_limiter.start()
+    await warmup_pool()
+    await revocation_store.start()
+    await refresh_token_pruner.start()
+    await http_client.start()
+    await audit_log.start()
+    bulk_executor.start()
+    yield
+    await bulk_executor.stop()
+    await audit_log.stop()
+    await http_client.stop()
+    await refresh_token_pruner.stop()
+    await revocation_store.stop()
+    await hashing_engine.shutdown()
+    await dispose_engines()
 
 
 app: FastAPI = FastAPI(
     version=APP_VERSION,
-    debug=True,
+    debug=DEBUG,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 app.include_router(registration_router)
 app.include_router(token_auth_router)
 app.include_router(authorization_router)
+app.include_router(admin_router)
+app.include_router(well_known_router)
+app.include_router(metrics_router)
 
 
 app.add_middleware(
@@ -29,7 +76,32 @@ app.add_middleware(
     allow_methods=CORSMiddleWareSettings.ALLOWED_METHODS,
     allow_headers=CORSMiddleWareSettings.ALLOWED_HEADERS,
 )
+## Outermost, so the latency includes every other middleware.
+app.add_middleware(MetricsMiddleware)
+
+
+@app.exception_handler(HashingEngineError)
+async def hashing_engine_error_handler(request: Request, error: HashingEngineError) -> JSONResponse:
+    """Shed load with 503 when the password hashing pool is saturated."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(error)},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.exception_handler(RateLimitExceeded)
+async def rate_limit_exceeded_handler(request: Request, error: RateLimitExceeded) -> JSONResponse:
+    """Reject rate limited request with 429 before any hashing or database work."""
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": str(error)},
+        headers={"Retry-After": retry_after_header(error.retry_after)},
+    )
 
 
 if __name__ == "__main__":
+    from uvicorn import run
+
+    ## Development server, use serve.py in production.
     run("main:app", reload=True)
\ No newline at end of file
@@ -0,0 +1,118 @@
+
+"""Production entry point: N workers, preloaded app, graceful drain and recycling.
+
+Usage:
+    python serve.py [--workers N] [--bind-host HOST] [--bind-port PORT] [--forwarded-allow-ips IPS]
+
+With gunicorn installed (eclipce[production]) the app is imported once in
+the master and forked into uvicorn workers; SIGTERM drains in-flight
+requests, SIGHUP reloads workers one by one. Without gunicorn uvicorn's own
+process manager is used (no preloading). uvloop and httptools are used
+when installed.
+"""
+
+## Built-in modules: ##
+from typing import Any
+from argparse import ArgumentParser, Namespace
+
+## Third-party modules: ##
+from uvicorn import run
+
+## Local modules: ##
+from config import (
+    AUTH_MODE,
+    SERVER_BIND_HOST,
+    SERVER_BIND_PORT,
+    SERVER_WORKERS,
+    SERVER_MAX_REQUESTS,
+    SERVER_MAX_REQUESTS_JITTER,
+    SERVER_GRACEFUL_TIMEOUT,
+    SERVER_FORWARDED_ALLOW_IPS,
+)
+
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:
+    BaseApplication = None
+
+
+def post_fork(server: Any, worker: Any) -> None:
+    """Gunicorn hook: each worker gets its own database connections."""
+    from core.async_database.db_engine import dispose_engine_after_fork
+    dispose_engine_after_fork()
+
+
+def check_session_backend(workers: int) -> None:
+    """Sessions in worker memory are unknown to every other worker, refuse to start."""
+    if AUTH_MODE != "session" or workers <= 1:
+        return
+    from main import app
+    from core.api_v1.token_auth.sessions import session_store
+    if not session_store.backend.shared:
+        raise SystemExit(
+            "AUTH_MODE=session with the in-memory session store needs --workers 1, "
+            "or a shared session backend set on session_store.backend."
+        )
+
+
+def serve_with_gunicorn(arguments: Namespace) -> None:
+    class PreloadedApplication(BaseApplication):
+        def __init__(self, options: dict[str, Any]) -> None:
+            self.options: dict[str, Any] = options
+            super().__init__()
+
+        def load_config(self) -> None:
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self) -> Any:
+            from main import app
+            return app
+
+    PreloadedApplication({
+        "bind": f"{arguments.bind_host}:{arguments.bind_port}",
+        "workers": arguments.workers,
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "preload_app": True,
+        "max_requests": arguments.max_requests,
+        "max_requests_jitter": SERVER_MAX_REQUESTS_JITTER,
+        "graceful_timeout": SERVER_GRACEFUL_TIMEOUT,
+        "post_fork": post_fork,
+        ## UvicornWorker passes it on, proxy headers are on by default in uvicorn.
+        "forwarded_allow_ips": arguments.forwarded_allow_ips,
+    }).run()
+
+
+def serve_with_uvicorn(arguments: Namespace) -> None:
+    run(
+        "main:app",
+        host=arguments.bind_host,
+        port=arguments.bind_port,
+        workers=arguments.workers,
+        loop="auto",
+        http="auto",
+        limit_max_requests=arguments.max_requests or None,
+        timeout_graceful_shutdown=SERVER_GRACEFUL_TIMEOUT,
+        proxy_headers=True,
+        forwarded_allow_ips=arguments.forwarded_allow_ips,
+    )
+
+
+def main() -> None:
+    parser: ArgumentParser = ArgumentParser(description="Production server.")
+    parser.add_argument("--workers", type=int, default=SERVER_WORKERS)
+    parser.add_argument("--bind-host", default=SERVER_BIND_HOST)
+    parser.add_argument("--bind-port", type=int, default=SERVER_BIND_PORT)
+    parser.add_argument("--max-requests", type=int, default=SERVER_MAX_REQUESTS)
+    parser.add_argument("--forwarded-allow-ips", default=SERVER_FORWARDED_ALLOW_IPS)
+    arguments: Namespace = parser.parse_args()
+    check_session_backend(arguments.workers)
+
+    if BaseApplication is not None:
+        serve_with_gunicorn(arguments)
+    else:
+        serve_with_uvicorn(arguments)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+
+## Built-in modules: ##
+from os import environ
+from asyncio import run
+from typing import Iterator
+
+## Third-party modules: ##
+import pytest
+
+## Settings read at import time by config, same defaults as benchmarks.
+environ.setdefault("SECRET_KEY", "test-secret-key")
+environ.setdefault("HASH_ALGORITHM", "HS256")
+environ.setdefault("DB_HOST", "127.0.0.1")
+environ.setdefault("DB_PORT", "3306")
+
+
+async def _create_tables(engine) -> None:
+    from core.async_database.db_models import Base
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+
+@pytest.fixture
+def database(tmp_path) -> Iterator:
+    """SQLite database with every table, bound as primary of both session factories.
+
+    NullPool: each test runs its own event loop, pooled aiosqlite
+    connections must not outlive it.
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    from core.async_database import db_engine
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}", poolclass=NullPool)
+    run(_create_tables(engine))
+    db_engine.bind_engine(engine)
+    try:
+        yield engine
+    finally:
+        run(engine.dispose())
+        db_engine._engine = None
+        db_engine.session_factory.configure(bind=None)
+        db_engine.read_session_factory.configure(bind=None)
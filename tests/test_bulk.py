@@ -0,0 +1,35 @@
+
+## Built-in modules: ##
+from asyncio import run
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Optional
+
+## Local modules: ##
+from core.async_database import repository
+from core.async_database.db_engine import session_factory
+from core.async_database.repository import UserRepository
+from core.bulk import UserImporter
+
+HASHED_PASSWORD: str = "$2b$04$" + "a" * 53
+
+
+async def _records(*logins: str) -> AsyncIterator[tuple[int, Any]]:
+    for line, login in enumerate(logins, start=1):
+        yield line, {"login": login, "hashed_password": HASHED_PASSWORD}
+
+
+def test_import_notifies_change_listeners_after_commit(database, monkeypatch):
+    changed: list[Optional[str]] = []
+    monkeypatch.setattr(repository, "_change_listeners", [changed.append])
+
+    async def scenario() -> list:
+        async with session_factory() as session:
+            await UserRepository(session).create(login="taken", hashed_password=HASHED_PASSWORD)
+        changed.clear()
+        with ThreadPoolExecutor(1) as executor:
+            importer: UserImporter = UserImporter(session_factory, executor, batch_size=2)
+            return [conflict async for conflict in importer.run(_records("alice", "taken", "bobby"))]
+
+    conflicts: list = run(scenario())
+    assert [conflict.login for conflict in conflicts] == ["taken"]
+    assert sorted(changed) == ["alice", "bobby"]
@@ -0,0 +1,34 @@
+
+## Built-in modules: ##
+from asyncio import run
+
+## Third-party modules: ##
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+## Local modules: ##
+from core.async_database.db_engine import InstrumentedQueuePool, pool_checkout_wait, pool_instruments
+
+
+def test_replica_pool_records_into_its_own_series(tmp_path):
+    engine: AsyncEngine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_logging_name="replica-1:3306",
+    )
+    replica_wait, _, _ = pool_instruments("replica-1:3306")
+    primary_count: int = pool_checkout_wait.count
+
+    async def scenario() -> None:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+        ## dispose() re-creates the pool, the label must survive it.
+        await engine.dispose()
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+        await engine.dispose()
+
+    run(scenario())
+    assert replica_wait.labels == {"replica": "replica-1:3306"}
+    assert replica_wait.count == 2
+    assert pool_checkout_wait.count == primary_count
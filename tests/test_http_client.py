@@ -0,0 +1,148 @@
+
+## Built-in modules: ##
+from typing import Any, Awaitable, Callable
+from asyncio import run, sleep
+
+## Third-party modules: ##
+import pytest
+from aiohttp import web
+
+## Local modules: ##
+from core import http_client as http_client_module
+from core.http_client import OutboundHTTPClient, OutboundRequestError, OutboundResponse
+
+
+class StubServer(object):
+    """Local aiohttp.web server answering with the given handler, records peers."""
+    def __init__(self, handler: Callable[[web.Request], Awaitable[web.StreamResponse]]) -> None:
+        self.handler: Callable[[web.Request], Awaitable[web.StreamResponse]] = handler
+        self.requests: list[tuple[str, Any]] = []
+        self._runner: web.AppRunner | None = None
+        self.url: str = ""
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        self.requests.append((request.method, request.transport.get_extra_info("peername")))
+        return await self.handler(request)
+
+    async def __aenter__(self) -> "StubServer":
+        app: web.Application = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site: web.TCPSite = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port: int = self._runner.addresses[0][1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        await self._runner.cleanup()
+
+
+def statuses(*codes: int) -> Callable[[web.Request], Awaitable[web.Response]]:
+    """Handler answering the codes in order, the last one from then on."""
+    remaining: list[int] = list(codes)
+
+    async def handler(request: web.Request) -> web.Response:
+        code: int = remaining.pop(0) if len(remaining) > 1 else remaining[0]
+        return web.json_response({"status": code}, status=code)
+    return handler
+
+
+def make_client(**kwargs: Any) -> OutboundHTTPClient:
+    options: dict[str, Any] = {"retries": 2, "backoff": 0.01, "timeout": 1, "connect_timeout": 1}
+    options.update(kwargs)
+    return OutboundHTTPClient(**options)
+
+
+@pytest.fixture
+def jitter(monkeypatch: pytest.MonkeyPatch) -> list[tuple[float, float]]:
+    """Record backoff bounds, sleep with the upper one."""
+    bounds: list[tuple[float, float]] = []
+
+    def uniform(low: float, high: float) -> float:
+        bounds.append((low, high))
+        return high
+    monkeypatch.setattr(http_client_module, "uniform", uniform)
+    return bounds
+
+
+def test_connections_are_reused() -> None:
+    async def scenario() -> None:
+        async with StubServer(statuses(200)) as server:
+            client: OutboundHTTPClient = make_client()
+            await client.start()
+            try:
+                for _ in range(5):
+                    response: OutboundResponse = await client.get(f"{server.url}/ping")
+                    assert response.status == 200
+                    assert response.json() == {"status": 200}
+            finally:
+                await client.stop()
+            assert len({peer for _, peer in server.requests}) == 1
+    run(scenario())
+
+
+@pytest.mark.parametrize("code", [502, 503, 504])
+def test_retries_gateway_errors_with_jitter(code: int, jitter: list[tuple[float, float]]) -> None:
+    async def scenario() -> None:
+        async with StubServer(statuses(code, code, 200)) as server:
+            client: OutboundHTTPClient = make_client()
+            try:
+                response: OutboundResponse = await client.get(f"{server.url}/flaky")
+            finally:
+                await client.stop()
+            assert response.status == 200
+            assert len(server.requests) == 3
+    run(scenario())
+    assert jitter == [(0, 0.01), (0, 0.02)]
+
+
+def test_returns_last_answer_when_retries_are_exhausted(jitter: list[tuple[float, float]]) -> None:
+    async def scenario() -> None:
+        async with StubServer(statuses(503)) as server:
+            client: OutboundHTTPClient = make_client()
+            try:
+                response: OutboundResponse = await client.get(f"{server.url}/down")
+            finally:
+                await client.stop()
+            assert response.status == 503
+            assert len(server.requests) == 3
+    run(scenario())
+
+
+def test_post_is_not_retried(jitter: list[tuple[float, float]]) -> None:
+    async def scenario() -> None:
+        async with StubServer(statuses(503, 200)) as server:
+            client: OutboundHTTPClient = make_client()
+            try:
+                response: OutboundResponse = await client.post(f"{server.url}/hook", json={})
+            finally:
+                await client.stop()
+            assert response.status == 503
+            assert [method for method, _ in server.requests] == ["POST"]
+    run(scenario())
+    assert jitter == []
+
+
+def test_timeout_is_retried_then_raised(jitter: list[tuple[float, float]]) -> None:
+    async def slow(request: web.Request) -> web.Response:
+        await sleep(1)
+        return web.Response()
+
+    async def scenario() -> None:
+        async with StubServer(slow) as server:
+            client: OutboundHTTPClient = make_client(timeout=0.1, retries=1)
+            try:
+                with pytest.raises(OutboundRequestError):
+                    await client.get(f"{server.url}/slow")
+            finally:
+                await client.stop()
+            assert len(server.requests) == 2
+    run(scenario())
+
+
+def test_latency_label_is_bounded() -> None:
+    client: OutboundHTTPClient = make_client(metric_hosts=frozenset({"idp.internal"}))
+    assert client._host_latency("idp.internal").labels == {"host": "idp.internal"}
+    assert client._host_latency("attacker.example:1234") is client._host_latency("other.example")
@@ -0,0 +1,57 @@
+
+## Built-in modules: ##
+from os import environ
+from subprocess import run
+from sys import executable
+
+## Third-party modules: ##
+import pytest
+
+## Local modules: ##
+from benchmarks.check_import_time import IMPORT_TIME_BUDGET_MS, import_times, total_import_ms
+from core.api_v1.token_auth.hashers import HasherRegistry
+from core.api_v1.token_auth.keyring import SYMMETRIC_KID, KeyRing
+
+## A cold interpreter is noisy, the best of a few runs is compared to the budget.
+ATTEMPTS: int = 3
+
+
+def test_main_imports_within_budget():
+    best_ms: float = float("inf")
+    for _ in range(ATTEMPTS):
+        best_ms = min(best_ms, total_import_ms(import_times("main"), "main"))
+        if best_ms <= IMPORT_TIME_BUDGET_MS:
+            break
+    assert 0 < best_ms <= IMPORT_TIME_BUDGET_MS, (
+        f"import main took {best_ms:.0f} ms, budget is {IMPORT_TIME_BUDGET_MS:.0f} ms "
+        "(python -m benchmarks.check_import_time lists the slowest modules)"
+    )
+
+
+def test_import_loads_no_signing_key_and_configures_no_hasher():
+    completed = run(
+        [executable, "-c", (
+            "import main\n"
+            "from core.api_v1.token_auth import hasher_registry\n"
+            "from core.api_v1.token_auth.keyring import key_ring\n"
+            "print(key_ring._loaded, hasher_registry._default is None)"
+        )],
+        capture_output=True,
+        text=True,
+        env=environ,
+    )
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.split() == ["False", "True"]
+
+
+def test_key_ring_loads_configured_keys_on_first_use():
+    key_ring: KeyRing = KeyRing()
+    assert not key_ring._loaded
+    assert key_ring.active.kid == SYMMETRIC_KID
+    assert key_ring.verification_key(None) is key_ring.active
+
+
+def test_hasher_registry_reports_unknown_scheme_on_first_use():
+    registry: HasherRegistry = HasherRegistry(scheme="unknown")
+    with pytest.raises(ValueError):
+        registry.default
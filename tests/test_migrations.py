@@ -0,0 +1,53 @@
+
+## Built-in modules: ##
+from asyncio import run
+
+## Third-party modules: ##
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+## Local modules: ##
+from core.async_database.db_models import Base
+from core.async_database.migrations import MIGRATIONS, MigrationRunner
+
+
+def _schema(sync_connection) -> dict[str, set[str]]:
+    inspector = inspect(sync_connection)
+    return {
+        table: {column["name"] for column in inspector.get_columns(table)}
+        for table in inspector.get_table_names()
+        if table != "schema_migrations"
+    }
+
+
+def test_upgrade_creates_the_model_schema(tmp_path):
+    async def scenario() -> tuple[dict[str, set[str]], list[str], list[str]]:
+        engine: AsyncEngine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'migrated.db'}")
+        runner: MigrationRunner = MigrationRunner(engine, MIGRATIONS)
+        applied: list[str] = [migration.version for migration in await runner.upgrade()]
+        again: list[str] = [migration.version for migration in await runner.upgrade()]
+        async with engine.connect() as connection:
+            schema: dict[str, set[str]] = await connection.run_sync(_schema)
+        await engine.dispose()
+        return schema, applied, again
+
+    schema, applied, again = run(scenario())
+    assert applied == [migration.version for migration in MIGRATIONS]
+    assert again == []
+    assert schema == {
+        table.name: {column.name for column in table.columns}
+        for table in Base.metadata.sorted_tables
+    }
+
+
+def test_baseline_is_frozen(tmp_path):
+    async def scenario() -> set[str]:
+        engine: AsyncEngine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'baseline.db'}")
+        await MigrationRunner(engine, MIGRATIONS).upgrade(target="0001")
+        async with engine.connect() as connection:
+            tables: set[str] = set(await connection.run_sync(_schema))
+        await engine.dispose()
+        return tables
+
+    ## Tables added to the models later come from their own migration.
+    assert run(scenario()) == {"users", "revoked_tokens", "refresh_tokens"}
@@ -0,0 +1,201 @@
+
+## Built-in modules: ##
+from asyncio import run
+
+## Third-party modules: ##
+import pytest
+
+## Local modules: ##
+from core.rate_limit import backends
+from core.rate_limit.backends import (
+    RateLimit,
+    InMemoryBackend,
+    InMemoryKeyValueStore,
+    SharedStoreBackend,
+)
+from core.rate_limit.limiter import (
+    CredentialRateLimiter,
+    IntrospectionRateLimiter,
+    RateLimitExceeded,
+    build_backend,
+)
+
+
+class Clock(object):
+    """Manual clock for both time() and monotonic() of the backends."""
+    def __init__(self, now: float = 1_000.0) -> None:
+        self.now: float = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeKeyValueStore(object):
+    """Local fake of a shared store, counts the calls it gets."""
+    def __init__(self, clock: Clock) -> None:
+        self.clock: Clock = clock
+        self.values: dict[str, tuple[int, float]] = {}
+        self.calls: int = 0
+
+    async def incr(self, key: str, ttl: float) -> int:
+        self.calls += 1
+        value, expires_at = self.values.get(key, (0, self.clock() + ttl))
+        if expires_at <= self.clock():
+            value, expires_at = 0, self.clock() + ttl
+        self.values[key] = (value + 1, expires_at)
+        return value + 1
+
+    async def get(self, key: str) -> int:
+        self.calls += 1
+        value, expires_at = self.values.get(key, (0, 0.0))
+        return value if expires_at > self.clock() else 0
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock: Clock = Clock()
+    monkeypatch.setattr(backends, "time", clock)
+    monkeypatch.setattr(backends, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture(params=["memory", "shared"])
+def backend(request: pytest.FixtureRequest, clock: Clock) -> backends.RateLimitBackend:
+    if request.param == "memory":
+        return InMemoryBackend(max_keys=100)
+    return SharedStoreBackend(store=FakeKeyValueStore(clock))
+
+
+def test_backend_allows_limit_then_rejects(backend: backends.RateLimitBackend) -> None:
+    rate_limit: RateLimit = RateLimit(limit=3, period=60)
+    decisions = [run(backend.hit("login:alice", rate_limit)) for _ in range(4)]
+    assert [decision.allowed for decision in decisions] == [True, True, True, False]
+    assert 0 < decisions[-1].retry_after <= 60
+
+
+def test_backend_keys_are_independent(backend: backends.RateLimitBackend) -> None:
+    rate_limit: RateLimit = RateLimit(limit=1, period=60)
+    assert run(backend.hit("ip:10.0.0.1", rate_limit)).allowed
+    assert run(backend.hit("ip:10.0.0.2", rate_limit)).allowed
+    assert not run(backend.hit("ip:10.0.0.1", rate_limit)).allowed
+
+
+def test_backend_allows_again_after_period(backend: backends.RateLimitBackend, clock: Clock) -> None:
+    rate_limit: RateLimit = RateLimit(limit=2, period=10)
+    run(backend.hit("global", rate_limit))
+    run(backend.hit("global", rate_limit))
+    assert not run(backend.hit("global", rate_limit)).allowed
+    clock.now += 20
+    assert run(backend.hit("global", rate_limit)).allowed
+
+
+def test_backend_peek_does_not_count(backend: backends.RateLimitBackend) -> None:
+    rate_limit: RateLimit = RateLimit(limit=1, period=60)
+    for _ in range(5):
+        assert run(backend.peek("login:bob", rate_limit)).allowed
+    assert run(backend.hit("login:bob", rate_limit)).allowed
+    assert not run(backend.peek("login:bob", rate_limit)).allowed
+
+
+def test_shared_backend_uses_two_store_calls_per_hit(clock: Clock) -> None:
+    store: FakeKeyValueStore = FakeKeyValueStore(clock)
+    run(SharedStoreBackend(store=store).hit("global", RateLimit(limit=10, period=1)))
+    assert store.calls == 2
+
+
+def test_in_memory_store_evicts_least_recently_used(clock: Clock) -> None:
+    store: InMemoryKeyValueStore = InMemoryKeyValueStore(max_keys=2)
+    run(store.incr("a", ttl=60))
+    run(store.incr("b", ttl=60))
+    run(store.incr("a", ttl=60))
+    run(store.incr("c", ttl=60))
+    assert run(store.get("a")) == 2
+    assert run(store.get("b")) == 0
+    assert run(store.get("c")) == 1
+
+
+def test_limiter_rejection_does_not_spend_other_limits(clock: Clock) -> None:
+    limiter: CredentialRateLimiter = CredentialRateLimiter(
+        backend=InMemoryBackend(max_keys=100),
+        per_login=RateLimit(limit=1, period=60),
+        per_ip=RateLimit(limit=3, period=60),
+        global_limit=RateLimit(limit=3, period=60),
+    )
+    run(limiter.check(client_ip="10.0.0.1", login="alice"))
+    for _ in range(5):
+        with pytest.raises(RateLimitExceeded):
+            run(limiter.check(client_ip="10.0.0.1", login="alice"))
+    run(limiter.check(client_ip="10.0.0.1", login="carol"))
+    run(limiter.check(client_ip="10.0.0.1", login="dave"))
+
+
+def test_shared_backend_requires_store() -> None:
+    with pytest.raises(ValueError):
+        build_backend("shared")
+    limiter: CredentialRateLimiter = CredentialRateLimiter(
+        backend=None,
+        per_login=RateLimit(limit=1, period=60),
+        per_ip=RateLimit(limit=1, period=60),
+        global_limit=RateLimit(limit=1, period=1),
+    )
+    with pytest.raises(RuntimeError):
+        run(limiter.start())
+
+
+def test_introspection_limits_each_service_token(clock: Clock) -> None:
+    limiter: IntrospectionRateLimiter = IntrospectionRateLimiter(
+        backend=InMemoryBackend(max_keys=100),
+        per_caller=RateLimit(limit=2, period=1),
+        global_limit=RateLimit(limit=10, period=1),
+    )
+    for _ in range(2):
+        run(limiter.check(service_token="service-a", client_ip="10.0.0.1"))
+    with pytest.raises(RateLimitExceeded):
+        run(limiter.check(service_token="service-a", client_ip="10.0.0.2"))
+    run(limiter.check(service_token="service-b", client_ip="10.0.0.1"))
+
+
+def test_introspection_does_not_spend_credential_limits_on_a_shared_store(clock: Clock) -> None:
+    store: FakeKeyValueStore = FakeKeyValueStore(clock)
+    credential_limiter: CredentialRateLimiter = CredentialRateLimiter(
+        backend=SharedStoreBackend(store=store),
+        per_login=RateLimit(limit=5, period=60),
+        per_ip=RateLimit(limit=1, period=60),
+        global_limit=RateLimit(limit=1, period=60),
+    )
+    introspection_limiter: IntrospectionRateLimiter = IntrospectionRateLimiter(
+        backend=SharedStoreBackend(store=store),
+        per_caller=RateLimit(limit=100, period=60),
+        global_limit=RateLimit(limit=100, period=60),
+    )
+    for _ in range(50):
+        run(introspection_limiter.check(service_token="service-a", client_ip="10.0.0.1"))
+    run(credential_limiter.check(client_ip="10.0.0.1", login="alice"))
+
+
+def test_introspect_endpoint_leaves_login_capacity(database, monkeypatch: pytest.MonkeyPatch) -> None:
+    from fastapi.testclient import TestClient
+
+    import main
+    from core.api_v1.token_auth import views
+    from core.rate_limit import credential_rate_limiter, introspection_rate_limiter
+
+    monkeypatch.setattr(views, "INTROSPECTION_API_TOKEN", "service-token")
+    monkeypatch.setattr(credential_rate_limiter, "backend", InMemoryBackend(max_keys=100))
+    monkeypatch.setattr(credential_rate_limiter, "per_ip", RateLimit(limit=1, period=60))
+    monkeypatch.setattr(credential_rate_limiter, "global_limit", RateLimit(limit=1, period=60))
+    monkeypatch.setattr(introspection_rate_limiter, "backend", InMemoryBackend(max_keys=100))
+    monkeypatch.setattr(introspection_rate_limiter, "per_caller", RateLimit(limit=3, period=60))
+
+    client: TestClient = TestClient(main.app)
+    statuses: list[int] = [
+        client.post(
+            "/api_v1/token_auth/introspect",
+            json={"tokens": ["not-a-token"]},
+            headers={"X-Service-Token": "service-token"},
+        ).status_code
+        for _ in range(4)
+    ]
+    assert statuses == [200, 200, 200, 429]
+    ## The single login allowed per IP and globally is still available.
+    run(credential_rate_limiter.check(client_ip="testclient", login="alice"))
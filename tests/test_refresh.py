@@ -0,0 +1,87 @@
+
+## Built-in modules: ##
+from asyncio import gather, run
+from datetime import timedelta
+
+## Third-party modules: ##
+import pytest
+from sqlalchemy import insert, select
+
+## Local modules: ##
+from core.api_v1.token_auth.refresh import (
+    RefreshTokenError,
+    RefreshTokenPruner,
+    issue_refresh_token,
+    rotate_refresh_token,
+    utc_now,
+)
+from core.async_database.db_engine import session_factory
+from core.async_database.db_models import RefreshTokens
+
+
+async def _issue(login: str = "alice") -> str:
+    async with session_factory() as session:
+        return await issue_refresh_token(session, login=login)
+
+
+async def _rotate(refresh_token: str) -> tuple[str, str]:
+    async with session_factory() as session:
+        return await rotate_refresh_token(session, refresh_token)
+
+
+def test_rotation_returns_owner_and_new_token(database):
+    async def scenario() -> tuple[str, str, str]:
+        first: str = await _issue()
+        login, second = await _rotate(first)
+        return first, login, second
+
+    first, login, second = run(scenario())
+    assert login == "alice"
+    assert second != first
+
+
+def test_reused_token_revokes_whole_family(database):
+    async def scenario() -> None:
+        first: str = await _issue()
+        _, second = await _rotate(first)
+        with pytest.raises(RefreshTokenError, match="reuse"):
+            await _rotate(first)
+        ## The token issued by the legitimate rotation is revoked too.
+        with pytest.raises(RefreshTokenError, match="revoked"):
+            await _rotate(second)
+
+    run(scenario())
+
+
+def test_concurrent_rotations_succeed_once(database):
+    async def scenario() -> list:
+        refresh_token: str = await _issue()
+        return await gather(*(_rotate(refresh_token) for _ in range(2)), return_exceptions=True)
+
+    results: list = run(scenario())
+    assert sum(isinstance(result, tuple) for result in results) == 1
+    assert sum(isinstance(result, RefreshTokenError) for result in results) == 1
+
+
+def test_pruner_deletes_only_expired_and_revoked_rows(database):
+    async def scenario() -> tuple[int, set[str]]:
+        now = utc_now()
+        rows: list[dict] = [
+            {"family_id": "expired", "expires_at": now - timedelta(seconds=1), "used": False, "revoked": False},
+            {"family_id": "revoked", "expires_at": now + timedelta(days=1), "used": False, "revoked": True},
+            {"family_id": "spent", "expires_at": now + timedelta(days=1), "used": True, "revoked": False},
+            {"family_id": "fresh", "expires_at": now + timedelta(days=1), "used": False, "revoked": False},
+        ]
+        async with session_factory() as session:
+            await session.execute(insert(RefreshTokens).values([
+                {"token_hash": bytes([index]) * 32, "login": "alice", **row}
+                for index, row in enumerate(rows)
+            ]))
+            await session.commit()
+
+        deleted: int = await RefreshTokenPruner(factory=session_factory).prune()
+        async with session_factory() as session:
+            families: set[str] = set((await session.execute(select(RefreshTokens.family_id))).scalars())
+        return deleted, families
+
+    assert run(scenario()) == (2, {"spent", "fresh"})
@@ -0,0 +1,53 @@
+
+## Built-in modules: ##
+from asyncio import run
+
+## Third-party modules: ##
+from sqlalchemy import select
+
+## Local modules: ##
+from core.async_database.db_engine import session_factory
+from core.async_database.db_models import Users
+from core.async_database.repository import UserRepository
+
+
+async def _create_users(*logins: str) -> None:
+    async with session_factory() as session:
+        for login in logins:
+            await UserRepository(session).create(login=login, hashed_password="$2b$hash")
+
+
+async def _logins() -> list[str]:
+    async with session_factory() as session:
+        return sorted((await session.execute(select(Users.login))).scalars())
+
+
+def test_delete_with_limit_removes_one_row_on_sqlite(database):
+    async def scenario() -> tuple[int, list[str]]:
+        await _create_users("alice", "bob", "carol")
+        async with session_factory() as session:
+            deleted: int = await UserRepository(session).delete(limit=1, hashed_password="$2b$hash")
+        return deleted, await _logins()
+
+    deleted, logins = run(scenario())
+    assert deleted == 1
+    assert logins == ["bob", "carol"]
+
+
+def test_delete_without_limit_removes_every_match(database):
+    async def scenario() -> tuple[int, list[str]]:
+        await _create_users("alice", "bob")
+        async with session_factory() as session:
+            deleted: int = await UserRepository(session).delete(hashed_password="$2b$hash")
+        return deleted, await _logins()
+
+    assert run(scenario()) == (2, [])
+
+
+def test_delete_with_limit_and_no_match(database):
+    async def scenario() -> int:
+        await _create_users("alice")
+        async with session_factory() as session:
+            return await UserRepository(session).delete(limit=1, login="nobody")
+
+    assert run(scenario()) == 0
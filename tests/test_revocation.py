@@ -0,0 +1,113 @@
+
+## Built-in modules: ##
+from asyncio import run
+from uuid import uuid4
+
+## Local modules: ##
+from core.api_v1.token_auth import revocation
+from core.api_v1.token_auth.revocation import (
+    RevocationList,
+    RevocationStore,
+    compacted,
+    to_database_time,
+)
+from core.async_database.db_engine import session_factory
+from core.async_database.db_models import RevokedTokens
+
+NOW: float = 1_000_000.0
+
+
+def new_jti() -> str:
+    return uuid4().hex
+
+
+def test_add_many_merges_sorted_and_skips_duplicates():
+    revoked: RevocationList = RevocationList(capacity=100)
+    existing: list[str] = [new_jti() for _ in range(5)]
+    for jti in existing:
+        revoked.add(jti, NOW + 60)
+    batch: list[str] = [new_jti() for _ in range(5)]
+
+    added: int = revoked.add_many([(jti, NOW + 60) for jti in batch + existing[:2]] + [("not-hex", NOW)])
+
+    assert added == 5
+    assert len(revoked) == 10
+    keys: list[bytes] = [bytes(revoked._keys[index * 16:(index + 1) * 16]) for index in range(10)]
+    assert keys == sorted(keys)
+    assert all(revoked.is_revoked(jti) for jti in existing + batch)
+    assert not revoked.is_revoked(new_jti())
+
+
+def test_bloom_false_positive_is_confirmed_in_arrays():
+    revoked: RevocationList = RevocationList(capacity=100)
+    revoked.add(new_jti(), NOW + 60)
+    only_in_filter: str = new_jti()
+    revoked._bloom.add(only_in_filter)
+
+    assert only_in_filter in revoked._bloom
+    assert not revoked.is_revoked(only_in_filter)
+
+
+def test_prune_drops_expired_ids():
+    revoked: RevocationList = RevocationList(capacity=100)
+    expired, alive = new_jti(), new_jti()
+    revoked.add_many([(expired, NOW - 1), (alive, NOW + 60)])
+
+    assert revoked.prune(now=NOW) == 1
+    assert not revoked.is_revoked(expired)
+    assert revoked.is_revoked(alive)
+
+
+def test_compact_keeps_ids_added_while_it_runs(monkeypatch):
+    revoked: RevocationList = RevocationList(capacity=100)
+    expired: str = new_jti()
+    revoked.add(expired, NOW - 1)
+    added_meanwhile: str = new_jti()
+
+    def compacted_with_concurrent_add(*arguments):
+        result = compacted(*arguments)
+        revoked.add(added_meanwhile, NOW + 60)
+        return result
+
+    monkeypatch.setattr(revocation, "compacted", compacted_with_concurrent_add)
+
+    assert run(revoked.compact(now=NOW)) == 1
+    assert revoked.is_revoked(added_meanwhile)
+    assert not revoked.is_revoked(expired)
+
+
+def test_overfull_filter_is_rebuilt_by_compact():
+    revoked: RevocationList = RevocationList(capacity=4)
+    jtis: list[str] = [new_jti() for _ in range(10)]
+    revoked.add_many([(jti, NOW + 60) for jti in jtis])
+    assert revoked.needs_rebuild
+
+    run(revoked.compact(now=NOW))
+
+    assert not revoked.needs_rebuild
+    assert all(revoked.is_revoked(jti) for jti in jtis)
+
+
+async def _insert_revocation(row_id: int, jti: str) -> None:
+    async with session_factory() as session:
+        session.add(RevokedTokens(id=row_id, jti=jti, expires_at=to_database_time(4_000_000_000)))
+        await session.commit()
+
+
+def test_sync_picks_up_rows_committed_out_of_id_order(database):
+    late, early = new_jti(), new_jti()
+
+    async def scenario(overlap: int) -> bool:
+        store: RevocationStore = RevocationStore(RevocationList(capacity=100), overlap=overlap)
+        await _insert_revocation(5, early)
+        await store.sync()
+        ## Row 4 was inserted before row 5 but committed after the sync.
+        await _insert_revocation(4, late)
+        await store.sync()
+        async with session_factory() as session:
+            await session.execute(RevokedTokens.__table__.delete())
+            await session.commit()
+        return store.revocation_list.is_revoked(late)
+
+    assert run(scenario(overlap=0)) is False
+    assert run(scenario(overlap=10)) is True
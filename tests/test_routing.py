@@ -0,0 +1,136 @@
+
+## Built-in modules: ##
+from asyncio import run
+from pathlib import Path
+from typing import Optional
+
+## Third-party modules: ##
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+## Local modules: ##
+from core.async_database.db_models import Base, Users
+from core.async_database.routing import ReplicaRouter, RoutingSession
+
+
+async def _engine(path: Path, login: str) -> AsyncEngine:
+    """Database holding one user, so a read tells which engine served it."""
+    engine: AsyncEngine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(insert(Users).values(login=login, hashed_password="$2b$hash"))
+    return engine
+
+
+def _factory(primary: AsyncEngine, router: ReplicaRouter) -> async_sessionmaker:
+    return async_sessionmaker(bind=primary, sync_session_class=RoutingSession, router=router)
+
+
+async def _read(factory: async_sessionmaker, login: Optional[str] = None) -> list[str]:
+    async with factory() as session:
+        result = await session.execute(select(Users.login), bind_arguments={"login": login})
+        return list(result.scalars())
+
+
+def test_reads_go_to_replica_writes_and_flushes_to_primary(tmp_path):
+    async def scenario() -> None:
+        primary: AsyncEngine = await _engine(tmp_path / "primary.db", "on_primary")
+        replica: AsyncEngine = await _engine(tmp_path / "replica.db", "on_replica")
+        router: ReplicaRouter = ReplicaRouter(replicas=[replica], read_your_writes=0)
+        factory: async_sessionmaker = _factory(primary, router)
+
+        assert await _read(factory) == ["on_replica"]
+
+        async with factory() as session:
+            await session.execute(insert(Users).values(login="inserted", hashed_password="$2b$hash"))
+            ## Once the session wrote, its reads stay on the primary.
+            assert sorted((await session.execute(select(Users.login))).scalars()) == ["inserted", "on_primary"]
+            await session.commit()
+
+        async with factory() as session:
+            session.add(Users(login="flushed", hashed_password="$2b$hash"))
+            await session.flush()
+            await session.commit()
+
+        primary_logins: list[str] = await _read(_factory(primary, ReplicaRouter(replicas=[])))
+        assert sorted(primary_logins) == ["flushed", "inserted", "on_primary"]
+        assert await _read(_factory(replica, ReplicaRouter(replicas=[]))) == ["on_replica"]
+
+        for engine in (primary, replica):
+            await engine.dispose()
+
+    run(scenario())
+
+
+def test_round_robin_balancing(tmp_path):
+    async def scenario() -> None:
+        first: AsyncEngine = await _engine(tmp_path / "first.db", "first")
+        second: AsyncEngine = await _engine(tmp_path / "second.db", "second")
+        router: ReplicaRouter = ReplicaRouter(replicas=[first, second], balancing="round_robin")
+
+        picked: list = [router.read_engine() for _ in range(4)]
+        assert picked == [first.sync_engine, second.sync_engine] * 2
+
+        for engine in (first, second):
+            await engine.dispose()
+
+    run(scenario())
+
+
+def test_least_connections_balancing(tmp_path):
+    async def scenario() -> None:
+        busy: AsyncEngine = await _engine(tmp_path / "busy.db", "busy")
+        idle: AsyncEngine = await _engine(tmp_path / "idle.db", "idle")
+        router: ReplicaRouter = ReplicaRouter(replicas=[busy, idle], balancing="least_connections")
+
+        async with busy.connect():
+            assert all(router.read_engine() is idle.sync_engine for _ in range(3))
+
+        for engine in (busy, idle):
+            await engine.dispose()
+
+    run(scenario())
+
+
+def test_handle_error_marks_replica_down(tmp_path):
+    async def scenario() -> None:
+        primary: AsyncEngine = await _engine(tmp_path / "primary.db", "on_primary")
+        ## Directory does not exist, so every connection attempt fails.
+        broken: AsyncEngine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}")
+        router: ReplicaRouter = ReplicaRouter(replicas=[broken], retry_interval=60)
+        factory: async_sessionmaker = _factory(primary, router)
+
+        with pytest.raises(OperationalError):
+            await _read(factory)
+        assert not router.replicas[0].healthy
+        assert router.replica_failures.value == 1
+        ## Every replica is down, reads fall back to the primary.
+        assert await _read(factory) == ["on_primary"]
+
+        for engine in (primary, broken):
+            await engine.dispose()
+
+    run(scenario())
+
+
+def test_read_your_writes_pins_login_to_primary(tmp_path):
+    async def scenario() -> None:
+        primary: AsyncEngine = await _engine(tmp_path / "primary.db", "on_primary")
+        replica: AsyncEngine = await _engine(tmp_path / "replica.db", "on_replica")
+        router: ReplicaRouter = ReplicaRouter(replicas=[replica], read_your_writes=60)
+        factory: async_sessionmaker = _factory(primary, router)
+
+        router.mark_written("alice")
+        assert await _read(factory, login="alice") == ["on_primary"]
+        assert await _read(factory, login="bob") == ["on_replica"]
+
+        ## None means any login could have changed.
+        router.mark_written(None)
+        assert await _read(factory, login="bob") == ["on_primary"]
+
+        for engine in (primary, replica):
+            await engine.dispose()
+
+    run(scenario())
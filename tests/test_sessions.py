@@ -0,0 +1,99 @@
+
+## Built-in modules: ##
+from asyncio import gather, run
+from typing import Optional
+
+## Third-party modules: ##
+import pytest
+
+## Local modules: ##
+import serve
+from core.api_v1.token_auth import sessions
+from core.api_v1.token_auth.sessions import InMemorySessionBackend, SessionRecord, session_store
+from core.async_database.db_engine import session_factory
+from core.async_database.repository import UserRepository
+
+
+def test_user_deletion_ends_the_user_sessions(database, monkeypatch):
+    monkeypatch.setattr(session_store, "backend", InMemorySessionBackend(shards=4, max_entries=100))
+
+    async def scenario() -> tuple[Optional[str], Optional[str]]:
+        alice_session: str = await session_store.create("alice")
+        bob_session: str = await session_store.create("bob")
+        async with session_factory() as session:
+            await UserRepository(session).create(login="alice", hashed_password="$2b$hash")
+            await UserRepository(session).delete(login="alice")
+        await gather(*session_store._tasks)
+        return await session_store.validate(alice_session), await session_store.validate(bob_session)
+
+    assert run(scenario()) == (None, "bob")
+
+
+def _ids_of_shard(backend: InMemorySessionBackend, shard: int, number: int) -> list[str]:
+    ids: list[str] = []
+    candidate: int = 0
+    while len(ids) < number:
+        session_id: str = f"session-{candidate}"
+        if backend._shard(session_id) is backend._shards[shard]:
+            ids.append(session_id)
+        candidate += 1
+    return ids
+
+
+def test_each_shard_evicts_its_least_recently_used_session(monkeypatch):
+    monkeypatch.setattr(sessions, "time", lambda: 1_000.0)
+    backend: InMemorySessionBackend = InMemorySessionBackend(shards=2, max_entries=4)
+    first, second, third = _ids_of_shard(backend, shard=0, number=3)
+    (other,) = _ids_of_shard(backend, shard=1, number=1)
+
+    def record(login: str) -> SessionRecord:
+        return SessionRecord(login=login, expires_at=2_000.0)
+
+    async def scenario() -> list[bool]:
+        await backend.put(other, record("dave"))
+        await backend.put(first, record("alice"))
+        await backend.put(second, record("bob"))
+        await backend.get(first)
+        ## Shard 0 is full: "second" is its least recently used session.
+        await backend.put(third, record("carol"))
+        return [await backend.get(session_id) is not None for session_id in (first, second, third, other)]
+
+    assert run(scenario()) == [True, False, True, True]
+    assert len(backend) == 3
+    assert "bob" not in backend._by_login
+
+
+def test_expired_session_is_dropped(monkeypatch):
+    clock: list[float] = [1_000.0]
+    monkeypatch.setattr(sessions, "time", lambda: clock[0])
+    store = sessions.SessionStore(backend=InMemorySessionBackend(shards=1, max_entries=10), ttl=60)
+
+    async def scenario() -> tuple[Optional[str], Optional[str]]:
+        session_id: str = await store.create("alice")
+        valid: Optional[str] = await store.validate(session_id)
+        clock[0] += 61
+        return valid, await store.validate(session_id)
+
+    assert run(scenario()) == ("alice", None)
+
+
+def test_serve_refuses_workers_with_in_memory_sessions(monkeypatch):
+    monkeypatch.setattr(serve, "AUTH_MODE", "session")
+    monkeypatch.setattr(session_store, "backend", InMemorySessionBackend())
+
+    with pytest.raises(SystemExit):
+        serve.check_session_backend(workers=2)
+    serve.check_session_backend(workers=1)
+
+
+def test_serve_accepts_workers_with_shared_sessions(monkeypatch):
+    class SharedBackend(InMemorySessionBackend):
+        shared: bool = True
+
+    monkeypatch.setattr(serve, "AUTH_MODE", "session")
+    monkeypatch.setattr(session_store, "backend", SharedBackend())
+    serve.check_session_backend(workers=4)
+
+    monkeypatch.setattr(serve, "AUTH_MODE", "jwt")
+    monkeypatch.setattr(session_store, "backend", InMemorySessionBackend())
+    serve.check_session_backend(workers=4)
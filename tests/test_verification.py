@@ -0,0 +1,17 @@
+
+## Local modules: ##
+from core.api_v1.token_auth.verification import UserPresenceCache
+
+
+def test_presence_lookup_ignores_login_case():
+    cache: UserPresenceCache = UserPresenceCache(ttl=60, max_entries=10)
+    cache.remember("Alice", exists=True)
+    assert cache.lookup("alice") is True
+    assert cache.lookup("ALICE") is True
+
+
+def test_presence_invalidate_ignores_login_case():
+    cache: UserPresenceCache = UserPresenceCache(ttl=60, max_entries=10)
+    cache.remember("alice", exists=False)
+    cache.invalidate("Alice")
+    assert cache.lookup("alice") is None